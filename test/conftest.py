@@ -1,6 +1,9 @@
 import os
+import shutil
 import sys
+import tempfile
 from collections.abc import Mapping
+from pathlib import Path
 from typing import Union
 
 import pytest
@@ -15,10 +18,21 @@ if homedir not in sys.path:
 
 def pytest_addoption(parser: Parser):
     parser.addoption("--skip-slow", action="store_true", default=False, help="Skip slow tests")
+    parser.addoption("--startup-budget-ms", type=float, default=float(os.getenv('TIMEFRED_STARTUP_BUDGET_MS', 200)),
+                     help="Max import time of `tf status`, as measured by -X importtime (test_startup.py)")
 
 
 def pytest_configure(config: Config):
     config.addinivalue_line("markers", "slow: mark test as slow to run")
+    # Sidecars and backups of the tests' sheets go to a temp dir instead of ~/.cache/timefred, for subprocesses too
+    from timefred.config import config as timefred_config
+    cache_dir = tempfile.mkdtemp(prefix='timefred-cache-')
+    os.environ['TIMEFRED_CACHE_DIR'] = cache_dir
+    timefred_config.cache.path = Path(cache_dir)
+
+
+def pytest_unconfigure(config: Config):
+    shutil.rmtree(os.environ['TIMEFRED_CACHE_DIR'], ignore_errors=True)
 
 
 def pytest_collection_modifyitems(config: Config, items):
@@ -0,0 +1,105 @@
+import time
+from datetime import date, timedelta
+from textwrap import dedent
+from unittest.mock import patch
+
+from test.testutils import temp_sheet
+from timefred.action import aggregate
+from timefred.color import decolor
+from timefred.store import Work
+from timefred.time import XArrow
+from timefred.timefred import parse_args
+
+RAW_DATA = dedent('''
+    ["01/12/21"]
+    
+    [["01/12/21"."Integration"]]
+    start = 10:30:00
+    end = 11:00:00
+    jira = "ASM-13925"
+    tags = ["research"]
+    
+    [["01/12/21"."Meeting"]]
+    start = 12:00:00
+    end = 13:00:00
+    tags = ["research", "meeting"]
+    
+    ["02/12/21"]
+    
+    [["02/12/21"."Integration"]]
+    start = 10:30:00
+    end = 12:00:00
+    jira = "ASM-13925"
+    ''')
+
+
+def test_parse_args():
+    assert parse_args(['tf', 'agg', '01/12/21', '02/12/21']) == (aggregate, {'start': '01/12/21', 'stop': '02/12/21'})
+
+
+def test_aggregate(capsys):
+    sheet_path = '/tmp/timefred-sheet--test-action--test-aggregate--test-aggregate.toml'
+    with open(sheet_path, 'w') as sheet:
+        sheet.write(RAW_DATA)
+    
+    with temp_sheet(sheet_path):
+        aggregate('01/12/21', '02/12/21 11:00')
+    
+    output_lines = [line.strip() for line in decolor(capsys.readouterr().out).splitlines()]
+    assert output_lines[0] == '01/12/21 00:00:00 - 02/12/21 11:00:00'
+    activities = output_lines.index('Activities')
+    assert output_lines[activities + 1].split() == ['Integration', '1', 'hour']
+    assert output_lines[activities + 2].split() == ['Meeting', '1', 'hour']
+    tags = output_lines.index('Tags')
+    assert output_lines[tags + 1].split() == ['research', '1', 'hour', '&', '30', 'minutes']
+    assert output_lines[tags + 2].split() == ['meeting', '1', 'hour']
+    jira = output_lines.index('Jira')
+    assert output_lines[jira + 1].split() == ['ASM-13925', '1', 'hour']
+    assert output_lines[-1] == 'Total: 2 hours'
+
+
+def test_ongoing_entry_lasts_until_now(capsys):
+    sheet_path = '/tmp/timefred-sheet--test-action--test-aggregate--test-ongoing-entry-lasts-until-now.toml'
+    with open(sheet_path, 'w') as sheet:
+        sheet.write(RAW_DATA + dedent('''
+            [["02/12/21"."Got to office"]]
+            start = 09:00:00
+            
+            [["02/12/21"."Review"]]
+            start = 12:30:00
+            '''))
+    
+    now = XArrow.from_absolute('02/12/21 13:00:00')
+    with temp_sheet(sheet_path), patch.object(XArrow, 'now', return_value=now):
+        aggregate('02/12/21 12:00', '02/12/21 14:00')
+    
+    output_lines = [line.strip() for line in decolor(capsys.readouterr().out).splitlines()]
+    activities = output_lines.index('Activities')
+    assert output_lines[activities + 1].split() == ['Review', '30', 'minutes']
+    # "Got to office" was never stopped, but isn't ongoing
+    assert output_lines[activities + 2] == ''
+    assert output_lines[-1] == 'Total: 30 minutes'
+
+
+def test_years_long_range_is_fast():
+    first = date(2019, 1, 1)
+    raw_work = {}
+    for days in range(3 * 365):
+        raw_work[(first + timedelta(days=days)).strftime('%d/%m/%y')] = {
+            f'Activity {activity}': [{'start': f'{9 + activity}:00:00', 'end': f'{9 + activity}:45:00',
+                                      'jira': f'ASM-{days % 50}', 'tags': [f'tag {days % 20}']}]
+            for activity in range(5)
+            }
+    columns = Work(**raw_work).to_columns()
+    
+    query_start = time.perf_counter()
+    in_range = columns.between(date(2019, 1, 1), date(2021, 12, 31))
+    durations = in_range.durations()
+    by_activity = in_range.totals_by_activity(durations)
+    by_tag = in_range.totals_by_tag(durations)
+    by_jira = in_range.totals_by_jira(durations)
+    query_seconds = time.perf_counter() - query_start
+    
+    assert sum(by_activity.values()) == 3 * 365 * 5 * 45 * 60
+    assert sum(by_tag.values()) == sum(by_jira.values()) == sum(by_activity.values())
+    assert query_seconds < 1, f'{query_seconds = }'
@@ -70,4 +70,38 @@ def test_23_12_21__e2e_tests_integration__negative_time_bug(capsys):
     output_lines = output.splitlines()
     output_lines = list(filter(bool, map(str.strip, output_lines)))
     e2e_line = next(line for line in output_lines if 'E2E' in line)
-    assert e2e_line.endswith('30 minutes'), e2e_line
\ No newline at end of file
+    assert e2e_line.endswith('30 minutes'), e2e_line
+
+def test_log_period_streams_days_with_running_totals(capsys):
+    raw_data = dedent('''
+    ["02/12/21"]
+    
+    [["02/12/21"."Integration"]]
+    start = 10:00:00
+    end = 11:00:00
+    
+    ["30/11/21"]
+    
+    [["30/11/21"."Integration"]]
+    start = 10:00:00
+    end = 10:30:00
+    
+    ["15/12/21"]
+    
+    [["15/12/21"."Integration"]]
+    start = 10:00:00
+    end = 12:00:00
+    ''')
+    sheet_path = '/tmp/timefred-sheet--test-action--test-log--test-log-period.toml'
+    with open(sheet_path, 'w') as sheet:
+        sheet.write(raw_data)
+
+    with temp_sheet(sheet_path):
+        log_action('30/11/21 - 10/12/21')
+
+    output_lines = decolor(capsys.readouterr().out).splitlines()
+    titles = [line for line in output_lines if line.endswith('ago')]
+    assert [title.split(' | ')[0] for title in titles] == ['Tuesday, 30/11/21', 'Thursday, 02/12/21']
+    totals = [line for line in output_lines if line.startswith('Total: ')]
+    assert totals == ['Total: 30 minutes | 30 minutes so far',
+                      'Total: 1 hour | 1 hour & 30 minutes so far']
@@ -1,4 +1,7 @@
 import os
+from unittest.mock import patch
+
+from timefred import action
 from timefred.store import store
 from test import TEST_START_ARROW
 from test.test_times import assert_arrows_soft_eq
@@ -182,4 +185,28 @@ class TestSheetWithContent:
                 with temp_sheet("/tmp/timefred-sheet-test_on_device_validation_08_30.toml"):
                     store.dump(work)
                     work = store.load()
-                self.test_sanity(work=work)
\ No newline at end of file
+                self.test_sanity(work=work)
+
+class TestOnAfterEarlierDay:
+    """The ongoing entry started on an earlier day"""
+    RAW_DATA = '["02/12/21"]\n[["02/12/21"."Integration"]]\nstart = 09:30:00\n'
+    
+    def test_stops_at_end_of_its_day(self):
+        sheet_path = '/tmp/timefred-sheet--test-on--test-stops-at-end-of-its-day.toml'
+        with open(sheet_path, 'w') as sheet:
+            sheet.write(self.RAW_DATA)
+        with temp_sheet(sheet_path), patch('timefred.util.confirm', return_value=True):
+            assert action.on("Foo", XArrow.now())
+            work = store.load()
+            integration = work['02/12/21']['Integration'].safe_last_entry()
+            assert integration.end.HHmmss == '23:59:59'
+            assert work['02/12/21'].seconds == 14 * 3600 + 29 * 60 + 59
+            assert work.ongoing_activity().name == "Foo"
+    
+    def test_declined(self):
+        sheet_path = '/tmp/timefred-sheet--test-on--test-declined.toml'
+        with open(sheet_path, 'w') as sheet:
+            sheet.write(self.RAW_DATA)
+        with temp_sheet(sheet_path), patch('timefred.util.confirm', return_value=False):
+            assert action.on("Foo", XArrow.now()) is False
+            assert store.path.read_text() == self.RAW_DATA
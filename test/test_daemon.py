@@ -0,0 +1,113 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from test import TEST_START_ARROW
+from test.testutils import default_work, temp_sheet
+from timefred import daemon
+from timefred.store import store
+
+
+@contextmanager
+def resident_store():
+    store.keep_resident()
+    try:
+        yield
+    finally:
+        store._store = None  # forces StoreProxy to re init a Store
+
+
+def request(*argv: str) -> dict:
+    return {'argv': list(argv), 'env': daemon.timefred_env()}
+
+
+class TestHandle:
+    def test_serves_actions_from_resident_work(self):
+        sheet_path = '/tmp/timefred-sheet--test-daemon--test-serves-actions.toml'
+        with temp_sheet(sheet_path), resident_store():
+            store.dump(default_work(TEST_START_ARROW))
+            work = store.load()
+            assert store.load() is work
+            
+            response = daemon.handle(request('on', 'Something'))
+            assert response['exit'] == 0, response
+            assert 'Started' in response['stdout']
+            # Dumped, and still resident
+            assert store.load() is work
+            assert 'Something' in store.path.read_text()
+            
+            response = daemon.handle(request('status'))
+            assert response['exit'] == 0, response
+            assert 'Something' in response['stdout']
+    
+    def test_sheet_changed_elsewhere_is_reloaded(self):
+        sheet_path = '/tmp/timefred-sheet--test-daemon--test-sheet-changed-elsewhere.toml'
+        with temp_sheet(sheet_path), resident_store():
+            store.dump(default_work(TEST_START_ARROW))
+            work = store.load()
+            store.path.write_text(store.path.read_text().replace('Got to office', 'Got to the office'))
+            reloaded = store.load()
+            assert reloaded is not work
+            assert 'Got to the office' in reloaded[TEST_START_ARROW.DDMMYY]
+    
+    def test_different_environment_falls_back(self):
+        assert daemon.handle({'argv': ['status'], 'env': {'TIMEFRED_SHEET': '/dev/null'}}) == {'fallback': True}
+    
+    def test_unserved_action_falls_back(self):
+        assert daemon.handle(request('store', 'compact')) == {'fallback': True}
+
+
+class TestForward:
+    def test_no_daemon_runs_in_process(self, monkeypatch):
+        monkeypatch.setenv('TIMEFRED_DAEMON_SOCKET', '/tmp/timefred--test-daemon--no-such.sock')
+        assert daemon.forward(['status']) is None
+    
+    def test_socket_of_another_user_is_ignored(self, monkeypatch, capsys):
+        socket_path = '/tmp/timefred--test-daemon--test-socket-of-another-user.sock'
+        open(socket_path, 'w').close()
+        monkeypatch.setenv('TIMEFRED_DAEMON_SOCKET', socket_path)
+        monkeypatch.setattr(os, 'getuid', lambda: os.stat(socket_path).st_uid + 1)
+        assert daemon.forward(['status']) is None
+        assert 'another user' in capsys.readouterr().err
+        os.unlink(socket_path)
+    
+    def test_client_settings_arent_compared(self, monkeypatch):
+        monkeypatch.setenv('TIMEFRED_DAEMON', '1')
+        monkeypatch.setenv('TIMEFRED_DAEMON_SOCKET', '/tmp/timefred--test-daemon--no-such.sock')
+        assert 'TIMEFRED_DAEMON' not in daemon.timefred_env()
+        assert 'TIMEFRED_DAEMON_SOCKET' not in daemon.timefred_env()
+    
+    def test_roundtrip(self, monkeypatch, capsys):
+        socket_path = '/tmp/timefred--test-daemon--test-roundtrip.sock'
+        sheet_path = '/tmp/timefred-sheet--test-daemon--test-roundtrip.toml'
+        monkeypatch.setenv('TIMEFRED_DAEMON_SOCKET', socket_path)
+        with temp_sheet(sheet_path), resident_store():
+            store.dump(default_work(TEST_START_ARROW))
+            # Serves until the test process exits
+            server = threading.Thread(target=daemon.serve, daemon=True)
+            server.start()
+            for _ in range(500):
+                if os.path.exists(socket_path):
+                    break
+                time.sleep(0.01)
+            capsys.readouterr()
+            
+            assert daemon.forward(['status']) == 0
+            assert 'Got to office' in capsys.readouterr().out
+            
+            assert daemon.forward(['store', 'compact']) is None
+            
+            # The client imports nothing of timefred beyond the daemon module when the daemon serves the request
+            process = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                                      'import sys; from timefred.daemon import main; sys.argv = ["tf", "status"]; sys.exit(main())'],
+                                     capture_output=True, text=True, cwd=Path(__file__).parent.parent)
+            assert process.returncode == 0, process.stderr
+            assert 'Got to office' in process.stdout
+            imported = {line.split('|')[-1].strip() for line in process.stderr.splitlines() if line.startswith('import time:')}
+            assert {name for name in imported if name.startswith('timefred')} == {'timefred', 'timefred.daemon'}
+            assert 'typing' not in imported
+        os.unlink(socket_path)
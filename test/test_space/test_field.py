@@ -0,0 +1,66 @@
+from timeit import repeat
+
+from timefred.log import log
+from timefred.space import AttrDictSpace, Field
+
+
+class Item(AttrDictSpace):
+    name: str = Field(cast=str.upper)
+    count: int = Field(default=0, cast=int)
+    tags: list[str] = Field(optional=True, cast=list[str])
+    uncached: str = Field(default_factory=list, cache=False)
+
+
+class SubItem(Item):
+    extra: str = Field(default='extra')
+
+
+class TestField:
+    def test_cast_once_and_cached(self):
+        item = Item(name='foo', count='3')
+        assert item.name == 'FOO'
+        assert item.count == 3
+        assert item['name'] == 'foo'
+        # Cached values shadow the Field
+        assert item.__dict__['name'] == 'FOO'
+        assert item.__dict__['count'] == 3
+        assert item.uncached is not item.uncached
+        assert 'uncached' not in item.__dict__
+
+    def test_set_and_delete_invalidate_cache(self):
+        item = Item(name='foo')
+        assert item.name == 'FOO'
+        item.name = 'bar'
+        assert item.name == 'BAR'
+        assert item['name'] == 'bar'
+        del item.count
+        assert item.count == 0
+        item.count = '5'
+        assert item.count == 5
+
+    def test_collection_cast(self):
+        item = Item(name='foo', tags=['a', 'b'])
+        assert item.tags == ['a', 'b']
+        item.tags = ('c',)
+        assert item.tags == ['c']
+        assert Item(name='foo').tags == []
+
+    def test_subclass_numbering(self):
+        assert Item.__field_count__ == 4
+        assert SubItem.__field_count__ == 5
+        assert set(SubItem.__fields__) == {'name', 'count', 'tags', 'uncached', 'extra'}
+        assert 'extra' not in Item.__fields__
+        sub_item = SubItem(name='foo', extra='bar')
+        assert sub_item.name == 'FOO'
+        assert sub_item.extra == 'bar'
+        assert len(sub_item.__field_values__) == 5
+
+    def test_benchmark_cached_read(self):
+        item = Item(name='foo')
+        item.name
+        object.__setattr__(item, 'plain', 'FOO')
+        namespace = {'item': item}
+        field_seconds = min(repeat('item.name', globals=namespace, number=100_000, repeat=5))
+        plain_seconds = min(repeat('item.plain', globals=namespace, number=100_000, repeat=5))
+        log.info(f'100,000 reads: {field_seconds * 1000:.1f}ms cached field, {plain_seconds * 1000:.1f}ms plain attribute')
+        assert field_seconds < plain_seconds * 2
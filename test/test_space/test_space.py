@@ -0,0 +1,44 @@
+from timeit import repeat
+
+from timefred.log import log
+from timefred.note import Note
+from timefred.space import AttrDictSpace, Field
+from timefred.store.models import Entry
+
+
+class Item(AttrDictSpace):
+    name: str = Field(cast=str.upper)
+    count: int = Field(default=0, cast=int)
+
+    def describe(self):
+        return f'{self.name} × {self.count}'
+
+
+class TestSpace:
+    def test_defined_attributes_computed_per_class(self):
+        assert Item.__defined_attributes__ == {'name', 'count', 'describe'}
+        assert 'start' in Entry.__defined_attributes__
+        assert '__fields__' not in Entry.__defined_attributes__
+
+    def test_init(self):
+        item = Item({'name': 'foo', 'count': '2', 'unknown': 'ignored'})
+        assert item.describe() == 'FOO × 2'
+        assert dict(item) == {'name': 'foo', 'count': '2'}
+        assert dict(Item()) == {}
+
+    def test_from_many(self):
+        mappings = [{'name': 'foo', 'count': 1}, {'name': 'bar', 'unknown': 'ignored'}]
+        items = Item.from_many(mappings)
+        assert [item.describe() for item in items] == ['FOO × 1', 'BAR × 0']
+        assert [dict(item) for item in items] == [dict(Item(**mapping)) for mapping in mappings]
+        # Note overrides __init__
+        notes = Note.from_many([{'note': {'10:00:00': 'foo'}}])
+        assert notes[0].content == 'foo'
+
+    def test_benchmark_from_many(self):
+        raws = [{'start': '10:00:00', 'end': '10:30:00', 'tags': ['research']}] * 2000
+        one_by_one_seconds = min(repeat(lambda: [Entry(**raw) for raw in raws], number=3, repeat=5))
+        from_many_seconds = min(repeat(lambda: Entry.from_many(raws), number=3, repeat=5))
+        log.info(f'{len(raws)} Entries: {one_by_one_seconds * 1000:.1f}ms one by one, '
+                 f'{from_many_seconds * 1000:.1f}ms from_many (x{one_by_one_seconds / from_many_seconds:.1f})')
+        assert from_many_seconds < one_by_one_seconds
@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import toml
+
+from test import TEST_START_ARROW
+from test.testutils import default_work
+from timefred.store.store import TomlEncoder
+
+
+def import_times(*argv: str, sheet_path: Path) -> dict[str, tuple[int, bool]]:
+    """Runs `tf *argv` under `python -X importtime`.
+    Returns:
+        The cumulative import time in microseconds of each imported module, and whether it was a top level import."""
+    env = {**os.environ, 'TIMEFRED_SHEET': str(sheet_path), 'TIMEFRED_DAEMON': '0'}
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-m', 'timefred', *argv],
+                             env=env, capture_output=True, text=True, cwd=Path(__file__).parent.parent)
+    assert process.returncode == 0, process.stderr
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.removeprefix('import time:').split('|')
+        # Top level imports aren't indented
+        top_level = not name[1:].startswith(' ')
+        times[name.strip()] = int(cumulative), top_level
+    return times
+
+
+@pytest.fixture
+def sheet_path(tmp_path) -> Path:
+    sheet_path = tmp_path / 'timefred-sheet--test-startup.toml'
+    sheet_path.write_text(toml.dumps(default_work(TEST_START_ARROW), TomlEncoder()))
+    return sheet_path
+
+
+class TestStatusStartup:
+    def test_imports_only_what_status_needs(self, sheet_path):
+        times = import_times('status', sheet_path=sheet_path)
+        assert 'timefred.action.status' in times
+        for module in ('yaml', 'rich', 'timefred.action.edit', 'timefred.action.log', 'timefred.store.snapshot', 'subprocess'):
+            assert module not in times, f'`tf status` imported {module}'
+    
+    def test_import_time_within_budget(self, sheet_path, pytestconfig):
+        budget_ms = pytestconfig.getoption('--startup-budget-ms')
+        times = import_times('status', sheet_path=sheet_path)
+        total_ms = sum(cumulative for cumulative, top_level in times.values() if top_level) / 1000
+        assert total_ms <= budget_ms, f'`tf status` imports took {total_ms:.1f}ms, budget is {budget_ms}ms'
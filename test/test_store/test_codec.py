@@ -0,0 +1,89 @@
+from pathlib import Path
+from time import perf_counter
+
+import pytest
+import toml
+
+from test.testutils import temp_sheet
+from timefred.log import log
+from timefred.store import Work, store
+from timefred.store.codec import CODECS, available, get_codec
+from timefred.store.models import CompactEntry
+from timefred.time import XArrow
+
+SHEETS = sorted(Path('test/sheets').glob('*.toml'))
+BACKENDS = [pytest.param(name, marks=pytest.mark.skipif(not available(name), reason=f'{name} is not installed'))
+            for name in CODECS]
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('sheet_path', SHEETS, ids=lambda sheet_path: sheet_path.stem)
+class TestConformance:
+    def test_loads_like_toml(self, backend, sheet_path):
+        text = sheet_path.read_text()
+        assert get_codec(backend).loads(text) == toml.loads(text)
+
+    def test_roundtrip(self, backend, sheet_path):
+        codec = get_codec(backend)
+        data = codec.loads(sheet_path.read_text())
+        assert codec.loads(codec.dumps(data)) == data
+        # Any backend reads what any other backend wrote
+        assert toml.loads(codec.dumps(data)) == data
+
+    def test_roundtrip_work(self, backend, sheet_path):
+        """Cast values (XArrows, CompactEntries) are dumped like the raw values they were cast from"""
+        codec = get_codec(backend)
+        data = codec.loads(sheet_path.read_text())
+        work = Work(**data).hydrate()
+        day = next(iter(work))
+        activity = next(name for name, value in dict.items(work[day]) if isinstance(value, list))
+        entry = work[day][activity][0]
+        entry.end = entry.start.shift(minutes=5)
+        work[day][activity].append(CompactEntry.from_raw({'start': '23:00:00', 'tags': ['compact']}))
+        reloaded = codec.loads(codec.dumps(work))
+        assert reloaded[day][activity][0]['end'] == entry.end.time().replace(microsecond=0)
+        assert reloaded[day][activity][-1] == {'start': XArrow.from_absolute('23:00:00').time(), 'tags': ['compact']}
+
+    def test_store_load_dump(self, backend, sheet_path):
+        """Same sheet as Store writes with the toml backend"""
+        def load_dump(backend_name) -> dict:
+            tmp_path = Path(f'/tmp/timefred-sheet--test-codec--{backend_name}--{sheet_path.stem}.toml')
+            tmp_path.write_text(sheet_path.read_text())
+            with temp_sheet(str(tmp_path), backup=False):
+                store.codec = get_codec(backend_name)
+                assert store.dump(store.load(lazy=False))
+                return toml.loads(tmp_path.read_text())
+        
+        assert load_dump(backend) == load_dump('toml')
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match='Unknown sheet codec'):
+        get_codec('yaml')
+    assert get_codec('auto').name == next(name for name in ('rtoml', 'tomllib', 'toml') if available(name))
+
+
+def test_benchmark():
+    sheet = ''.join(f'["{day:02}/12/21"]\n"Got to office" = 09:00:00\n'
+                    + ''.join(f'[["{day:02}/12/21"."Task {task}"]]\nstart = {9 + task:02}:{minute:02}:00\nend = {9 + task:02}:{minute + 15:02}:00\n'
+                                f'tags = ["research"]\nnotes = {{ "{9 + task:02}:{minute + 5:02}:00" = "PR-{task}" }}\n'
+                              for task in range(8) for minute in (0, 20, 40))
+                    for day in range(1, 31))
+    timings = {}
+    for name in CODECS:
+        if not available(name):
+            continue
+        codec = get_codec(name)
+        data = codec.loads(sheet)
+        load_seconds = min(_timed(codec.loads, sheet) for _ in range(3))
+        dump_seconds = min(_timed(codec.dumps, data) for _ in range(3))
+        timings[name] = load_seconds
+        log.info(f'{name}: load {load_seconds * 1000:.1f}ms, dump {dump_seconds * 1000:.1f}ms ({len(sheet):,} bytes)')
+    if 'tomllib' in timings:
+        assert timings['tomllib'] < timings['toml']
+
+
+def _timed(function, *args) -> float:
+    start = perf_counter()
+    function(*args)
+    return perf_counter() - start
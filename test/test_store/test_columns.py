@@ -0,0 +1,130 @@
+from datetime import date, datetime
+from pathlib import Path
+from textwrap import dedent
+
+from test.testutils import temp_sheet
+from timefred.config import config
+from timefred.store import store, Work
+from timefred.store.columns import Columns, ONGOING, NO_ID
+from timefred.store.sidecar import sidecar_path
+
+RAW_DATA = dedent('''
+    ["29/11/21"]
+    "Got to office" = "10:00"
+
+    [["29/11/21"."Integration"]]
+    start = 10:00:00
+    end = 11:00:00
+    tags = ["research"]
+
+    ["02/12/21"]
+    "Got to office" = 09:40:00
+
+    [["02/12/21"."Integration"]]
+    start = 10:00:00
+    end = 10:30:00
+    jira = "ASM-13925"
+    tags = ["research", "meeting"]
+
+    [["02/12/21"."Integration"]]
+    start = 11:00:00
+    ''')
+
+
+def epoch(ddmmyy: str, hhmmss: str) -> int:
+    return int(datetime.strptime(f'{ddmmyy} {hhmmss}', '%d/%m/%y %H:%M:%S').timestamp())
+
+
+class TestColumns:
+    def test_build(self):
+        import toml
+        columns = Work(**toml.loads(RAW_DATA)).to_columns()
+        assert len(columns) == 5
+        assert columns.days == ['29/11/21', '02/12/21']
+        assert columns.activities == ['Got to office', 'Integration']
+        assert columns.tags == ['research', 'meeting']
+        assert columns.jiras == ['ASM-13925']
+        assert list(columns.jira) == [NO_ID, NO_ID, NO_ID, 0, NO_ID]
+        assert list(columns.day) == [0, 0, 1, 1, 1]
+        assert list(columns.activity) == [0, 1, 0, 1, 1]
+        assert columns.start[1] == epoch('29/11/21', '10:00:00')
+        assert columns.end[1] == epoch('29/11/21', '11:00:00')
+        assert columns.end[4] == ONGOING
+        assert list(columns.tag_bits) == [0, 0b01, 0, 0b11, 0]
+
+    def test_totals(self):
+        import toml
+        columns = Work(**toml.loads(RAW_DATA)).to_columns()
+        now = epoch('02/12/21', '11:15:00')
+        durations = columns.durations(now)
+        # Entries without an end ("Got to office") last until now
+        got_to_office = (now - epoch('29/11/21', '10:00:00')) + (now - epoch('02/12/21', '09:40:00'))
+        assert columns.totals_by_activity(durations) == {'Got to office': got_to_office,
+                                                   'Integration':   3600 + 1800 + 900}
+        assert columns.totals_by_tag(durations) == {'research': 3600 + 1800, 'meeting': 1800}
+        assert columns.totals_by_jira(durations) == {'ASM-13925': 1800}
+
+    def test_totals_by_week(self):
+        import toml
+        columns = Work(**toml.loads(RAW_DATA)).to_columns()
+        durations = columns.durations(epoch('02/12/21', '11:15:00'))
+        total = sum(columns.totals_by_day(durations).values())
+        orig_first_day_of_week = config.time.first_day_of_week
+        try:
+            config.time.first_day_of_week = 'monday'
+            assert columns.totals_by_week(durations) == {date(2021, 11, 29): total}
+            config.time.first_day_of_week = 'sunday'
+            assert columns.totals_by_week(durations) == {date(2021, 11, 28): total}
+        finally:
+            config.time.first_day_of_week = orig_first_day_of_week
+
+    def test_ongoing_row(self):
+        import toml
+        work = Work(**toml.loads(RAW_DATA))
+        columns = work.to_columns()
+        # 02/12/21's last Integration entry, not the "Got to office" entries, which were never stopped
+        assert columns.ongoing_row() == 4
+        assert columns.start[4] == epoch('02/12/21', '11:00:00')
+        assert work.ongoing_pointer() == ('02/12/21', 'Integration', 1)
+
+    def test_between_and_clipped(self):
+        import toml
+        columns = Work(**toml.loads(RAW_DATA)).to_columns()
+        december = columns.between(date(2021, 12, 1), date(2021, 12, 31))
+        assert len(december) == 3
+        assert list(december.day) == [1, 1, 1]
+        assert list(december.tag_bits) == [0, 0b11, 0]
+        assert len(columns.between(date(2021, 11, 30), date(2021, 12, 1))) == 0
+        durations = december.durations(now=epoch('02/12/21', '12:00:00'),
+                                       since=epoch('02/12/21', '10:15:00'),
+                                       until=epoch('02/12/21', '11:30:00'))
+        assert list(durations) == [75 * 60, 15 * 60, 30 * 60]
+        assert december.totals_by_activity(durations) == {'Got to office': 75 * 60, 'Integration': 45 * 60}
+
+    def test_cached_next_to_sheet(self):
+        sheet_path = Path('/tmp/timefred-sheet--test-columns--test-cached-next-to-sheet.toml')
+        with temp_sheet(str(sheet_path)):
+            sheet_path.write_text(RAW_DATA)
+            columns_path = sidecar_path(sheet_path, '.columns')
+            columns_path.unlink(True)
+            columns = store.columns()
+            assert columns_path.exists()
+            cached = Columns.read(columns_path)
+            assert cached.key == columns.key
+            assert cached.days == columns.days
+            assert cached.tag_bits == columns.tag_bits
+            assert cached.start == columns.start
+            
+            work = store.load()
+            integration = work['02/12/21']['Integration']
+            integration.stop(integration[-1].start.shift(minutes=15))
+            store.dump(work)
+            assert store.columns().end[4] == epoch('02/12/21', '11:15:00')
+        columns_path.unlink()
+
+    def test_entries_without_end_last_zero_seconds_by_default(self):
+        import toml
+        work = Work(**toml.loads(RAW_DATA))
+        by_activity = work.to_columns().totals_by_activity()
+        assert by_activity == {'Got to office': 0, 'Integration': 3600 + 1800}
+        assert by_activity['Integration'] == sum(work[day]['Integration'].seconds for day in ('29/11/21', '02/12/21'))
@@ -0,0 +1,79 @@
+import tracemalloc
+from datetime import date, time
+
+import toml
+
+from test.testutils import sheet_config
+from timefred.store import Work, Entry
+from timefred.store.models import CompactEntry
+from timefred.store.store import TomlEncoder
+
+RAW_WORK = {
+    '02/12/21': {
+        'Got to office':  '09:40:00',
+        'Integration': [{'start': time(10, 0), 'end': time(10, 30),
+                         'tags': ['research'], 'notes': {'10:20:00': 'With Vlad'}}],
+        }
+    }
+
+
+class TestCompactEntry:
+    def test_raw_roundtrip(self):
+        raw = {'start': '10:00:00', 'end': time(10, 30), 'synced': True, 'tags': ['research'],
+               'notes': [{'10:20:00': 'With Vlad'}]}
+        entry = CompactEntry.from_raw(raw, date(2021, 12, 2))
+        assert entry.start.DDMMYYHHmmss == '02/12/21 10:00:00'
+        assert entry.end.DDMMYYHHmmss == '02/12/21 10:30:00'
+        assert entry.tags == ['research']
+        assert entry.notes[0].content == 'With Vlad'
+        assert entry.to_raw() == {**raw, 'start': time(10, 0)}
+    
+    def test_activity_constructs_compact_entries_on_the_days_date(self):
+        with sheet_config(compact_entries=True):
+            work = Work(**RAW_WORK)
+            integration = work['02/12/21']['Integration']
+            entry = integration[0]
+            assert isinstance(entry, CompactEntry)
+            assert entry.start.DDMMYY == '02/12/21'
+            assert integration.seconds == 30 * 60
+            assert 'With Vlad' in integration.pretty()
+            
+            got_to_office = work['02/12/21']['Got to office']
+            arrived = got_to_office[-1].start
+            got_to_office.stop(arrived.shift(minutes=20))
+            got_to_office.start(arrived.shift(hours=1), tag='back')
+            assert got_to_office[-1].tags == ['back']
+            assert got_to_office.ongoing()
+    
+    def test_dumped_like_entries(self):
+        work = Work(**RAW_WORK)
+        with sheet_config(compact_entries=True):
+            compact_work = Work(**RAW_WORK)
+            for day in compact_work.values():
+                for activity in day.values():
+                    list(activity)
+        assert isinstance(compact_work['02/12/21']['Integration'][0], CompactEntry)
+        compact_sheet = toml.loads(toml.dumps(compact_work, TomlEncoder()))
+        assert compact_sheet['02/12/21']['Integration'][0]['start'] == time(10, 0)
+        assert compact_sheet['02/12/21']['Integration'][0]['tags'] == ['research']
+        assert compact_sheet['02/12/21']['Got to office'][0]['start'] == time(9, 40)
+        assert Work(**compact_sheet)['02/12/21']['Integration'].seconds == work['02/12/21']['Integration'].seconds
+    
+    def test_smaller_than_entry(self):
+        raw = {'start': '10:00:00', 'end': '10:30:00', 'tags': ['research']}
+        
+        def allocated(construct) -> int:
+            tracemalloc.start()
+            entries = [construct() for _ in range(1000)]
+            size, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return size
+        
+        def construct_entry():
+            entry = Entry(**raw)
+            entry.start, entry.end, entry.tags
+            return entry
+        
+        entry_size = allocated(construct_entry)
+        compact_entry_size = allocated(lambda: CompactEntry.from_raw(raw))
+        assert compact_entry_size * 3 < entry_size
@@ -0,0 +1,92 @@
+from pathlib import Path
+from textwrap import dedent
+
+from test.testutils import temp_sheet
+from timefred.store import store, Work
+from timefred.store.index import SheetIndex
+from timefred.store.lazy import UnparsedDay, index_day_sections
+from timefred.store.sidecar import SheetStat, sidecar_path
+
+RAW_DATA = dedent('''
+    ["01/12/21"]
+    "Got to office" = "10:00"
+
+    ["02/12/21"]
+    "Got to office" = 09:40:00
+
+    [["02/12/21"."Integration"]]
+    start = 10:00:00
+    end = 10:30:00
+    ''').encode()
+
+
+def write_sheet(sheet_path: str, data: bytes = RAW_DATA) -> Path:
+    sheet_path = Path(sheet_path)
+    sheet_path.write_bytes(data)
+    sidecar_path(sheet_path, '.index').unlink(True)
+    return sheet_path
+
+
+class TestSheetIndex:
+    def test_write_read_roundtrip(self):
+        sheet_path = write_sheet('/tmp/timefred-sheet--test-index--test-write-read-roundtrip.toml')
+        with sheet_path.open('rb') as sheet:
+            index = SheetIndex.build(sheet)
+        assert index.sections == index_day_sections(RAW_DATA)
+        assert index.stat == SheetStat.of(sheet_path)
+
+        index_path = sidecar_path(sheet_path, '.index')
+        assert index.write(index_path)
+        read_index = SheetIndex.read(index_path)
+        assert read_index.stat == index.stat
+        assert read_index.sections == index.sections
+        index_path.unlink()
+        sheet_path.unlink()
+
+    def test_stale_index_is_rebuilt(self):
+        sheet_path = write_sheet('/tmp/timefred-sheet--test-index--test-stale-index-is-rebuilt.toml')
+        with sheet_path.open('rb') as sheet:
+            assert list(SheetIndex.load(sheet).sections) == ['01/12/21', '02/12/21']
+        sheet_path.write_bytes(RAW_DATA + b'\n["03/12/21"]\n"Got to office" = "09:00"\n')
+        with sheet_path.open('rb') as sheet:
+            assert list(SheetIndex.load(sheet).sections) == ['01/12/21', '02/12/21', '03/12/21']
+        sidecar_path(sheet_path, '.index').unlink()
+        sheet_path.unlink()
+
+    def test_corrupt_index_is_ignored(self):
+        sheet_path = write_sheet('/tmp/timefred-sheet--test-index--test-corrupt-index-is-ignored.toml')
+        index_path = sidecar_path(sheet_path, '.index')
+        index_path.write_bytes(b'TFIX\x01garbage')
+        assert SheetIndex.read(index_path) is None
+        with sheet_path.open('rb') as sheet:
+            assert list(SheetIndex.load(sheet).sections) == ['01/12/21', '02/12/21']
+        index_path.unlink()
+        sheet_path.unlink()
+
+    def test_sheets_with_same_name_dont_share_index(self):
+        sheet_path = write_sheet('/tmp/timefred-sheet--test-index--test-same-name.toml')
+        other_sheet_path = Path('/tmp/timefred-test-index-other-dir') / sheet_path.name
+        other_sheet_path.parent.mkdir(exist_ok=True)
+        write_sheet(str(other_sheet_path), b'["03/12/21"]\n"Got to office" = "09:00"\n')
+        assert sidecar_path(sheet_path, '.index') != sidecar_path(other_sheet_path, '.index')
+        with sheet_path.open('rb') as sheet:
+            assert list(SheetIndex.load(sheet).sections) == ['01/12/21', '02/12/21']
+        with other_sheet_path.open('rb') as sheet:
+            assert list(SheetIndex.load(sheet).sections) == ['03/12/21']
+        for path in sheet_path, other_sheet_path:
+            sidecar_path(path, '.index').unlink()
+            path.unlink()
+        other_sheet_path.parent.rmdir()
+
+
+class TestStoreLoad:
+    def test_days_are_read_by_seeking(self):
+        sheet_path = write_sheet('/tmp/timefred-sheet--test-index--test-days-are-read-by-seeking.toml')
+        with temp_sheet(str(sheet_path)):
+            work: Work = store.load(lazy=True)
+            assert sidecar_path(sheet_path, '.index').exists()
+        # The sheet was removed by temp_sheet, but days are still readable through the open handle
+        unparsed_day = dict.__getitem__(work, '02/12/21')
+        assert isinstance(unparsed_day, UnparsedDay)
+        assert work['02/12/21']['Integration'].safe_last_entry().end.HHmmss == '10:30:00'
+        sidecar_path(sheet_path, '.index').unlink()
@@ -0,0 +1,112 @@
+import fcntl
+from threading import Thread
+
+from test import TEST_START_ARROW
+from test.testutils import default_work, sheet_config, temp_sheet
+from timefred.store import store, Activity, Work
+from timefred.store.journal import Mutation
+from timefred.time import XArrow
+
+
+class TestJournal:
+    def test_commit_appends_without_rewriting_sheet(self):
+        sheet_path = '/tmp/timefred-sheet--test-journal--test-commit-appends.toml'
+        with temp_sheet(sheet_path), sheet_config(journal=True):
+            store.dump(default_work(TEST_START_ARROW))
+            sheet_before = store.path.read_text()
+
+            work = store.load()
+            stop_time = XArrow.now()
+            work.stop(stop_time)
+            assert store.commit(work, Mutation(op='stop', time=stop_time))
+
+            assert store.path.read_text() == sheet_before
+            assert store.journal.size() > 0
+            mutations = list(store.journal)
+            assert len(mutations) == 1
+            assert mutations[0].op == 'stop'
+            assert mutations[0].time.DDMMYYHHmmss == stop_time.DDMMYYHHmmss
+
+    def test_load_replays_journal(self):
+        sheet_path = '/tmp/timefred-sheet--test-journal--test-load-replays.toml'
+        with temp_sheet(sheet_path), sheet_config(journal=True):
+            store.dump(default_work(TEST_START_ARROW))
+
+            work = store.load()
+            start_time = XArrow.now()
+            work.on("Something New", start_time, tag="research")
+            assert store.commit(work, Mutation(op='start', activity="Something New", time=start_time, tag="research"))
+
+            work: Work = store.load()
+            got_to_office: Activity = work[TEST_START_ARROW.DDMMYY]["Got to office"]
+            assert got_to_office.ongoing() is False
+            something_new: Activity = work.ongoing_activity()
+            assert something_new.name == "Something New"
+            assert something_new.safe_last_entry().tags == ["research"]
+
+    def test_replayed_stop_is_in_local_time(self):
+        sheet_path = '/tmp/timefred-sheet--test-journal--test-replayed-stop-local-time.toml'
+        with temp_sheet(sheet_path), sheet_config(journal=True):
+            store.dump(default_work(TEST_START_ARROW))
+            work = store.load()
+            got_to_office: Activity = work[TEST_START_ARROW.DDMMYY]["Got to office"]
+            stop_time = got_to_office.safe_last_entry().start.shift(hours=1)
+            store.journal.append(Mutation(op='stop', time=stop_time))
+
+            work = store.load()
+            got_to_office: Activity = work[TEST_START_ARROW.DDMMYY]["Got to office"]
+            assert got_to_office.safe_last_entry().end == stop_time
+            assert got_to_office.seconds == 3600
+
+    def test_load_waits_for_sheet_replacement(self):
+        sheet_path = '/tmp/timefred-sheet--test-journal--test-load-waits-for-sheet-replacement.toml'
+        with temp_sheet(sheet_path), sheet_config(journal=True):
+            store.dump(default_work(TEST_START_ARROW))
+            work = store.load()
+            start_time = XArrow.now()
+            work.on("Something New", start_time)
+            assert store.commit(work, Mutation(op='start', activity="Something New", time=start_time))
+
+            loaded = []
+            with store.journal.path.open('a') as journal:
+                # As a concurrent `tf store compact` would, between replacing the sheet and clearing the journal
+                fcntl.flock(journal, fcntl.LOCK_EX)
+                loader = Thread(target=lambda: loaded.append(store.load()))
+                loader.start()
+                loader.join(0.2)
+                assert loader.is_alive()
+                store._write_atomically(store._dumps(work))
+                store.journal.clear()
+                fcntl.flock(journal, fcntl.LOCK_UN)
+            loader.join()
+            something_new: Activity = loaded[0][start_time.DDMMYY]["Something New"]
+            assert len(something_new) == 1
+
+    def test_compact(self):
+        sheet_path = '/tmp/timefred-sheet--test-journal--test-compact.toml'
+        with temp_sheet(sheet_path), sheet_config(journal=True):
+            store.dump(default_work(TEST_START_ARROW))
+
+            work = store.load()
+            stop_time = XArrow.now()
+            work.stop(stop_time)
+            store.commit(work, Mutation(op='stop', time=stop_time))
+
+            assert store.compact()
+            assert store.journal.size() == 0
+            work = store.load()
+            got_to_office: Activity = work[TEST_START_ARROW.DDMMYY]["Got to office"]
+            assert got_to_office.safe_last_entry().end.HHmmss == stop_time.HHmmss
+
+    def test_truncated_record_is_ignored(self):
+        sheet_path = '/tmp/timefred-sheet--test-journal--test-truncated-record.toml'
+        with temp_sheet(sheet_path), sheet_config(journal=True):
+            store.dump(default_work(TEST_START_ARROW))
+            stop_time = XArrow.now()
+            store.journal.append(Mutation(op='stop', time=stop_time))
+            with store.journal.path.open('a') as journal:
+                journal.write('{"op": "start", "activ')
+
+            work = store.load()
+            assert work[TEST_START_ARROW.DDMMYY]["Got to office"].ongoing() is False
+            store.journal.path.unlink()
@@ -0,0 +1,140 @@
+from textwrap import dedent
+
+from test.testutils import temp_sheet
+from timefred.store import store, Day, Activity, Work
+from timefred.store.lazy import index_day_sections, load_lazily, UnparsedDay
+
+RAW_DATA = dedent('''
+    ["01/12/21"]
+    "Got to office" = "10:00"
+
+    [["01/12/21"."Integration"]]
+    synced = true
+    start = 10:30:00
+    end = 11:00:00
+
+    ["02/12/21"]
+    "Got to office" = 09:40:00
+
+    [["02/12/21"."Integration"]]
+    start = 10:00:00
+    end = 10:30:00
+    notes = {"10:20:00" = "With Vlad"}
+    ''').encode()
+
+MULTILINE_NOTE_DATA = dedent('''
+    ["17/10/26"]
+    "Got to office" = 09:40:00
+
+    [["17/10/26"."Integration"]]
+    start = 10:00:00
+    end = 10:30:00
+    notes = {"10:20:00" = """Copied from yesterday's sheet:
+    ["17/10/26"]
+    "Got to office" = 08:00:00"""}
+
+    ["18/10/26"]
+    "Got to office" = 09:00:00
+    ''').encode()
+
+
+class TestIndexDaySections:
+    def test_sanity(self):
+        sections = index_day_sections(RAW_DATA)
+        assert list(sections) == ['01/12/21', '02/12/21']
+        start, end = sections['02/12/21'][0]
+        assert RAW_DATA[start:].startswith(b'["02/12/21"]')
+        assert sections['01/12/21'][-1][1] == start
+        assert sections['02/12/21'][-1][1] == len(RAW_DATA)
+
+    def test_top_level_content_is_not_indexed(self):
+        assert index_day_sections(b'"01/12/21" = {"Got to office" = "10:00"}\n') is None
+
+    def test_comments_before_first_day(self):
+        sections = index_day_sections(b'# my sheet\n' + RAW_DATA)
+        assert list(sections) == ['01/12/21', '02/12/21']
+
+    def test_header_in_multiline_string(self):
+        sections = index_day_sections(MULTILINE_NOTE_DATA)
+        assert list(sections) == ['17/10/26', '18/10/26']
+        assert len(sections['17/10/26']) == 2
+
+
+class TestLoadLazily:
+    def test_only_accessed_days_are_parsed(self):
+        work: Work = load_lazily(RAW_DATA)
+        assert isinstance(dict.__getitem__(work, '01/12/21'), UnparsedDay)
+        assert isinstance(dict.__getitem__(work, '02/12/21'), UnparsedDay)
+
+        day: Day = work['02/12/21']
+        assert isinstance(day, Day)
+        assert isinstance(dict.__getitem__(work, '01/12/21'), UnparsedDay)
+
+        activity: Activity = day['Integration']
+        assert activity.safe_last_entry().end.HHmmss == '10:30:00'
+        assert activity.safe_last_entry().notes[0].content == 'With Vlad'
+
+    def test_header_in_multiline_string(self):
+        work: Work = load_lazily(MULTILINE_NOTE_DATA)
+        activity: Activity = work['17/10/26']['Integration']
+        assert activity.safe_last_entry().notes[0].content.endswith('"Got to office" = 08:00:00')
+        assert work['17/10/26']['Got to office'].safe_last_entry().start.HHmmss == '09:40:00'
+
+    def test_falls_back_to_parsing_whole_sheet(self):
+        # As if the scanner took the note's line for a header
+        note_header = MULTILINE_NOTE_DATA.index(b'["17/10/26"]', 1)
+        unparsed_day = UnparsedDay('17/10/26', MULTILINE_NOTE_DATA, [(note_header, len(MULTILINE_NOTE_DATA))])
+        day = Day(**unparsed_day)
+        assert day['Got to office'].safe_last_entry().start.HHmmss == '09:40:00'
+        assert day['Integration'].safe_last_entry().end.HHmmss == '10:30:00'
+
+    def test_dump_keeps_unparsed_days_verbatim(self):
+        sheet_path = '/tmp/timefred-sheet--test-lazy--test-dump-keeps-unparsed-days-verbatim.toml'
+        with open(sheet_path, 'wb') as sheet:
+            sheet.write(RAW_DATA)
+
+        with temp_sheet(sheet_path):
+            work = store.load(lazy=True)
+            work['02/12/21']['Integration'].safe_last_entry().end = '10:45:00'
+            store.dump(work)
+            dumped = store.path.read_bytes()
+
+            first_day_start, first_day_end = index_day_sections(RAW_DATA)['01/12/21'][0]
+            assert dumped.startswith(RAW_DATA[first_day_start:first_day_end])
+
+            work = store.load(lazy=False)
+            assert work['02/12/21']['Integration'].safe_last_entry().end.HHmmss == '10:45:00'
+            assert work['01/12/21']['Integration'].safe_last_entry().end.HHmmss == '11:00:00'
+
+    def test_dump_splices_only_changed_days(self):
+        sheet_path = '/tmp/timefred-sheet--test-lazy--test-dump-splices-only-changed-days.toml'
+        with open(sheet_path, 'wb') as sheet:
+            sheet.write(RAW_DATA)
+
+        with temp_sheet(sheet_path):
+            work = store.load(lazy=True)
+            # Accessed, but unchanged
+            first_day: Day = work['01/12/21']
+            assert first_day['Integration'].safe_last_entry().synced is True
+            assert first_day['Got to office'].safe_last_entry().start.HHmmss == '10:00:00'
+            assert not first_day.changed()
+            
+            second_day: Day = work['02/12/21']
+            second_day['Integration'].safe_last_entry().add_tag('meeting')
+            assert second_day.changed()
+            store.dump(work)
+            dumped = store.path.read_bytes()
+            
+            sections = index_day_sections(RAW_DATA)
+            first_day_end = sections['01/12/21'][-1][1]
+            assert dumped.startswith(RAW_DATA[sections['01/12/21'][0][0]:first_day_end])
+            second_day_start, second_day_end = sections['02/12/21'][-1]
+            assert RAW_DATA[second_day_start:second_day_end] not in dumped
+            
+            work = store.load(lazy=True)
+            assert work['02/12/21']['Integration'].safe_last_entry().tags == ['meeting']
+            # Starting and stopping marks the day dirty, without comparing
+            day: Day = work['01/12/21']
+            day['Integration'].start('12:00:00')
+            assert day.__dirty__
+            assert work['01/12/21'].changed()
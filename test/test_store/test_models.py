@@ -2,7 +2,8 @@ from test import TEST_START_ARROW
 from test.testutils import default_work, assert_raises
 from timefred.log import log
 from timefred.note import Note
-from timefred.store import Day, Activity, Entry
+from timefred.space import Field
+from timefred.store import Day, Activity, Entry, Work
 from timefred.tag import Tag
 from timefred.time import XArrow
 import pytest
@@ -59,6 +60,107 @@ class TestActivity:
             with assert_raises(ValueError, f'Cannot stop {got_to_office_activity.shortrepr()} before start time (tried to stop at {yesterday!r})'):
                 got_to_office_activity.stop(yesterday)
     
+    class Test_cached_totals:
+        def test_invalidated_by_start_and_stop(self):
+            work = default_work(TEST_START_ARROW)
+            day: Day = work[TEST_START_ARROW.DDMMYY]
+            got_to_office_activity: Activity = day["Got to office"]
+            start = got_to_office_activity.safe_last_entry().start
+            assert got_to_office_activity.seconds == 0
+            assert day.seconds == 0
+            
+            got_to_office_activity.stop(start.shift(minutes=30))
+            assert got_to_office_activity.seconds == 30 * 60
+            assert got_to_office_activity.human_duration == '30 minutes'
+            assert day.seconds == 30 * 60
+            
+            got_to_office_activity.start(start.shift(hours=1))
+            got_to_office_activity.stop(start.shift(hours=2))
+            assert got_to_office_activity.seconds == 90 * 60
+            assert day.seconds == 90 * 60
+            assert day.human_duration == '1 hour & 30 minutes'
+        
+        def test_other_activities_stay_cached(self):
+            work = default_work(TEST_START_ARROW)
+            day: Day = work[TEST_START_ARROW.DDMMYY]
+            got_to_office_activity: Activity = day["Got to office"]
+            start = got_to_office_activity.safe_last_entry().start
+            got_to_office_activity.stop(start.shift(minutes=30))
+            other_activity: Activity = day["Something else"]
+            other_activity.start(start.shift(minutes=30))
+            assert day.seconds == 30 * 60
+            
+            other_activity.stop(start.shift(minutes=45))
+            assert 'seconds' in got_to_office_activity.__dict__
+            # Updated in place rather than recomputed
+            assert day.__dict__['seconds'] == 45 * 60
+            
+            del other_activity[-1]
+            assert 'seconds' not in day.__dict__
+            assert day.seconds == 30 * 60
+    
+    class Test_rollups:
+        def test_maintained_by_start_and_stop(self):
+            from datetime import date
+            work = Work(**toml.loads('''
+                ["29/11/21"]
+                
+                [["29/11/21"."Integration"]]
+                start = 10:00:00
+                end = 11:00:00
+                
+                ["02/12/21"]
+                
+                [["02/12/21"."Integration"]]
+                start = 10:00:00
+                end = 10:30:00
+                '''))
+            monday = date(2021, 11, 29)
+            december = date(2021, 12, 2)
+            assert work.week_seconds(monday) == work.week_seconds(december) == 90 * 60
+            assert work.month_seconds(monday) == 60 * 60
+            assert work.month_seconds(december) == 30 * 60
+            
+            rollups = work.rollups()
+            integration: Activity = work['02/12/21']['Integration']
+            start = integration.safe_last_entry().start
+            integration.start(start.shift(hours=1))
+            integration.stop(start.shift(hours=2))
+            assert work.rollups() is rollups
+            assert work.week_seconds(december) == 150 * 60
+            assert work.month_seconds(december) == 90 * 60
+            assert work.month_seconds(december) == work['02/12/21'].seconds
+            
+            integration.pop()
+            assert work.__rollups__ is None
+            assert work.month_seconds(december) == 30 * 60
+        
+        def test_days_without_a_date_are_skipped(self):
+            from datetime import date
+            work = Work(**toml.loads('''
+                ["29/11/21"]
+                
+                [["29/11/21"."Integration"]]
+                start = 10:00:00
+                end = 11:00:00
+                
+                ["backlog"]
+                
+                [["backlog"."Integration"]]
+                start = 10:00:00
+                end = 10:30:00
+                '''))
+            monday = date(2021, 11, 29)
+            rollups = work.rollups()
+            assert work.week_seconds(monday) == 60 * 60
+            integration: Activity = work['backlog']['Integration']
+            start = integration.safe_last_entry().start
+            integration.start(start.shift(hours=1))
+            integration.stop(start.shift(hours=2))
+            assert work.rollups() is rollups
+            assert work.week_seconds(monday) == 60 * 60
+
+
 class TestEntry:
     def test_init_with_all_fields(self):
         entry = Entry(start="02:00:00",
@@ -80,6 +182,24 @@ class TestEntry:
         assert entry.tags == [Tag("meeting")]
         assert next(iter(entry.tags)) == Tag("meeting")
         assert isinstance(next(iter(entry.tags)), Tag)
+    
+    def test_dated_by_its_day(self):
+        work = Work(**toml.loads('''
+            ["01/12/21"]
+            "Got to office" = "09:40:00"
+            
+            [["01/12/21"."Integration"]]
+            start = 23:00:00
+            end = 23:30:00
+            '''))
+        assert work['01/12/21']['Got to office'][0].start.DDMMYYHHmmss == '01/12/21 09:40:00'
+        integration_entry = work['01/12/21']['Integration'][0]
+        assert integration_entry.start.DDMMYYHHmmss == '01/12/21 23:00:00'
+        assert integration_entry.end.DDMMYYHHmmss == '01/12/21 23:30:00'
+        # Parsed once
+        from datetime import time
+        assert XArrow.from_date_time(integration_entry.start.date(), time(23)) is integration_entry.start
+        assert XArrow.from_absolute('02:00:00') is XArrow.from_absolute('02:00:00')
         
 class TestDay:
     @pytest.mark.skip("not yet implemented")
@@ -93,4 +213,73 @@ class TestDay:
         work = {"24/12/21": day}
         toml_str = toml.dumps(work)
         print(toml_str)
-    
\ No newline at end of file
+    
+
+class TestWork:
+    @staticmethod
+    def month_of_work() -> Work:
+        sheet = ''.join(f'["{day:02}/12/21"]\n"Got to office" = "09:00:00"\n'
+                        + ''.join(f'[["{day:02}/12/21"."Task {task}"]]\nstart = {9 + task:02}:{minute:02}:00\nend = {9 + task:02}:{minute + 15:02}:00\ntags = ["research"]\n'
+                                  for task in range(8) for minute in (0, 20, 40))
+                        for day in range(1, 31))
+        return Work(**toml.loads(sheet))
+    
+    def test_iter_values_on_demand(self):
+        work = self.month_of_work()
+        values = work.itervalues()
+        assert not any(isinstance(day, Day) for day in dict.values(work))
+        first_day = next(values)
+        assert isinstance(first_day, Day)
+        assert sum(isinstance(day, Day) for day in dict.values(work)) == 1
+        assert [key for key, day in work.iteritems()] == list(work.keys())
+        activity = first_day['Task 0']
+        assert not isinstance(list.__getitem__(activity, 0), Entry)
+        assert [entry.end.HHmmss for entry in activity] == ['09:15:00', '09:35:00', '09:55:00']
+    
+    def test_hydrate(self):
+        work = self.month_of_work()
+        assert work.hydrate() is work
+        for day in dict.values(work):
+            assert isinstance(day, Day)
+            for activity in dict.values(day):
+                assert isinstance(activity, Activity)
+                for entry in list.__iter__(activity):
+                    assert isinstance(entry, Entry)
+                    # Cast, dated by its Day
+                    assert entry.__dict__['start'].DDMMYY == day.__key__
+        assert work['05/12/21']['Task 3'][0].tags == [Tag('research')]
+        assert work['05/12/21'].seconds == 8 * 45 * 60
+    
+    def test_hydrate_caches_every_field(self, monkeypatch):
+        work = self.month_of_work().hydrate()
+        for day in dict.values(work):
+            for activity in dict.values(day):
+                for entry in list.__iter__(activity):
+                    assert set(entry.__fields__) <= set(entry.__dict__)
+        assert work['05/12/21']['Task 3'][0].__dict__['tags'] == [Tag('research')]
+        
+        # Nothing is cast nor constructed anymore when traversing
+        def raise_(*args):
+            raise AssertionError('Not hydrated')
+        
+        monkeypatch.setattr(Field, '__get__', raise_)
+        monkeypatch.setattr(Activity, '__getitem__', raise_)
+        for day in work.values():
+            for activity in day.values():
+                for entry in activity:
+                    entry.start, entry.end, entry.jira, entry.synced, entry.notes, entry.tags
+    
+    def test_hydrate_constructs_each_activity_at_once(self, monkeypatch):
+        work = self.month_of_work()
+        raw_entry_counts = []
+        construct_many = Activity._construct_many
+        
+        def counting_construct_many(activity, raw_entries):
+            raw_entry_counts.append(len(raw_entries))
+            return construct_many(activity, raw_entries)
+        
+        monkeypatch.setattr(Activity, '_construct_many', counting_construct_many)
+        work.hydrate()
+        # "Got to office" plus 8 tasks a day, 30 days
+        assert len(raw_entry_counts) == 9 * 30
+        assert sum(raw_entry_counts) == (1 + 8 * 3) * 30
@@ -0,0 +1,65 @@
+from test import TEST_START_ARROW
+from test.testutils import default_work, temp_sheet
+from timefred.space.field import UNSET
+from timefred.store import store, Work
+from timefred.store.models import Ongoing
+from timefred.store.ongoing import read_ongoing
+from timefred.store.sidecar import sidecar_path
+
+
+def forbid_scanning(monkeypatch):
+    def _find_ongoing(self):
+        raise AssertionError('Work._find_ongoing was called')
+    monkeypatch.setattr(Work, '_find_ongoing', _find_ongoing)
+
+
+class TestOngoingPointer:
+    def test_on_and_stop_keep_pointer_up_to_date(self, monkeypatch):
+        work = default_work(TEST_START_ARROW)
+        assert work.ongoing_pointer() == Ongoing(TEST_START_ARROW.DDMMYY, 'Got to office', 0)
+        forbid_scanning(monkeypatch)
+        
+        work.on('Something', TEST_START_ARROW.shift(hours=1))
+        assert work.__ongoing__ == Ongoing(TEST_START_ARROW.DDMMYY, 'Something', 0)
+        assert work.ongoing_activity().name == 'Something'
+        
+        work.stop(TEST_START_ARROW.shift(hours=2))
+        assert work.__ongoing__ is None
+        
+        work[TEST_START_ARROW.DDMMYY]['Got to office'].start(TEST_START_ARROW.shift(hours=3))
+        assert work.__ongoing__ == Ongoing(TEST_START_ARROW.DDMMYY, 'Got to office', 1)
+    
+    def test_pointer_is_persisted(self, monkeypatch):
+        sheet_path = '/tmp/timefred-sheet--test-ongoing--test-pointer-is-persisted.toml'
+        with temp_sheet(sheet_path):
+            work = default_work(TEST_START_ARROW)
+            work.on('Something', TEST_START_ARROW.shift(hours=1))
+            store.dump(work)
+            assert read_ongoing(store.path) == Ongoing(TEST_START_ARROW.DDMMYY, 'Something', 0)
+            
+            forbid_scanning(monkeypatch)
+            work = store.load()
+            assert work.ongoing_activity().name == 'Something'
+            sidecar_path(store.path, '.ongoing').unlink()
+    
+    def test_stale_pointer_is_rebuilt(self):
+        sheet_path = '/tmp/timefred-sheet--test-ongoing--test-stale-pointer-is-rebuilt.toml'
+        with temp_sheet(sheet_path):
+            work = default_work(TEST_START_ARROW)
+            work.on('Something', TEST_START_ARROW.shift(hours=1))
+            store.dump(work)
+            # Edited by hand: "Something" is no longer ongoing
+            sheet = store.path.read_text().rstrip('\n') + '\nend = 12:00:00\n'
+            store.path.write_text(sheet)
+            assert read_ongoing(store.path) is UNSET
+            
+            # Lazily loaded days aren't parsed just to find the pointer
+            work = store.load(lazy=True)
+            assert work.__ongoing__ is UNSET
+            assert work.ongoing_pointer() is None
+            assert read_ongoing(store.path) is UNSET
+            
+            work = store.load(lazy=False)
+            assert work.__ongoing__ is None
+            assert read_ongoing(store.path) is None
+            sidecar_path(store.path, '.ongoing').unlink()
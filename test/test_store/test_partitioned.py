@@ -0,0 +1,147 @@
+import shutil
+from pathlib import Path
+from textwrap import dedent
+from unittest.mock import patch
+
+import toml
+
+from test.testutils import assert_raises, temp_sheet
+from timefred import action
+from timefred.error import TIError
+from timefred.store import store, Work
+from timefred.space.field import UNSET
+from timefred.store.lazy import UnparsedDay
+from timefred.store.models import Ongoing
+from timefred.store.ongoing import read_ongoing
+from timefred.store.partitioned import PartitionedStore, partition_name
+from timefred.store.store import Store
+from timefred.time import XArrow
+from timefred.time.timeutils import parse_date
+
+RAW_DATA = dedent('''
+    ["29/11/21"]
+    "Got to office" = "10:00"
+
+    [["29/11/21"."Integration"]]
+    start = 10:30:00
+    end = 11:00:00
+
+    ["01/12/21"]
+    "Got to office" = 09:40:00
+
+    [["01/12/21"."Integration"]]
+    start = 10:00:00
+    end = 10:30:00
+    tags = ["meeting"]
+    ''')
+
+
+def migrated(name: str) -> Path:
+    """A partitioned sheet directory, migrated from RAW_DATA"""
+    toml_path = Path(f'/tmp/timefred-sheet--test-partitioned--{name}.toml')
+    toml_path.write_text(RAW_DATA)
+    directory = toml_path.with_suffix('')
+    shutil.rmtree(directory, ignore_errors=True)
+    assert action.migrate(str(toml_path), str(directory))
+    return directory
+
+
+def test_partition_name():
+    assert partition_name('23/12/21') == '2021-12'
+    assert partition_name('01/01/22') == '2022-01'
+
+
+class TestPartitionedStore:
+    def test_of(self):
+        assert type(Store.of('/tmp/timefred--test-partitioned--nonexistent')) is PartitionedStore
+        assert type(Store.of(migrated('test-of'))) is PartitionedStore
+        # Has files, none of which are partitions
+        assert type(Store.of('/tmp')) is not PartitionedStore
+        assert type(Store.of('/tmp/timefred-sheet.toml')) is Store
+
+    def test_migrate(self):
+        directory = migrated('test-migrate')
+        assert [path.name for path in sorted(directory.iterdir())] == ['2021-11.toml', '2021-12.toml']
+        assert list(toml.loads((directory / '2021-11.toml').read_text())) == ['29/11/21']
+        # And back
+        roundtrip_path = directory.with_name(directory.name + '--roundtrip.toml')
+        roundtrip_path.unlink(True)
+        assert action.migrate(str(directory), str(roundtrip_path))
+        assert toml.loads(roundtrip_path.read_text()) == toml.loads(RAW_DATA)
+
+    def test_migrate_refuses_unrelated_directory(self):
+        toml_path = Path('/tmp/timefred-sheet--test-partitioned--test-migrate-refuses-unrelated-directory.toml')
+        toml_path.write_text(RAW_DATA)
+        directory = toml_path.with_suffix('')
+        shutil.rmtree(directory, ignore_errors=True)
+        directory.mkdir()
+        (directory / 'pyproject.toml').write_text('[tool.poetry]\n')
+        with assert_raises(TIError, 'partitioned sheet'):
+            action.migrate(str(toml_path), str(directory))
+        assert [path.name for path in directory.iterdir()] == ['pyproject.toml']
+        shutil.rmtree(directory)
+        toml_path.unlink()
+
+    def test_dump_leaves_other_files_alone(self):
+        directory = migrated('test-dump-leaves-other-files-alone')
+        pyproject = directory / 'pyproject.toml'
+        pyproject.write_text('[tool.poetry]\n')
+        store = Store.of(directory)
+        assert type(store) is PartitionedStore
+        work: Work = store.load(lazy=False)
+        del work['29/11/21']
+        assert store.dump(work)
+        assert sorted(path.name for path in directory.iterdir()) == ['2021-12.toml', 'pyproject.toml']
+        assert pyproject.read_text() == '[tool.poetry]\n'
+
+    def test_reads_only_accessed_partitions(self):
+        store = Store.of(migrated('test-reads-only-accessed-partitions'))
+        work: Work = store.load(lazy=True)
+        november_day = dict.__getitem__(work, '29/11/21')
+        assert isinstance(november_day, UnparsedDay)
+        days = list(work.days_between(parse_date('01/12/21'), parse_date('31/12/21')))
+        assert [day['Integration'].safe_last_entry().tags for _, day in days] == [['meeting']]
+        # November was never opened
+        assert november_day.source._file is None
+
+    def test_dump_rewrites_only_changed_partitions(self):
+        directory = migrated('test-dump-rewrites-only-changed-partitions')
+        november, december = directory / '2021-11.toml', directory / '2021-12.toml'
+        november_inode = november.stat().st_ino
+        with temp_sheet(str(directory), rm=False), patch('timefred.util.confirm', return_value=True):
+            now = XArrow.now()
+            # Stops "Got to office" of 01/12/21, which is still ongoing, at the end of that day
+            assert action.on("Something New", now)
+            assert type(store._store) is PartitionedStore
+            assert november.stat().st_ino == november_inode
+            assert toml.loads(december.read_text())['01/12/21']['Got to office'][0]['end'].isoformat() == '23:59:59'
+            current_partition = directory / f'{partition_name(now.DDMMYY)}.toml'
+            assert now.DDMMYY in toml.loads(current_partition.read_text())
+
+            december_inode = december.stat().st_ino
+            work: Work = store.load()
+            assert work.ongoing_activity().name == "Something New"
+            assert action.stop(XArrow.now())
+            assert november.stat().st_ino == november_inode
+            assert december.stat().st_ino == december_inode
+            work: Work = store.load()
+            assert work.ongoing_pointer() is None
+            assert work['29/11/21']['Integration'].safe_last_entry().end.HHmmss == '11:00:00'
+
+    def test_ongoing_pointer_is_stale_after_editing_a_partition_in_place(self):
+        directory = migrated('test-ongoing-pointer-is-stale-after-editing-a-partition-in-place')
+        store = Store.of(directory)
+        work: Work = store.load(lazy=False)
+        assert work.ongoing_pointer() == Ongoing('01/12/21', 'Got to office', 0)
+        assert store.dump(work)
+        assert read_ongoing(directory, store._sheet_stat()) == Ongoing('01/12/21', 'Got to office', 0)
+
+        # Edited by hand, which doesn't change the directory's stat
+        directory_stat = directory.stat()
+        with (directory / '2021-12.toml').open('a') as december:
+            december.write('\n["02/12/21"]\n"Got to office" = 09:00:00\n\n[["02/12/21"."Review"]]\nstart = 10:00:00\n')
+        assert directory.stat().st_mtime_ns == directory_stat.st_mtime_ns
+        assert read_ongoing(directory, store._sheet_stat()) is UNSET
+
+        work: Work = store.load(lazy=False)
+        assert work.ongoing_pointer() == Ongoing('02/12/21', 'Review', 0)
@@ -0,0 +1,55 @@
+from contextlib import contextmanager
+
+import toml
+
+from test import TEST_START_ARROW
+from test.testutils import default_work, sheet_config, temp_sheet
+from timefred.store import store, Work
+from timefred.store.sidecar import sidecar_path
+from timefred.store.snapshot import load_snapshot
+
+
+@contextmanager
+def toml_parsing_forbidden(monkeypatch):
+    def loads(*args, **kwargs):
+        raise AssertionError('toml.loads was called')
+    with monkeypatch.context() as m:
+        m.setattr(toml, 'loads', loads)
+        yield
+
+
+class TestSnapshot:
+    def test_load_skips_parsing_when_sheet_unchanged(self, monkeypatch):
+        sheet_path = '/tmp/timefred-sheet--test-snapshot--test-load-skips-parsing.toml'
+        with temp_sheet(sheet_path), sheet_config(snapshot=True):
+            store.dump(default_work(TEST_START_ARROW))
+            assert sidecar_path(store.path, '.snapshot').exists()
+            with toml_parsing_forbidden(monkeypatch):
+                work: Work = store.load()
+            entry = work[TEST_START_ARROW.DDMMYY]['Got to office'].safe_last_entry()
+            assert entry.start.HHmmss == '02:20:00'
+            sidecar_path(store.path, '.snapshot').unlink()
+
+    def test_stale_snapshot_is_ignored(self):
+        sheet_path = '/tmp/timefred-sheet--test-snapshot--test-stale-snapshot-is-ignored.toml'
+        with temp_sheet(sheet_path), sheet_config(snapshot=True):
+            store.dump(default_work(TEST_START_ARROW))
+            store.path.write_text(store.path.read_text().replace('02:20:00', '03:30:00'))
+            assert load_snapshot(store.path) is None
+            work: Work = store.load()
+            entry = work[TEST_START_ARROW.DDMMYY]['Got to office'].safe_last_entry()
+            assert entry.start.HHmmss == '03:30:00'
+            # load() refreshed the snapshot
+            assert load_snapshot(store.path) is not None
+            sidecar_path(store.path, '.snapshot').unlink()
+
+    def test_corrupt_snapshot_is_ignored(self):
+        sheet_path = '/tmp/timefred-sheet--test-snapshot--test-corrupt-snapshot-is-ignored.toml'
+        with temp_sheet(sheet_path), sheet_config(snapshot=True):
+            store.dump(default_work(TEST_START_ARROW))
+            snapshot_path = sidecar_path(store.path, '.snapshot')
+            snapshot_path.write_bytes(snapshot_path.read_bytes()[:-10])
+            assert load_snapshot(store.path) is None
+            work: Work = store.load()
+            assert 'Got to office' in work[TEST_START_ARROW.DDMMYY]
+            snapshot_path.unlink()
@@ -0,0 +1,91 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+import toml
+
+from test import TEST_START_ARROW
+from test.testutils import default_work, temp_sheet
+from timefred import action
+from timefred.store import store, Work
+from timefred.store.sqlite import SqliteStore, time_value
+from timefred.store.store import Store
+from timefred.time import XArrow
+from timefred.timefred import parse_args
+
+SHEETS = sorted(Path('test/sheets').glob('*.toml'))
+
+
+def entry_rows(path) -> list[tuple]:
+    with sqlite3.connect(path) as db:
+        return db.execute('SELECT id, start_time, end_time FROM entries ORDER BY id').fetchall()
+
+
+def expanded_shorthands(data: dict) -> dict:
+    """`"Got to office" = "09:40"` is stored as an entry, and `notes = { ... }` as a list of notes"""
+    def expanded(activity):
+        if not isinstance(activity, list):
+            return [{'start': time_value(activity)}]
+        return [{**entry, 'notes': [entry['notes']]} if isinstance(entry.get('notes'), dict) else entry
+                for entry in activity]
+    return {key: {name: expanded(activity) for name, activity in day.items()}
+            for key, day in data.items()}
+
+
+class TestSqliteStore:
+    def test_of(self):
+        assert type(Store.of('/tmp/timefred-sheet.db')) is SqliteStore
+        assert type(Store.of('/tmp/timefred-sheet.sqlite3')) is SqliteStore
+        assert type(Store.of('/tmp/timefred-sheet.toml')) is Store
+
+    @pytest.mark.parametrize('sheet_path', SHEETS, ids=lambda sheet_path: sheet_path.stem)
+    def test_migrate_roundtrip(self, sheet_path):
+        """TOML -> SQLite -> TOML writes the same sheet as the TOML Store does"""
+        toml_path = Path(f'/tmp/timefred-sheet--test-sqlite--{sheet_path.stem}.toml')
+        db_path = toml_path.with_suffix('.db')
+        roundtrip_path = toml_path.with_name(toml_path.stem + '--roundtrip.toml')
+        for path in (db_path, roundtrip_path):
+            path.unlink(True)
+        toml_path.write_text(sheet_path.read_text())
+        toml_store = Store.of(toml_path)
+        toml_store.dump(toml_store.load(lazy=False))
+
+        assert action.migrate(str(toml_path), str(db_path))
+        assert action.migrate(str(db_path), str(roundtrip_path))
+        assert toml.loads(roundtrip_path.read_text()) == expanded_shorthands(toml.loads(toml_path.read_text()))
+        assert Store.of(db_path).load().ongoing_pointer() == toml_store.load(lazy=False)._find_ongoing()
+
+    def test_actions(self):
+        sheet_path = '/tmp/timefred-sheet--test-sqlite--test-actions.db'
+        Path(sheet_path).unlink(True)
+        with temp_sheet(sheet_path):
+            store.dump(default_work(TEST_START_ARROW))
+            assert type(store._store) is SqliteStore
+            [(got_to_office_id, _, got_to_office_end)] = entry_rows(sheet_path)
+            assert got_to_office_end is None
+
+            assert action.on("Something New", XArrow.now(), tag="research")
+            assert action.tag("urgent")
+            action.note("Discuss with the team")
+            stop_time = XArrow.now()
+            assert action.stop(stop_time)
+
+            rows = entry_rows(sheet_path)
+            assert len(rows) == 2
+            # Got to office was updated in place (its end was set), not rewritten
+            assert rows[0][0] == got_to_office_id
+            assert rows[0][2] is not None
+            assert rows[1][2] == stop_time.HHmmss
+
+            work: Work = store.load()
+            assert work.ongoing_pointer() is None
+            something_new = work[XArrow.now().DDMMYY]["Something New"]
+            entry = something_new.safe_last_entry()
+            assert entry.tags == ["research", "urgent"]
+            assert [note.content for note in entry.notes] == ["Discuss with the team"]
+
+
+def test_parse_args():
+    from timefred.config import config
+    assert parse_args(['tf', 'store', 'migrate', '/tmp/a.db']) == (action.migrate, {'source': str(config.sheet.path), 'destination': '/tmp/a.db'})
+    assert parse_args(['tf', 'store', 'migrate', '/tmp/a.toml', '/tmp/a.db']) == (action.migrate, {'source': '/tmp/a.toml', 'destination': '/tmp/a.db'})
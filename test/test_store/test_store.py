@@ -1,3 +1,8 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
 from test.testutils import default_work, temp_sheet
 from timefred.log import log
 from timefred.space.field import UNSET
@@ -67,4 +72,47 @@ class TestStore:
         # store.path = "/tmp/timefred-sheet-test_on_device_validation_08_30.toml"
         with temp_sheet("/tmp/timefred-sheet-test_on_device_validation_08_30.toml"):
             store.dump(work)
-            work = store.load()
\ No newline at end of file
+            work = store.load()
+    
+    def test_dump_is_atomic(self):
+        sheet_path = '/tmp/timefred-sheet--test-store--test-dump-is-atomic.toml'
+        with temp_sheet(sheet_path):
+            store.dump(default_work(XArrow.from_absolute('01/12/21')))
+            previous_sheet = store.path.read_text()
+            previous_inode = store.path.stat().st_ino
+            
+            work = store.load()
+            work.on("Something New", XArrow.now())
+            store.dump(work)
+            # Renamed over, and the backup is a hard link to the previous version
+            assert store.path.stat().st_ino != previous_inode
+            backup_path = store._backup_path()
+            if backup_path.stat().st_dev == store.path.stat().st_dev:
+                assert backup_path.stat().st_ino == previous_inode
+            assert backup_path.read_text() == previous_sheet
+            
+            # A failed write leaves the sheet as it was, and no temporary files behind
+            sheet_before = store.path.read_text()
+            work = store.load()
+            work.stop(XArrow.now())
+            with patch('timefred.store.store.os.fsync', side_effect=OSError('Crashed mid-write')), pytest.raises(OSError):
+                store.dump(work)
+            assert store.path.read_text() == sheet_before
+            assert not list(store.path.parent.glob(f'.{store.path.name}.*.tmp'))
+    
+    def test_dump_keeps_symlinked_sheet(self):
+        target_path = Path('/tmp/timefred-sheet--test-store--test-dump-keeps-symlinked-sheet--target.toml')
+        sheet_path = Path('/tmp/timefred-sheet--test-store--test-dump-keeps-symlinked-sheet.toml')
+        sheet_path.unlink(True)
+        with temp_sheet(str(target_path), rm=False):
+            store.dump(default_work(XArrow.from_absolute('01/12/21')))
+            previous_sheet = target_path.read_text()
+            sheet_path.symlink_to(target_path)
+        with temp_sheet(str(sheet_path)):
+            work = store.load()
+            work.on("Something New", XArrow.now())
+            store.dump(work)
+            assert sheet_path.is_symlink()
+            assert "Something New" in target_path.read_text()
+            assert store._backup_path().read_text() == previous_sheet
+        target_path.unlink()
@@ -14,8 +14,8 @@ from icecream import ic
 from test import TEST_START_ARROW
 from timefred.config import config
 from timefred.log import log
-from timefred.time import XArrow
-from timefred.time.timeutils import secs2human, arrows2rel_time
+from timefred.time import XArrow, Timespan
+from timefred.time.timeutils import secs2human, arrows2rel_time, parse_period
 
 ic.configureOutput(prefix='')
 
@@ -160,6 +160,146 @@ def test_arrows2rel_time():
     assert ret == '2 weeks & 6 days ago'
 
 
+class TestTimespan:
+    def test_total(self):
+        hour = Timespan(start=XArrow.from_absolute('10:00'), end=XArrow.from_absolute('11:00'))
+        ongoing = Timespan(start=XArrow.from_absolute('12:00'))
+        assert Timespan.total([hour, ongoing, 60]) == 3660
+        assert sum([hour, hour]) == Timespan.total([hour, hour]) == 7200
+        hour.end = XArrow.from_absolute('11:30')
+        assert hour.seconds == 5400
+    
+    def test_total_benchmark(self):
+        from functools import reduce
+        from time import perf_counter
+        from multimethod import multimethod
+        from timefred.store import Activity
+        
+        start = XArrow.from_absolute('00:00:00')
+        activity = Activity([{'start': start.shift(seconds=i * 4), 'end': start.shift(seconds=i * 4 + 3)}
+                             for i in range(10_000)],
+                            name='Benchmark')
+        timespans = activity.timespans
+        
+        # How sum(timespans) used to add: dispatching on every step, and deriving a timedelta on every access
+        @multimethod
+        def radd(total: int, timespan: object) -> int:
+            return total + int((timespan.end - timespan.start).total_seconds())
+        
+        baseline_start = perf_counter()
+        baseline_total = reduce(radd, timespans, 0)
+        baseline_seconds = perf_counter() - baseline_start
+        
+        first_start = perf_counter()
+        first_total = Timespan.total(timespans)
+        first_seconds = perf_counter() - first_start
+        
+        cached_start = perf_counter()
+        cached_total = Timespan.total(timespans)
+        cached_seconds = perf_counter() - cached_start
+        
+        assert baseline_total == first_total == cached_total == activity.seconds == 30_000
+        log.info(f'Timespan.total of 10k timespans: {baseline_seconds * 1000:.1f}ms dispatched, '
+                 f'{first_seconds * 1000:.1f}ms first, {cached_seconds * 1000:.1f}ms cached '
+                 f'(x{baseline_seconds / cached_seconds:.0f})')
+        assert cached_seconds * 10 < baseline_seconds
+
+
+class TestParseFormatted:
+    FORMATTED = ['01/12', '01/12/21', '01/12/99', '01/12 10:00', '01/12/21 10:00', '01/12/21 10:00:05', '10:00', '10:00:05']
+    
+    def arrow_parse(self, formatted: str) -> XArrow:
+        from timefred.time.xarrow import xarrow_factory, TZINFO
+        return xarrow_factory.get(formatted, [FORMATS.datetime, FORMATS.shorter_datetime, FORMATS.short_datetime,
+                                              FORMATS.date, FORMATS.short_date, FORMATS.time, FORMATS.short_time],
+                                  tzinfo=TZINFO)
+    
+    def test_same_as_arrow(self):
+        for formatted in self.FORMATTED:
+            fast = XArrow._parse_formatted_fast(formatted)
+            arrow = self.arrow_parse(formatted)
+            assert fast == arrow, formatted
+            assert fast.utcoffset() == arrow.utcoffset(), formatted
+        for not_exactly_formatted in ('1/12/21', '9:05', '01/12/2021', '31/02/21', '01/12/21  10:00', ''):
+            assert XArrow._parse_formatted_fast(not_exactly_formatted) is None
+    
+    def test_benchmark(self):
+        from time import perf_counter
+        formatted = self.FORMATTED * 500
+        
+        arrow_start = perf_counter()
+        for string in formatted:
+            self.arrow_parse(string)
+        arrow_seconds = perf_counter() - arrow_start
+        
+        fast_start = perf_counter()
+        for string in formatted:
+            XArrow._parse_formatted(string)
+        fast_seconds = perf_counter() - fast_start
+        
+        log.info(f'Parsing {len(formatted)} formatted strings: {arrow_seconds * 1000:.1f}ms with Arrow, '
+                 f'{fast_seconds * 1000:.1f}ms fast (x{arrow_seconds / fast_seconds:.1f})')
+        assert fast_seconds * 2 < arrow_seconds
+
+
+class TestFromHuman:
+    CORPUS = ['now', 'today', 'yesterday', '09:45', '9:45', '09:45:30', '3m', '3m ago', 'in 5 minutes', '2h 30m ago',
+              'a day ago', 'thurs', 'mon', 'friday', '01/12', '01/12/21', '01/12/21 09:45', 'wednesday 09:45']
+    """Real `tf on`, `tf stop` and `tf log` time arguments"""
+    
+    def test_classified_like_chained(self):
+        from timefred.time.xarrow import classify_human
+        now = XArrow.now()
+        for human in self.CORPUS:
+            assert classify_human(human) is not None, human
+            # 'now', 'today' etc are XArrow.now() on each call
+            assert abs(now.from_human(human) - now._from_human_chain(human)).total_seconds() < 1, human
+        for unclassified in ('t', 'foo', ''):
+            assert classify_human(unclassified) is None
+    
+    def test_benchmark(self):
+        from time import perf_counter
+        now = XArrow.now()
+        corpus = self.CORPUS * 100
+        
+        def best_of_3(parse) -> float:
+            timings = []
+            for _ in range(3):
+                start = perf_counter()
+                for human in corpus:
+                    parse(human)
+                timings.append(perf_counter() - start)
+            return min(timings)
+        
+        chained_seconds = best_of_3(now._from_human_chain)
+        classified_seconds = best_of_3(now.from_human)
+        log.info(f'from_human of {len(corpus)} CLI inputs: {chained_seconds * 1000:.1f}ms chained, '
+                 f'{classified_seconds * 1000:.1f}ms classified (x{chained_seconds / classified_seconds:.1f})')
+        
+        # Relative times and days are parsed first by both, so only absolute times are expected to be faster
+        corpus = [human for human in self.CORPUS if human[0].isdigit() and ':' in human] * 100
+        chained_seconds = best_of_3(now._from_human_chain)
+        classified_seconds = best_of_3(now.from_human)
+        assert classified_seconds * 1.5 < chained_seconds
+
+
+def test_parse_period():
+    from datetime import date
+    thursday = date(2021, 12, 23)
+    assert parse_period('today', thursday) is None
+    assert parse_period('this month', thursday) == (date(2021, 12, 1), date(2021, 12, 31))
+    assert parse_period('last  month', thursday) == (date(2021, 11, 1), date(2021, 11, 30))
+    this_week = parse_period('this week', thursday)
+    assert this_week[0].isoweekday() == (1 if config.time.first_day_of_week == 'monday' else 7)
+    assert this_week[0] <= thursday <= this_week[1]
+    assert (this_week[1] - this_week[0]).days == 6
+    last_week = parse_period('last week', thursday)
+    assert (this_week[0] - last_week[0]).days == 7
+    assert parse_period('01/12/21 - 31/12/21') == (date(2021, 12, 1), date(2021, 12, 31))
+    with pytest.raises(ValueError):
+        parse_period('31/12/21 - 01/12/21')
+
+
 class Test_secs2human:
     def test_1_unit(self):
         assert secs2human(0) == ''
@@ -646,6 +786,8 @@ class TestXArrow:
             assert from_absolute.day == 13
             assert from_absolute.month == 12
             assert from_absolute.year == 2021
+            # A date alone keeps now's time of day
+            assert from_absolute.hour == XArrow.now().hour or XArrow.now().minute == 0
 
         def test_from_absolute_DDMMYYHHmmss(self):
             datetime = "13/12/21 11:23:45"
@@ -38,6 +38,19 @@ def assert_raises(exc: Type[Exception], match: Union[str, re.Pattern] = None):
         raise AssertionError(f"{exc_name} was not raised")
 
 
+@contextmanager
+def sheet_config(**flags):
+    """Temporarily sets `config.sheet` flags, e.g `with sheet_config(journal=True):`"""
+    old_flags = {name: getattr(config.sheet, name) for name in flags}
+    for name, value in flags.items():
+        setattr(config.sheet, name, value)
+    try:
+        yield
+    finally:
+        for name, value in old_flags.items():
+            setattr(config.sheet, name, value)
+
+
 @contextmanager
 def assert_doesnt_raise(exc: Type[BaseException] = BaseException, match_exc_arg: Union[str, re.Pattern] = None):
     try:
@@ -86,6 +99,7 @@ def temp_sheet(path, *, rm=True, backup=True):
         yield
     except:
         rm = False
+        raise
     finally:
         old_path = Path(old_path)
         os.environ['TIMEFRED_SHEET'] = str(old_path)
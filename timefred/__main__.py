@@ -1,4 +1,4 @@
 if __name__ == '__main__':
-    from timefred.timefred import main
+    from timefred.daemon import main
     import sys
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
@@ -1,7 +1,22 @@
-from timefred.action.log import log
-from timefred.action.note import note
-from timefred.action.stop import stop
-from timefred.action.tag import tag
-from timefred.action.on import on
-from timefred.action.status import status
-from timefred.action.util import ensure_working,is_working
+"""
+Each action is imported on first access (PEP 562), so e.g `tf status` doesn't import what `tf edit` needs.
+Each action function lives in a module of the same name: `action.status` is `timefred.action.status.status`.
+"""
+ACTIONS = ('log', 'note', 'stop', 'tag', 'on', 'status', 'compact', 'migrate', 'edit', 'aggregate')
+UTILS = ('ensure_working', 'is_working')
+
+__all__ = [*ACTIONS, *UTILS]
+
+
+def __getattr__(name: str):
+    # Not importlib.import_module, because -X importtime doesn't report what it imports
+    if name in ACTIONS:
+        module = __import__(f'{__name__}.{name}', fromlist=[name])
+    elif name in UTILS:
+        module = __import__(f'{__name__}.util', fromlist=[name])
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(module, name)
+    # Importing the submodule bound its name to the module, rather than to the function
+    globals()[name] = value
+    return value
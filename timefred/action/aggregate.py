@@ -0,0 +1,66 @@
+import re
+from typing import Union
+
+from timefred import color as c
+from timefred.config import config
+from timefred.error import EmptySheet, NoActivities
+from timefred.store import store
+from timefred.store.models import to_epoch
+from timefred.time.timeutils import secs2human, isoweekday
+from timefred.time.xarrow import XArrow
+
+
+def whole_day(human: str) -> bool:
+    """'01/12/21', 'yesterday', 'thurs' etc, as opposed to '01/12/21 10:00', '09:45', '3d ago'"""
+    if config.time.formats.time_separator in human:
+        return False
+    if config.time.formats.date_separator in human or human.lower() in ('today', 'yesterday', 'tomorrow'):
+        return True
+    try:
+        isoweekday(human)
+        return True
+    except ValueError:
+        return False
+
+
+def aggregate(start: Union[str, XArrow], stop: Union[str, XArrow] = "now") -> bool:
+    """
+    Prints the time spent between `start` and `stop` per activity, tag and Jira ticket, in descending order.
+    A `start` or `stop` without a time covers its whole day.
+    """
+    if isinstance(start, str):
+        start = XArrow.from_human(start).floor('day') if whole_day(start) else XArrow.from_human(start)
+    if isinstance(stop, str):
+        stop = XArrow.from_human(stop).ceil('day') if whole_day(stop) else XArrow.from_human(stop)
+    if start > stop:
+        start, stop = stop, start
+    columns = store.columns()
+    if not len(columns):
+        raise EmptySheet()
+    rows = columns.rows_between(start.date(), stop.date())
+    ongoing_row = columns.ongoing_row()
+    columns = columns.between(start.date(), stop.date())
+    since, until = to_epoch(start), to_epoch(stop)
+    durations = columns.durations(since=since, until=until)
+    if ongoing_row in rows:
+        # Lasts until now. Other entries without an end (e.g "Got to office") count as 0, like their Timespan.seconds.
+        ongoing_row -= rows.start
+        durations[ongoing_row] = max(min(to_epoch(XArrow.now()), until) - max(columns.start[ongoing_row], since), 0)
+    total = sum(durations)
+    if not total:
+        raise NoActivities(f'{start.DDMMYYHHmmss} - {stop.DDMMYYHHmmss}')
+
+    print(c.title(f'{start.DDMMYYHHmmss} - {stop.DDMMYYHHmmss}') + '\n')
+    for title, totals in (('Activities', columns.totals_by_activity(durations)),
+                          ('Tags', columns.totals_by_tag(durations)),
+                          ('Jira', columns.totals_by_jira(durations))):
+        totals = {name: seconds for name, seconds in totals.items() if seconds}
+        if not totals:
+            continue
+        print(c.title(title))
+        name_column_width = max(*map(len, totals), 24) + 8
+        for name, seconds in sorted(totals.items(), key=lambda item: item[1], reverse=True):
+            print(f'  {name:<{name_column_width}}{secs2human(seconds)}')
+        print()
+    print(c.title('Total: ') + re.sub(r'\d', lambda match: f'{c.digit(match.group())}', secs2human(total)))
+    return True
@@ -0,0 +1,12 @@
+from timefred import color as c
+from timefred.store import store
+
+
+def compact() -> bool:
+    """Folds the sheet's journal back into the sheet (`tf store compact`)."""
+    ok = store.compact()
+    if ok:
+        print(f'{c.green("Compacted")} {store.journal.path} into {store.path}')
+    else:
+        print(f'Failed compacting {store.journal.path} into {store.path}')
+    return ok
@@ -2,8 +2,6 @@ import os
 import subprocess
 import tempfile
 
-import yaml
-
 from timefred.error import NoEditor, InvalidYAML
 from timefred.store import store
 
@@ -12,7 +10,8 @@ def edit():
     if "EDITOR" not in os.environ:
         raise NoEditor("Please set the 'EDITOR' environment variable")
     
-    data = store.load()
+    import yaml
+    data = store.load(lazy=False)
     yml = yaml.safe_dump(data, default_flow_style=False, allow_unicode=True)
     
     cmd = os.getenv('EDITOR')
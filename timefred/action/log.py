@@ -1,11 +1,12 @@
 import re
 from collections import defaultdict
-from typing import Literal, Union
+from datetime import date as dt_date
+from typing import Literal, Union, Optional
 
 from timefred import color as c
 from timefred.error import EmptySheet, NoActivities
-from timefred.store import store, Entry, Activity
-from timefred.time.timeutils import arrows2rel_time
+from timefred.store import store, Activity, Day, Work
+from timefred.time.timeutils import arrows2rel_time, parse_period, secs2human
 from timefred.time.xarrow import XArrow
 
 
@@ -19,12 +20,39 @@ def log(time: Union[str, XArrow] = "today",
     work = store.load()
     if not work:
         raise EmptySheet()
-    current = None
+    period = parse_period(time) if isinstance(time, str) else None
+    if period is not None:
+        return log_period(work, *period, time, detailed=detailed, groupby=groupby)
     arrow = XArrow.from_human(time)
-    # now = arrow.now() # TODO: should support a range of times, spanning several days etc
     day = work[arrow.DDMMYY]
     if not day:
         raise NoActivities(arrow.DDMMYY)
+    return print_day(day, arrow, detailed=detailed, groupby=groupby)
+
+
+def log_period(work: Work, first: dt_date, last: dt_date, period: str, *, detailed=True, groupby=None) -> bool:
+    """Prints each day from `first` to `last` as soon as it's read, followed by the running total."""
+    now = XArrow.now()
+    running_seconds = 0
+    printed_days = 0
+    for date, day in work.days_between(first, last):
+        if not day:
+            continue
+        # Everything in the day is printed, so construct it in one pass
+        day.hydrate()
+        if printed_days:
+            print()
+        printed_days += 1
+        running_seconds += day.seconds
+        arrow = now.replace(year=date.year, month=date.month, day=date.day)
+        print_day(day, arrow, detailed=detailed, groupby=groupby, running_seconds=running_seconds)
+    if not printed_days:
+        raise NoActivities(period)
+    return True
+
+
+def print_day(day: Day, arrow: XArrow, *, detailed=True, groupby=None, running_seconds: Optional[int] = None) -> bool:
+    current = None
     # _log = Log()
     activities: list[Activity] = day.values()
     # activity: Activity = activities[0]
@@ -88,4 +116,8 @@ def log(time: Union[str, XArrow] = "today",
     for activity in activities:
         print(activity.pretty(detailed, name_column_width))
     
-    print(c.title('Total: ') + re.sub(r'\d', lambda match: f'{c.digit(match.group())}', day.human_duration))
\ No newline at end of file
+    total = c.title('Total: ') + re.sub(r'\d', lambda match: f'{c.digit(match.group())}', day.human_duration)
+    if running_seconds is not None:
+        total += c.dim(f' | {secs2human(running_seconds)} so far')
+    print(total)
+    return True
\ No newline at end of file
@@ -0,0 +1,26 @@
+from pathlib import Path
+
+from timefred import color as c
+from timefred.error import TIError
+
+
+def migrate(source: str, destination: str) -> bool:
+    """Copies the sheet at `source` to `destination`, converting between TOML, SQLite and partitioned sheets
+    according to their paths (see Store.of) (`tf store migrate`)."""
+    from timefred.store.partitioned import is_partitioned_path
+    from timefred.store.store import Store
+    source, destination = Path(source).expanduser(), Path(destination).expanduser()
+    if not source.exists():
+        raise TIError(f'{source} does not exist')
+    if source.resolve() == destination.resolve():
+        raise TIError(f'Source and destination are both {source}')
+    if destination.is_dir() and not is_partitioned_path(destination):
+        raise TIError(f'{destination} is a directory with files other than a partitioned sheet')
+    # Days that are never accessed are copied verbatim between TOML sheets
+    work = Store.of(source).load(lazy=True)
+    ok = Store.of(destination).dump(work)
+    if ok:
+        print(f'{c.green("Migrated")} {source} to {destination}')
+    else:
+        print(f'Failed migrating {source} to {destination}')
+    return ok
@@ -1,7 +1,9 @@
 from timefred import color as c
 from timefred.error import BadTime
-from timefred.store import store, Entry
+from timefred.store import store, Work
+from timefred.store.journal import Mutation
 from timefred.time import XArrow
+from timefred.action.util import activity_at
 from timefred.util import confirm
 
 
@@ -10,31 +12,22 @@ def note(content, time="now"):
     # time = human2arrow(time)
     if time > XArrow.now():
         raise BadTime(f"in the future: {time}")
-    content_and_time = content.strip() + f' ({time.HHmmss})'
-    work = store.load()
-    idx = -1
-    item = Entry(**work[idx])
-    if time < item.start:
+    content = content.strip()
+    work: Work = store.load()
+    activity, entry_index = activity_at(work, time)
+    entry = activity[entry_index]
+    if not activity.ongoing() or entry is not activity.safe_last_entry():
         # Note for something in the past
-        idx, item_in_range = next((i, item) for i, item in enumerate(map(lambda w: Entry(**w), reversed(work)), 1) if item.start.full == time.full)
-        idx *= -1
-        
-        if item_in_range.name == item.name:
-            item = item_in_range
-        else:
-            if not confirm(f'{item.name_colored} started only at {c.time(item.start.strftime("%X"))},\n'
-                           f'note to {item_in_range.name_colored} (started at {c.time(item_in_range.start.strftime("%X"))})?'):
-                return
-            item = item_in_range
+        if not confirm(f'Note to {activity.name.colored} (started at {c.time(entry.start.strftime("%X"))})?'):
+            return
     
-    for n in item.notes:
+    for n in filter(bool, entry.notes):
         if n.is_similar(content):
-            if not confirm(f'{item.name_colored} already has this note: {c.b(c.note(n))}.\n'
+            if not confirm(f'{activity.name.colored} already has this note: {c.b(c.note(n.content))}.\n'
                            'Add anyway?'):
                 return
     
-    item.notes.append(content_and_time)
-    work[idx]['notes'] = item.notes
-    store.dump(work)
+    entry.add_note(content, time)
+    store.commit(work, Mutation(op='note', day=time.DDMMYY, activity=activity.name, entry=entry_index, note=content, time=time))
     
-    print(f'Noted {c.b(c.note(content_and_time))} to {item.name_colored}')
+    print(f'Noted {c.b(c.note(content))} ({time.HHmmss}) to {activity.name.colored}')
@@ -1,6 +1,8 @@
-from timefred import util, color as c
+from timefred import color as c
+from timefred.action.util import confirmed_stop_time
 from timefred.note import Note
 from timefred.store import store, Work, Activity, Entry
+from timefred.store.journal import Mutation
 from timefred.tag import Tag
 from timefred.time import XArrow
 
@@ -10,13 +12,11 @@ def stop(end: XArrow, tag: Tag = None, note: Note = None) -> bool:
     
     work: Work = store.load()
     ongoing_activity: Activity = work.ongoing_activity()
+    end = confirmed_stop_time(ongoing_activity, end)
+    if end is None:
+        return False
     entry: Entry = ongoing_activity.stop(end, tag, note)
     
-    if entry.start.day < end.day:
-        if not util.confirm(f'{ongoing_activity.name} started on {c.time(entry.start.DDMMYYHHmmss)}, continue?'):
-            # TODO: activity is wrongly stopped now, should revert or prevent
-            return False
-    
-    ok = store.dump(work)
+    ok = store.commit(work, Mutation(op='stop', time=end, tag=tag, note=note))
     print(f'{c.yellow("Stopped")} working on {ongoing_activity.name.colored} at {c.time(entry.end.DDMMYYHHmmss)}. ok: {ok}')
     return ok
@@ -1,7 +1,9 @@
 from timefred import color as c, util
 from timefred.error import BadTime
-from timefred.store import store, Entry
+from timefred.store import store, Work
+from timefred.store.journal import Mutation
 from timefred.time import XArrow
+from timefred.action.util import activity_at
 from timefred.util import confirm
 
 
@@ -10,27 +12,22 @@ def tag(_tag, time="now") -> bool:
     # time = human2arrow(time)
     if time > time.now():
         raise BadTime(f"in the future: {time}")
-    work = store.load()
-    idx = -1
-    item = Entry(**work[idx])
-    if time < item.start:
+    work: Work = store.load()
+    activity, entry_index = activity_at(work, time)
+    entry = activity[entry_index]
+    if not activity.ongoing() or entry is not activity.safe_last_entry():
         # Tag something in the past
-        idx = -1 * next(i for i, work in enumerate(reversed(work), 1) if Entry(**work).start <= time)
-        item_in_range = Entry(**work[idx])
-        if not confirm(f'{item.name_colored} started only at {c.time(item.start.strftime("%X"))}, '
-                       f'Tag {item_in_range.name_colored} (started at {c.time(item_in_range.start.strftime("%X"))})?'):
+        if not confirm(f'Tag {activity.name.colored} (started at {c.time(entry.start.strftime("%X"))})?'):
             return False
-        item = item_in_range
     tag_colored = c.tag(_tag)
-    if any(util.normalize_str(_tag) == t for t in map(util.normalize_str, item.tags)):
-        print(f'{item.name_colored} already has tag {tag_colored}.')
+    if any(util.normalize_str(_tag) == t for t in map(util.normalize_str, filter(bool, entry.tags))):
+        print(f'{activity.name.colored} already has tag {tag_colored}.')
         return False
-    item.tags.add(_tag)
-    work[idx]['tags'] = item.tags
+    entry.add_tag(_tag)
     
-    ok = store.dump(work)
+    ok = store.commit(work, Mutation(op='tag', day=time.DDMMYY, activity=activity.name, entry=entry_index, tag=_tag))
     if ok:
-        print(f"Okay, tagged {item.name_colored} with {tag_colored}.")
+        print(f"Okay, tagged {activity.name.colored} with {tag_colored}.")
     else:
         print(f"Failed writing to sheet")
     return ok
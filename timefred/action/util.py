@@ -1,14 +1,53 @@
-from timefred.error import NoTask
-from timefred.store import store
+from typing import Optional
 
+from timefred import util, color as c
+from timefred.error import NoTask, NoActivities
+from timefred.store import store, Work, Activity
+from timefred.time import XArrow
 
-def is_working() -> bool:
-    data = store.load()
-    return data and 'end' not in data[-1]
 
+def is_working(work: Work = None) -> bool:
+    if work is None:
+        work = store.load()
+    return work.ongoing_pointer() is not None
 
-def ensure_working():
-    if is_working():
+
+def ensure_working(work: Work = None):
+    if is_working(work):
         return
     
     raise NoTask("For all I know, you aren't working on anything.")
+
+
+def activity_at(work: Work, time: XArrow) -> tuple[Activity, int]:
+    """
+    Returns:
+        The activity that was ongoing at `time`, and the index of the relevant entry.
+    Raises:
+        NoActivities: if nothing was ongoing at `time`
+    """
+    if time.DDMMYY not in work:
+        raise NoActivities(time.DDMMYY)
+    day = work[time.DDMMYY]
+    for name in reversed(day.keys()):
+        activity: Activity = day[name]
+        for index in reversed(range(len(activity))):
+            entry = activity[index]
+            if entry.start <= time and (not entry.end or time <= entry.end):
+                return activity, index
+    raise NoActivities(time.DDMMYYHHmmss)
+
+
+def confirmed_stop_time(activity: Activity, time: XArrow) -> Optional[XArrow]:
+    """
+    The sheet stores only the time of day, so an entry that started on a day before `time`'s can't end at `time`.
+    If the user confirms, it ends at the end of its own day instead.
+    Returns:
+        When to stop the ongoing `activity`, or None if the user declined.
+    """
+    start = activity.safe_last_entry().start
+    if start.date() >= time.date():
+        return time
+    if not util.confirm(f'{activity.name} started on {c.time(start.DDMMYYHHmmss)}. Stop it at the end of that day?'):
+        return None
+    return start.replace(hour=23, minute=59, second=59)
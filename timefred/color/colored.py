@@ -15,4 +15,4 @@ class Colored(StringSpace):
         return self.brush(self)
 
 class ActivityString(Colored):
-    brush = c.activity
+    brush = staticmethod(c.activity)
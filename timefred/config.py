@@ -13,6 +13,9 @@ from timefred.space import AttrDictSpace, Field
 class Config(AttrDictSpace):
     class TimeCfg(AttrDictSpace):
         class TimeFormats(AttrDictSpace):
+            # Derived in __init__. Not keys, otherwise casting a TimeFormats would pass them back to __init__
+            DONT_SET_KEYS = AttrDictSpace.DONT_SET_KEYS | {
+                'date_separator', 'time_separator', 'time_format_re', 'date_format_re', 'datetime_format_re'}
             date: str = 'DD/MM/YY'
             short_date: str = 'DD/MM'
             time: str = 'HH:mm:ss'
@@ -69,6 +72,20 @@ class Config(AttrDictSpace):
     
     class Sheet(AttrDictSpace):
         path: Path = Path(os.path.expanduser(os.environ.get('TIMEFRED_SHEET', "~/timefred-sheet.toml")))
+        lazy: bool = os.environ.get('TIMEFRED_LAZY', 'true').lower() in ('1', 'true', 'yes')
+        """Only parse the days that are accessed (see timefred.store.lazy)"""
+        snapshot: bool = os.environ.get('TIMEFRED_SNAPSHOT', '').lower() in ('1', 'true', 'yes')
+        """Unpickle the parsed sheet from ~/.cache/timefred when the sheet hasn't changed (see timefred.store.snapshot)"""
+        compact_entries: bool = os.environ.get('TIMEFRED_COMPACT_ENTRIES', '').lower() in ('1', 'true', 'yes')
+        """Load entries as CompactEntry (__slots__, epoch seconds) instead of Entry (see timefred.store.models)"""
+        codec: str = os.environ.get('TIMEFRED_CODEC', 'auto')
+        """'toml', 'tomllib', 'rtoml' or 'auto' (see timefred.store.codec)"""
+        backup_interval: int = 60 * 60
+        """Seconds. How often the sheet is copied to ~/.cache/timefred, if it can't be hard linked there (see Store.dump)"""
+        journal: bool = os.environ.get('TIMEFRED_JOURNAL', '').lower() in ('1', 'true', 'yes')
+        """Append mutations to ~/timefred-sheet.journal instead of rewriting the sheet"""
+        journal_max_size: int = 64 * 1024
+        """Bytes. Beyond this, the journal is compacted into the sheet in the background"""
 
     class Cache(AttrDictSpace):
         path: Path
@@ -0,0 +1,204 @@
+"""
+`tf daemon` keeps the loaded Work in memory, and serves `on`, `stop`, `status`, `log`, `tag` and `note`
+over a Unix domain socket, so they don't pay for interpreter startup, imports, config parsing and loading the sheet.
+
+`main()`, the `tf` entry point, forwards its argv to the daemon if it's running, and falls back to running in-process
+otherwise, or when the daemon replies that it can't serve the request (e.g. a different TIMEFRED_* environment).
+
+Protocol: the client sends a single JSON request and shuts down its writing end:
+    {"argv": [...], "env": {"TIMEFRED_...": ...}}
+The daemon replies with a single JSON response and closes the connection:
+    {"stdout": str, "stderr": str, "exit": int}  or  {"fallback": true}
+
+The client imports only os, sys, socket and json, and nothing of timefred unless it falls back.
+Through a running daemon, `tf status` takes about 40ms, of which the round trip is under 1ms:
+the interpreter alone starts in about 16ms, and importing socket and json takes most of the rest.
+So a CPython client can't get `tf status` under 10ms. A forwarding client in a compiled language could.
+"""
+import json
+import os
+import socket
+import sys
+
+FORWARD_TIMEOUT = 30
+"""Seconds to wait for the daemon's response once the request was sent"""
+
+SERVED_ACTIONS = ('on', 'stop', 'status', 'log', 'tag', 'note')
+
+
+def socket_path() -> str:
+    """TIMEFRED_DAEMON_SOCKET, or $XDG_RUNTIME_DIR/timefred.sock, or /tmp/timefred-<uid>.sock"""
+    if path := os.environ.get('TIMEFRED_DAEMON_SOCKET'):
+        return path
+    if runtime_dir := os.environ.get('XDG_RUNTIME_DIR'):
+        return os.path.join(runtime_dir, 'timefred.sock')
+    return f'/tmp/timefred-{os.getuid()}.sock'
+
+
+CLIENT_ENV = ('TIMEFRED_DAEMON', 'TIMEFRED_DAEMON_SOCKET')
+"""Only decide whether and where to forward, so they don't have to match the daemon's"""
+
+
+def timefred_env() -> dict[str, str]:
+    return {name: value for name, value in os.environ.items() if name.startswith('TIMEFRED_') and name not in CLIENT_ENV}
+
+
+def _receive(sock: socket.socket) -> bytes:
+    chunks = []
+    while chunk := sock.recv(65536):
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+
+# *** Client
+
+def main() -> int:
+    """The `tf` entry point. Imports timefred.timefred only to run in-process."""
+    argv = sys.argv[1:]
+    if argv[:1] != ['daemon']:
+        exit_code = forward(argv)
+        if exit_code is not None:
+            return exit_code
+    from timefred.timefred import main as run_in_process
+    return run_in_process(forward=False)
+
+
+def forward(argv: list[str]) -> "int | None":
+    """
+    Returns:
+        The exit code of the action the daemon ran, or None if it should run in-process instead.
+    """
+    if os.environ.get('TIMEFRED_DAEMON', '').lower() in ('0', 'false', 'no'):
+        return None
+    path = socket_path()
+    try:
+        owner = os.stat(path).st_uid
+    except OSError:
+        return None
+    if owner != os.getuid():
+        # Anyone can create /tmp/timefred-<uid>.sock, so only talk to our own daemon
+        print(f'Not forwarding to {path}, which belongs to another user', file=sys.stderr)
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            sock.connect(path)
+        except OSError:
+            # Not running, or a stale socket file
+            return None
+        # From here on, the daemon may have run the action, so never fall back on errors
+        sock.settimeout(FORWARD_TIMEOUT)
+        try:
+            sock.sendall(json.dumps({'argv': argv, 'env': timefred_env()}).encode())
+            sock.shutdown(socket.SHUT_WR)
+            response = json.loads(_receive(sock))
+        except (OSError, ValueError) as e:
+            print(f'timefred daemon at {path} failed to respond: {e.__class__.__qualname__}: {e}', file=sys.stderr)
+            return 1
+    finally:
+        sock.close()
+    if response.get('fallback'):
+        return None
+    sys.stdout.write(response['stdout'])
+    sys.stderr.write(response['stderr'])
+    return response['exit']
+
+
+# *** Server
+
+def handle(request: dict) -> dict:
+    """Runs the requested action against the resident Work, capturing its output."""
+    import io
+    import traceback
+    from contextlib import redirect_stdout, redirect_stderr
+    from timefred import action
+    from timefred.error import TIError
+    from timefred.store import store
+    from timefred.timefred import parse_args, __doc__ as usage
+
+    if request.get('env') != timefred_env():
+        return {'fallback': True}
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    stdin = sys.stdin
+    # So prompts raise EOFError instead of reading the daemon's own stdin
+    sys.stdin = io.StringIO()
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        try:
+            fn, args = parse_args(['tf', *request['argv']])
+            if fn not in [getattr(action, name) for name in SERVED_ACTIONS]:
+                return {'fallback': True}
+            ok = fn(**args)
+            exit_code = 0
+        except TIError as e:
+            print(str(e) or usage, file=sys.stderr)
+            ok = False
+            exit_code = 1
+        except EOFError:
+            # The action prompted the user (e.g. util.confirm), which only works in-process.
+            # Actions don't persist anything before confirming, so it's safe to rerun.
+            store.forget_resident()
+            return {'fallback': True}
+        except SystemExit as e:
+            ok = True
+            exit_code = e.code if isinstance(e.code, int) else int(e.code is not None)
+        except Exception:
+            traceback.print_exc()
+            ok = False
+            exit_code = 1
+        finally:
+            sys.stdin = stdin
+    if ok is False:
+        # The resident Work may have been changed without being persisted
+        store.forget_resident()
+    return {'stdout': stdout.getvalue(), 'stderr': stderr.getvalue(), 'exit': exit_code}
+
+
+def serve(path: str = None) -> None:
+    """Serves requests one at a time, until interrupted."""
+    from timefred.store import store
+
+    if path is None:
+        path = socket_path()
+    store.keep_resident()
+    store.load()
+
+    # Don't hijack the socket of a running daemon
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        pass
+    else:
+        probe.close()
+        print(f'timefred daemon is already running at {path}', file=sys.stderr)
+        return
+
+    if os.path.exists(path):
+        os.unlink(path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o077)
+    try:
+        server.bind(path)
+    finally:
+        os.umask(old_umask)
+    server.listen()
+    print(f'timefred daemon listening at {path}', file=sys.stderr)
+    try:
+        while True:
+            connection, _ = server.accept()
+            with connection:
+                try:
+                    request = json.loads(_receive(connection))
+                    response = handle(request)
+                except ValueError as e:
+                    response = {'stdout': '', 'stderr': f'Invalid request: {e}\n', 'exit': 1}
+                try:
+                    connection.sendall(json.dumps(response).encode())
+                except OSError:
+                    pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        os.unlink(path)
@@ -12,7 +12,7 @@ DefaultDictSpace (KeyError __default_factory__)           /
                         DefaultAttrDictSpace
         
 """
-from typing import TypeVar, Type
+from typing import TypeVar, Type, Iterator
 
 from timefred.space import Space, TypedSpace
 from .space import IGNORED_ATTRS
@@ -73,12 +73,27 @@ class TypedDictSpace(TypedSpace[TYPED_DICT_SPACE_K, TYPED_DICT_SPACE_V],
             return value
 
 
-    def values(self) -> list[TYPED_DICT_SPACE_V]:
-        values: list[TYPED_DICT_SPACE_V] = []
+    def itervalues(self) -> Iterator[TYPED_DICT_SPACE_V]:
+        """Like values(), but constructs each value only when it's reached"""
+        for key in self.keys():
+            yield self[key]
+    
+    def iteritems(self) -> Iterator[tuple[TYPED_DICT_SPACE_K, TYPED_DICT_SPACE_V]]:
+        """Like items(), but constructs each value only when it's reached"""
         for key in self.keys():
-            value = self[key]
-            values.append(value)
-        return values
+            yield key, self[key]
+    
+    def values(self) -> list[TYPED_DICT_SPACE_V]:
+        return list(self.itervalues())
+    
+    def hydrate(self):
+        """Constructs and hydrates every value in a single pass, for when all of them are needed anyway."""
+        super().hydrate()
+        for value in self.itervalues():
+            hydrate = getattr(value, 'hydrate', None)
+            if hydrate is not None:
+                hydrate()
+        return self
     
 
 DEFAULT_DICT_SPACE_K = TypeVar('DEFAULT_DICT_SPACE_K')
@@ -1,7 +1,7 @@
 from collections.abc import Mapping
 import os
 import typing as t
-from typing import Any, Callable, Type, TypeVar, Protocol, TypedDict, NoReturn, Generic
+from typing import Any, Callable, Type, TypeVar, Protocol, Generic
 
 from timefred.singleton import Singleton
 # from timefred.log import log
@@ -37,13 +37,9 @@ def updatedefault(obj: Any, name: str, mapping: Mapping):
 TFieldValue = TypeVar('TFieldValue')
 
 
-class FieldData(TypedDict):
-    value: TFieldValue
-    cached: TFieldValue
-
-
 class HasFields(Protocol[TFieldValue]):
-    __fields__: dict[str, FieldData]
+    __fields__: dict[str, "Field"]
+    __field_values__: list[TFieldValue]
 
 class DefaultFactory(Protocol[TFieldValue]):
     def __call__(self) -> TFieldValue:
@@ -55,7 +51,16 @@ class Cast(Protocol[TFieldValue]):
 
 
 class Field(Generic[TFieldValue]):
-    """field_data['cached'] > field_data['value'] > default > default_factory"""
+    """
+    cached > value > default > default_factory
+
+    Each class numbers its Fields in `__set_name__`, continuing its bases' numbering,
+    and each instance keeps their raw values in a flat `__field_values__` list.
+    A cached value is stored in the instance's `__dict__` under the field's name, which shadows the Field
+    (a non-data descriptor), so reading a cached field is a plain attribute lookup.
+    Setting and deleting go through `Space.__setattr__` / `Space.__delattr__`, so Fields only work on Spaces.
+    Doesn't support Fields coming from more than one base class.
+    """
     def __init__(self,
                  default_factory: DefaultFactory[TFieldValue] = UNSET,
                  *,
@@ -74,6 +79,27 @@ class Field(Generic[TFieldValue]):
     
     def __set_name__(self, instance_cls: Type[HasFields], name: str):
         self.name = name
+        fields = instance_cls.__dict__.get('__fields__')
+        if fields is None:
+            fields = instance_cls.__fields__ = dict(getattr(instance_cls, '__fields__', {}))
+        self.index = getattr(instance_cls, '__field_count__', 0)
+        instance_cls.__field_count__ = self.index + 1
+        fields[name] = self
+        
+        # Resolve the cast strategy once, instead of on every __get__
+        if not self.cast:
+            self.cast_value = None
+        # self.cast = list[Note]
+        # t.get_origin(self.cast) = list
+        elif t.get_origin(self.cast) in (list, tuple, set, dict):
+            # scalar_type = Note
+            scalar_type, *scalar_types = t.get_args(self.cast)
+            if scalar_types:
+                raise NotImplementedError(f'{self.cast = !r} has multiple args; {t.get_args(self.cast) = }')
+            self.scalar_type = scalar_type
+            self.cast_value = self._cast_collection
+        else:
+            self.cast_value = self._cast_scalar
     
     def __call__(self, method: Callable) -> "Field":
         """Allows for using Field as a decorator with args, e.g `Field(optional=True)`"""
@@ -83,26 +109,33 @@ class Field(Generic[TFieldValue]):
         self.default_factory = method
         return self
     
-    def setdefault_instance_field_data(self, instance: HasFields, default_field_data: FieldData) -> FieldData:
-        """Insert default_field_data if self.name is not in instance.__fields__.
-        Return instance.__fields__[self.name].
-        Initialize instance.__fields__[self.name] if needed."""
-        if not hasattr(instance, '__fields__'):
-            # log.debug(f"[b][i]{instance.__class__.__qualname__}[/i].{self.name}[/b] | · Setting {default_field_data = !r} (initialized __fields__)")
-            setattr(instance, '__fields__', {self.name: default_field_data})
-        elif self.name not in instance.__fields__:
-            # log.debug(f"[b][i]{instance.__class__.__qualname__}[/i].{self.name}[/b] | · Setting {default_field_data = !r} (initialized __fields__[self.name]")
-            instance.__fields__[self.name] = default_field_data
-        # log.debug(f"[b][i]{instance.__class__.__qualname__}[/i].{self.name}[/b] | · returning {instance.__fields__[self.name]!r}")
-        return instance.__fields__[self.name]
+    @staticmethod
+    def instance_field_values(instance: HasFields) -> list:
+        """Returns instance.__field_values__, initializing it if needed."""
+        instance_dict = instance.__dict__
+        try:
+            return instance_dict['__field_values__']
+        except KeyError:
+            field_values = instance_dict['__field_values__'] = [UNSET] * type(instance).__field_count__
+            return field_values
+    
+    def _cast_scalar(self, value):
+        if value is UNSET:
+            return value
+        return self.cast(value)
+    
+    def _cast_collection(self, value):
+        if isinstance(value, (list, tuple, set)):
+            mapped_scalars = map(self.scalar_type, value)
+            return self.cast(mapped_scalars)
+        if isinstance(value, dict):
+            constructed_scalar = self.scalar_type(value)
+            return self.cast((constructed_scalar,))
+        if value is UNSET:
+            return self.cast(())
+        constructed_scalar = self.scalar_type(value)
+        return self.cast((constructed_scalar,))
     
-    def set_instance_field_data(self, instance: HasFields, field_data: FieldData) -> NoReturn:
-        """Unconditionally sets instance.__fields__[self.name] = field_data"""
-        if not hasattr(instance, '__fields__'):
-            setattr(instance, '__fields__', {self.name: field_data})
-        else:
-            instance.__fields__[self.name] = field_data
-            
     def _repred_attrs(self) -> dict:
         default_factory_repr = getattr(self.default_factory, '__qualname__', self.default_factory)
         cast_repr = getattr(self.cast, '__qualname__', self.cast)
@@ -118,86 +151,39 @@ class Field(Generic[TFieldValue]):
     if not os.getenv('TIMEFRED_REPR', '').lower() in ('no', 'disable'):
         def __repr__(self):
             return f"{self.__class__.__qualname__}⟨{self.name!r}⟩({', '.join([f'{k}={v}' for k, v in self._repred_attrs().items()])})"
-    # @break_on_exc
-    def __get__(self, instance: HasFields, instance_cls: Type[HasFields]) -> TFieldValue:
-        # log.debug(f"[b][i]{instance.__class__.__qualname__}[/i].{self.name}[/b] | Getting {instance}.__fields__[ {self.name!r} ]")
-        field_data = self.setdefault_instance_field_data(instance, {'value': UNSET, 'cached': UNSET})
-        if self.should_cache and field_data['cached'] is not UNSET:
-            return field_data['cached']
-        
-        value = field_data['value']
+    def __get__(self, instance: HasFields, instance_cls: Type[HasFields] = None) -> TFieldValue:
+        """Only called when the value isn't cached in instance.__dict__"""
+        if instance is None:
+            return self
+        value = self.instance_field_values(instance)[self.index]
         if value is UNSET:
             if self.default is UNSET:
                 if self.default_factory is UNSET:
                     if not self.optional:
-                        raise AttributeError(f"{instance_cls.__qualname__}.{self.name} is unset, has no default value nor default_factory, and is not optional")
+                        raise AttributeError(f"{type(instance).__qualname__}.{self.name} is unset, has no default value nor default_factory, and is not optional")
                 else:
                     value = self.default_factory()
             else:
                 value = self.default
-
-        if self.cast:
-            
-            # self.cast = list[Note]
-            # t.get_origin(self.cast) = list
-            if t.get_origin(self.cast) in (list, tuple, set, dict):
-                # scalar_type = Note
-                scalar_type, *scalar_types = t.get_args(self.cast)
-                if scalar_types:
-                    raise NotImplementedError(f'{self.cast = !r} has multiple args; {t.get_args(self.cast) = }')
-                
-                if isinstance(value, (list, tuple, set)):
-                    mapped_scalars = map(scalar_type, value)
-                    value = self.cast(mapped_scalars)
-                elif isinstance(value, dict):
-                    constructed_scalar = scalar_type(value)
-                    value = self.cast((constructed_scalar,))
-                else:
-                    # TODO: probable bug, needs same isinstance checks as clause above
-                    if value is UNSET:
-                        value = self.cast((value,))
-                    else:
-                        constructed_scalar = scalar_type(value)
-                        value = self.cast((constructed_scalar,))
-            else:
-                if value is not UNSET:
-                    value = self.cast(value)
-                
-
+        
+        if self.cast_value is not None:
+            value = self.cast_value(value)
+        
         if self.should_cache:
-            instance.__fields__[self.name]['cached'] = value
+            instance.__dict__[self.name] = value
         return value
     
-    def __set__(self, instance: HasFields, value):
-        # log.debug(f"[b][i]{instance.__class__.__qualname__}[/i].{self.name}[/b] | Setting {instance}.__fields__[ {self.name!r} ] = {{ value: {value!r}, cached: UNSET }}")
+    def set(self, instance: HasFields, value) -> None:
+        """Called by Space.__setattr__"""
         if self.validate is not UNSET and not self.validate(value):
             raise ValueError(f"{self.name} is not valid: {value!r}")
-        self.set_instance_field_data(instance, {'value': value, 'cached': UNSET})
-        # if not hasattr(instance, '__fields__'):
-        #     setattr(instance, '__fields__', {self.name: {'value': value, 'cached': UNSET}})
-        # elif self.name not in instance.__fields__:
-        #     instance.__fields__[self.name] = {'value': value, 'cached': UNSET}
-        # else:
-        #     instance.__fields__[self.name]['cached'] = UNSET
-        #     # assert instance.__fields__[self.name]['cached'] is UNSET, f"{instance.__fields__[self.name]['cached']!r} is not UNSET"
-        #     instance.__fields__[self.name]['value'] = value
+        self.instance_field_values(instance)[self.index] = value
+        instance.__dict__.pop(self.name, None)
     
-    def __delete__(self, instance: HasFields):
-        # log.debug(f"[b][i]{instance.__class__.__qualname__}[/i].{self.name}[/b] | Deleting {instance}.__fields__[ {self.name!r} ]")
-        self.set_instance_field_data(instance, {'value': UNSET, 'cached': UNSET})
-        # if not hasattr(instance, '__fields__'):
-        #     setattr(instance, '__fields__', {self.name: {'value': UNSET, 'cached': UNSET}})
-        # elif self.name not in instance.__fields__:
-        #     instance.__fields__[self.name] = {'value': UNSET, 'cached': UNSET}
-        # else:
-        #     instance.__fields__[self.name]['cached'] = UNSET
-        #     instance.__fields__[self.name]['value'] = UNSET
+    def delete(self, instance: HasFields) -> None:
+        """Called by Space.__delattr__"""
+        self.instance_field_values(instance)[self.index] = UNSET
+        instance.__dict__.pop(self.name, None)
     
     def _unset_cache(self, instance: HasFields):
-        if self.should_cache:
-            field_data = instance.__fields__[self.name]
-            field_data['cached'] = UNSET
-            # assert field_data['cached'] is UNSET
-            # assert instance.__fields__[self.name]['cached'] is UNSET
-            # if instance.__fields__[self.name]['cached'] is not UNSET:
-            #     breakpoint()
\ No newline at end of file
+        instance.__dict__.pop(self.name, None)
@@ -21,10 +21,34 @@ class TypedListSpace(ListSpace[TYPED_LIST_SPACE_V],
                      ):
     
     def __iter__(self) -> Iterator[TYPED_LIST_SPACE_V]:
-        for i in range(len(self)):
-            item = self[i]
-            yield item
-        # return super().__iter__()
+        """Constructs only the items that aren't already constructed"""
+        constructed_types = self._constructed_types()
+        for i, item in enumerate(list.__iter__(self)):
+            if isinstance(item, constructed_types):
+                yield item
+            else:
+                yield self[i]
+    
+    def hydrate(self):
+        """Constructs the unconstructed items at once (see _construct_many), then hydrates every item."""
+        super().hydrate()
+        constructed_types = self._constructed_types()
+        raw_indices = [i for i, item in enumerate(list.__iter__(self)) if not isinstance(item, constructed_types)]
+        if raw_indices:
+            constructed = self._construct_many([list.__getitem__(self, i) for i in raw_indices])
+            for i, item in zip(raw_indices, constructed):
+                list.__setitem__(self, i, item)
+        for item in list.__iter__(self):
+            hydrate = getattr(item, 'hydrate', None)
+            if hydrate is not None:
+                hydrate()
+        return self
+    
+    def _constructed_types(self) -> Union[type, tuple[type, ...]]:
+        return self.__default_factory__
+    
+    def _construct_many(self, raw_items: list) -> list[TYPED_LIST_SPACE_V]:
+        return self.__default_factory__.from_many(raw_items)
 
     # def __getitem__(self, name: Union[int, slice]) -> LIST_SPACE_V:
     def __getitem__(self, name):
@@ -1,9 +1,9 @@
 from typing import TypeVar, Type, Generic
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Mapping
 from timefred.log import log
 import os
 
-from timefred.space.field import UNSET
+from timefred.space.field import Field, UNSET
 
 OBJECT_DICT_KEYS = set(object.__dict__)
 IGNORED_ATTRS = OBJECT_DICT_KEYS | {
@@ -11,6 +11,8 @@ IGNORED_ATTRS = OBJECT_DICT_KEYS | {
     '__annotations__',
     '__parameters__',
     '__fields__',
+    '__field_count__',
+    '__defined_attributes__',
     '__getitem__',
     '__module__',
     '__orig_bases__',
@@ -23,8 +25,12 @@ IGNORED_ATTRS = OBJECT_DICT_KEYS | {
 
 
 class Space:
-    """Invokes each of its Field's `__set__` method by calling setattr on defined attributes in `__init__`."""
+    """Invokes each of its Field's `set` method by calling setattr on defined attributes in `__init__`."""
     DONT_SET_KEYS = {'DONT_SET_KEYS', '__fields__'}
+    __fields__: dict[str, Field] = {}
+    """Populated by Field.__set_name__"""
+    __defined_attributes__: frozenset[str] = frozenset()
+    """What `__init__` setattrs. Populated by __init_subclass__"""
     
     def __new__(cls, *args, **kwargs):
         # TypeError: object.__new__(Config) is not safe, use dict.__new__() error
@@ -33,16 +39,72 @@ class Space:
         # instance = super().__new__(cls, *args, **kwargs)
         return instance
     
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # Inherited Fields too, so subclasses (e.g SqliteStore(path=...)) can set them
+        cls.__defined_attributes__ = (frozenset(cls.__dict__) - IGNORED_ATTRS) | cls.__fields__.keys()
+    
     def __init__(self, *args, **kwargs) -> None:
         """setattr keys (Fields) that are defined on class-level"""
-        kwargs.update(dict(*args))
-        defined_attributes = set(self.__class__.__dict__) - IGNORED_ATTRS  # todo: return if not kwargs
+        if args:
+            kwargs.update(dict(*args))
+        if not kwargs:
+            return
+        defined_attributes = self.__defined_attributes__
         for name, val in kwargs.items():
             if name in defined_attributes:
                 # this cannot be commented because then tests fail
                 setattr(self, name, val)
                 continue
             log.warning(f"{self.__class__.__qualname__}.__init__(...) ignoring keyword argument {name!r}")
+    
+    @classmethod
+    def from_many(cls, mappings: Iterable[Mapping]) -> list:
+        """
+        Like `[cls(**mapping) for mapping in mappings]`, for building many instances at once, e.g. from a parsed sheet.
+        Skips the `__init__` call per instance, and warns about ignored keys once.
+        Classes that override `__init__` are constructed normally.
+        """
+        if cls.__init__ is not Space.__init__:
+            return [cls(**mapping) for mapping in mappings]
+        new = cls.__new__
+        defined_attributes = cls.__defined_attributes__
+        instances = []
+        ignored = set()
+        for mapping in mappings:
+            instance = new(cls)
+            for name, val in mapping.items():
+                if name in defined_attributes:
+                    setattr(instance, name, val)
+                else:
+                    ignored.add(name)
+            instances.append(instance)
+        if ignored:
+            log.warning(f"{cls.__qualname__}.from_many(...) ignoring keys {sorted(ignored)}")
+        return instances
+    
+    def hydrate(self):
+        """Casts every Field at once. Typed spaces also construct and hydrate their values, see e.g TypedDictSpace.hydrate."""
+        instance_dict = self.__dict__
+        for name, field in self.__fields__.items():
+            if name not in instance_dict:
+                field.__get__(self)
+        return self
+    
+    def __setattr__(self, name, value):
+        field = self.__fields__.get(name)
+        if field is None:
+            super().__setattr__(name, value)
+        else:
+            field.set(self, value)
+    
+    def __delattr__(self, name):
+        field = self.__fields__.get(name)
+        if field is None:
+            super().__delattr__(name)
+        else:
+            field.delete(self)
+    
     def dict(self):
         # ignore = self.DONT_SET_KEYS | IGNORED_ATTRS
         # return {key: val
@@ -0,0 +1,162 @@
+"""
+(De)serialization of the sheet, behind a small interface, so the TOML backend is pluggable:
+
+    codec = get_codec()  # config.sheet.codec
+    data = codec.loads(text)
+    text = codec.dumps(work)
+
+Backends:
+    toml     The pure-Python `toml` package, for reading and writing
+    tomllib  Reads with the stdlib `tomllib` (Python 3.11+) or `tomli`, writes with `toml`
+    rtoml    Reads and writes with `rtoml` (Rust), if it's installed
+    auto     rtoml if it's installed, otherwise tomllib if it's available, otherwise toml
+
+Whatever the backend, XArrows are written as TOML local times (HH:mm:ss), and CompactEntries as tables.
+"""
+from collections.abc import Mapping
+from datetime import time as dt_time
+from functools import lru_cache
+from typing import Optional
+
+import toml
+
+from timefred.store.models import CompactEntry
+from timefred.time import XArrow
+
+
+class TomlEncoder(toml.TomlEncoder):
+    def __init__(self, _dict=dict, preserve=False):
+        super().__init__(_dict, preserve)
+        self.dump_funcs.update({
+            # AttrDictSpace: dict,
+            # Colored: lambda colored: repr(str(colored)),
+            XArrow: lambda xarrow: xarrow.HHmmss,
+            })
+
+    def dump_sections(self, o, sup):
+        # CompactEntries aren't dicts, so toml would dump them as values instead of an array of tables
+        if any(isinstance(value, list) for value in dict.values(o)):
+            o = {section: [item.to_raw() if isinstance(item, CompactEntry) else item for item in value]
+                          if isinstance(value, list) else value
+                 for section, value in dict.items(o)}
+        return super().dump_sections(o, sup)
+
+
+class Codec:
+    name: str
+
+    def loads(self, text: str) -> dict:
+        raise NotImplementedError
+
+    def dumps(self, data: Mapping) -> str:
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f'{self.__class__.__qualname__}()'
+
+
+class TomlCodec(Codec):
+    name = 'toml'
+
+    def __init__(self):
+        self.encoder = TomlEncoder()
+
+    def loads(self, text: str) -> dict:
+        return toml.loads(text)
+
+    def dumps(self, data: Mapping) -> str:
+        return toml.dumps(data, self.encoder)
+
+
+def _tomllib():
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            return None
+    return tomllib
+
+
+class TomllibCodec(TomlCodec):
+    """tomllib can't write, so dumps is TomlCodec's"""
+    name = 'tomllib'
+
+    def __init__(self):
+        super().__init__()
+        self._loads = _tomllib().loads
+
+    def loads(self, text: str) -> dict:
+        return self._loads(text)
+
+
+def _rtoml():
+    try:
+        import rtoml
+    except ImportError:
+        return None
+    return rtoml
+
+
+def to_plain(value):
+    """Converts what the toml encoder knows how to dump (Spaces, XArrows, CompactEntries) to builtins"""
+    if isinstance(value, XArrow):
+        return dt_time(value.hour, value.minute, value.second)
+    if isinstance(value, CompactEntry):
+        return value.to_raw()
+    if isinstance(value, Mapping):
+        # Not .items(), which constructs the values of typed spaces
+        items = dict.items(value) if isinstance(value, dict) else value.items()
+        return {str(key): to_plain(item) for key, item in items if item is not None}
+    if isinstance(value, (list, tuple)):
+        items = list.__iter__(value) if isinstance(value, list) else value
+        return [to_plain(item) for item in items]
+    if isinstance(value, str):
+        return str(value)
+    return value
+
+
+class RtomlCodec(Codec):
+    name = 'rtoml'
+
+    def __init__(self):
+        self._rtoml = _rtoml()
+
+    def loads(self, text: str) -> dict:
+        return self._rtoml.loads(text)
+
+    def dumps(self, data: Mapping) -> str:
+        return self._rtoml.dumps(to_plain(data))
+
+
+CODECS: dict[str, type[Codec]] = {'toml': TomlCodec, 'tomllib': TomllibCodec, 'rtoml': RtomlCodec}
+
+
+def available(name: str) -> bool:
+    if name == 'tomllib':
+        return _tomllib() is not None
+    if name == 'rtoml':
+        return _rtoml() is not None
+    return name in CODECS
+
+
+@lru_cache
+def get_codec(name: Optional[str] = None) -> Codec:
+    """
+    Args:
+        name: One of CODECS, or 'auto'. Defaults to `config.sheet.codec`.
+    Raises:
+        ValueError: if `name` isn't a known or installed backend
+    """
+    if name is None:
+        from timefred.config import config
+        name = config.sheet.codec
+    name = name.lower()
+    if name == 'auto':
+        name = next(name for name in ('rtoml', 'tomllib', 'toml') if available(name))
+    if name not in CODECS:
+        raise ValueError(f'Unknown sheet codec {name!r}, expected one of {[*CODECS, "auto"]}')
+    if not available(name):
+        raise ValueError(f'Sheet codec {name!r} is not installed')
+    return CODECS[name]()
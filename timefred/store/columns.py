@@ -0,0 +1,348 @@
+"""
+Columnar view of the whole Work, for reports that aggregate across many days: ~/.cache/timefred/<sheet stem>.columns
+
+One row per entry, in contiguous arrays, ordered by day:
+    day         index into `days`, which are ordered by date
+    activity    index into `activities`
+    jira        index into `jiras`, or NO_ID
+    start, end  local wall-clock epoch seconds (end is ONGOING for entries without an end)
+    tag_bits    `words` uint64 words per row; bit i is set if the entry is tagged `tags[i]`
+
+Built in a single pass over the Work, and keyed by the SheetStat of both the sheet and the journal.
+Reductions use numpy when it's installed, and plain loops over the arrays otherwise.
+
+Layout (little endian):
+    header: magic (4s) | version (B) | sheet mtime_ns, size (qq) | journal mtime_ns, size (qq) | rows (I) | words (I) | names length (I)
+    names:  json {"days": [...], "activities": [...], "jiras": [...], "tags": [...]}
+    arrays: day ordinals (q × len(days)) | day, activity, jira (I × rows each) | start, end (q × rows each) | tag_bits (Q × rows × words)
+"""
+import json
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date as dt_date
+from pathlib import Path
+from typing import Optional
+
+from arrow import Arrow
+
+from timefred.log import log
+from timefred.store.models import Work, CompactEntry, to_epoch
+from timefred.store.sidecar import SheetStat, sidecar_path
+from timefred.time.timeutils import week_start
+
+MAGIC = b'TFCL'
+VERSION = 2
+ONGOING = -2 ** 63
+"""`end` of an entry that hasn't ended yet"""
+NO_ID = 0xFFFFFFFF
+"""`jira` of an entry without a Jira ticket"""
+
+HEADER = struct.Struct('<4sBqqqqIII')
+NO_STAT = SheetStat(-1, -1)
+
+ColumnsKey = tuple[Optional[SheetStat], Optional[SheetStat]]
+"""(sheet, journal), see Store._resident_key"""
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _epoch(value, date: dt_date) -> int:
+    if isinstance(value, Arrow):
+        # Cast by Entry relative to today; the sheet only stores the time
+        value = value.time()
+    return to_epoch(value, date)
+
+
+class Columns:
+    __slots__ = ('key', 'days', 'day_ordinals', 'activities', 'jiras', 'tags', 'words',
+                 'day', 'activity', 'jira', 'start', 'end', 'tag_bits')
+
+    def __init__(self, key: ColumnsKey = None) -> None:
+        self.key = key
+        self.days: list[str] = []
+        self.day_ordinals = array('q')
+        """date.toordinal() of each day"""
+        self.activities: list[str] = []
+        self.jiras: list[str] = []
+        self.tags: list[str] = []
+        self.words = 1
+        """uint64 words of tag_bits per row"""
+        self.day = array('I')
+        self.activity = array('I')
+        self.jira = array('I')
+        self.start = array('q')
+        self.end = array('q')
+        self.tag_bits = array('Q')
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def __repr__(self) -> str:
+        return (f'{self.__class__.__qualname__}({len(self)} entries, {len(self.days)} days, '
+                f'{len(self.activities)} activities, {len(self.jiras)} jiras, {len(self.tags)} tags)')
+
+    @classmethod
+    def build(cls, work: Work, key: ColumnsKey = None) -> "Columns":
+        """Reads entries' raw values where possible, so nothing is cast to XArrow, Tag etc.
+        Days whose key isn't a date are skipped."""
+        columns = cls(key)
+        activity_ids: dict[str, int] = {}
+        jira_ids: dict[str, int] = {}
+        tag_ids: dict[str, int] = {}
+        row_tags: list[list[int]] = []
+        date_index = work.date_index()
+        for day_index, (ordinal, ddmmyy) in enumerate(zip(date_index.ordinals, date_index.keys)):
+            date = dt_date.fromordinal(ordinal)
+            columns.days.append(ddmmyy)
+            columns.day_ordinals.append(ordinal)
+            day = work[ddmmyy]
+            for name in day.keys():
+                activity_id = activity_ids.setdefault(name, len(activity_ids))
+                for entry in list.__iter__(day[name]):
+                    if isinstance(entry, CompactEntry):
+                        start = entry.start_epoch
+                        end = ONGOING if entry.end_epoch is None else entry.end_epoch
+                        jira = entry.jira_raw
+                        tags = entry.raw_tags
+                    else:
+                        start = _epoch(dict.__getitem__(entry, 'start'), date)
+                        end = dict.get(entry, 'end')
+                        end = _epoch(end, date) if end else ONGOING
+                        jira = dict.get(entry, 'jira')
+                        tags = dict.get(entry, 'tags') or ()
+                    columns.day.append(day_index)
+                    columns.activity.append(activity_id)
+                    columns.jira.append(jira_ids.setdefault(str(jira), len(jira_ids)) if jira else NO_ID)
+                    columns.start.append(start)
+                    columns.end.append(end)
+                    row_tags.append([tag_ids.setdefault(str(tag), len(tag_ids)) for tag in tags if tag])
+        columns.activities = list(activity_ids)
+        columns.jiras = list(jira_ids)
+        columns.tags = list(tag_ids)
+        columns.words = max(1, -(-len(tag_ids) // 64))
+        for tag_indices in row_tags:
+            row = [0] * columns.words
+            for tag_index in tag_indices:
+                row[tag_index // 64] |= 1 << (tag_index % 64)
+            columns.tag_bits.extend(row)
+        return columns
+
+    # *** Sidecar
+
+    @classmethod
+    def read(cls, columns_path: Path) -> Optional["Columns"]:
+        """Returns None if `columns_path` doesn't exist or is corrupt."""
+        try:
+            data = columns_path.read_bytes()
+            (magic, version,
+             sheet_mtime_ns, sheet_size, journal_mtime_ns, journal_size,
+             rows, words, names_length) = HEADER.unpack_from(data)
+            if magic != MAGIC or version != VERSION:
+                return None
+            sheet_stat = SheetStat(sheet_mtime_ns, sheet_size)
+            journal_stat = SheetStat(journal_mtime_ns, journal_size)
+            columns = cls((None if sheet_stat == NO_STAT else sheet_stat,
+                           None if journal_stat == NO_STAT else journal_stat))
+            offset = HEADER.size
+            names = json.loads(data[offset:offset + names_length])
+            offset += names_length
+            columns.days = names['days']
+            columns.activities = names['activities']
+            columns.jiras = names['jiras']
+            columns.tags = names['tags']
+            columns.words = words
+            for attr, count in (('day_ordinals', len(columns.days)),
+                                ('day', rows),
+                                ('activity', rows),
+                                ('jira', rows),
+                                ('start', rows),
+                                ('end', rows),
+                                ('tag_bits', rows * words)):
+                column = getattr(columns, attr)
+                length = count * column.itemsize
+                if offset + length > len(data):
+                    raise ValueError(f'truncated {attr}')
+                column.frombytes(data[offset:offset + length])
+                offset += length
+            return columns
+        except FileNotFoundError:
+            return None
+        except (struct.error, ValueError, KeyError, TypeError) as e:
+            log.warning(f'Corrupt columns {columns_path}, ignoring: {e.__class__.__qualname__}: {e}')
+            return None
+
+    def write(self, columns_path: Path) -> bool:
+        sheet_stat, journal_stat = self.key or (None, None)
+        sheet_stat = sheet_stat or NO_STAT
+        journal_stat = journal_stat or NO_STAT
+        names = json.dumps({'days': self.days, 'activities': self.activities, 'jiras': self.jiras, 'tags': self.tags}).encode()
+        chunks = [HEADER.pack(MAGIC, VERSION, *sheet_stat, *journal_stat, len(self), self.words, len(names)),
+                  names]
+        chunks.extend(column.tobytes() for column in (self.day_ordinals, self.day, self.activity, self.jira,
+                                                        self.start, self.end, self.tag_bits))
+        try:
+            columns_path.write_bytes(b''.join(chunks))
+            return True
+        except OSError as e:
+            log.warning(f'Failed writing columns {columns_path}: {e}')
+            return False
+
+    # *** Queries
+
+    def rows_between(self, first: dt_date, last: dt_date) -> range:
+        """The rows of the days from `first` to `last`, inclusive."""
+        first_day = bisect_left(self.day_ordinals, first.toordinal())
+        last_day = bisect_right(self.day_ordinals, last.toordinal())
+        # Rows are ordered by day
+        return range(bisect_left(self.day, first_day), bisect_left(self.day, last_day))
+
+    def between(self, first: dt_date, last: dt_date) -> "Columns":
+        """The rows of the days from `first` to `last`, inclusive. Names are shared with `self`, so ids stay the same."""
+        rows = self.rows_between(first, last)
+        start, stop = rows.start, rows.stop
+        columns = self.__class__(self.key)
+        columns.days = self.days
+        columns.day_ordinals = self.day_ordinals
+        columns.activities = self.activities
+        columns.jiras = self.jiras
+        columns.tags = self.tags
+        columns.words = self.words
+        for attr in ('day', 'activity', 'jira', 'start', 'end'):
+            setattr(columns, attr, getattr(self, attr)[start:stop])
+        columns.tag_bits = self.tag_bits[start * self.words:stop * self.words]
+        return columns
+
+    def ongoing_row(self) -> Optional[int]:
+        """
+        The row of the ongoing entry, like Work.ongoing_pointer: the last entry of the latest activity, if it has no end.
+        Other entries without an end (e.g "Got to office") aren't ongoing.
+        """
+        seen: set[tuple[int, int]] = set()
+        for row in reversed(range(len(self))):
+            day_activity = self.day[row], self.activity[row]
+            if day_activity in seen:
+                continue
+            if self.end[row] == ONGOING:
+                return row
+            seen.add(day_activity)
+        return None
+
+    # *** Reductions
+    # Each takes the `durations` to sum, which default to `self.durations()`.
+
+    def durations(self, now: int = None, since: int = None, until: int = None) -> array:
+        """
+        Seconds of each entry, clipped to [`since`, `until`] if given.
+        Entries without an end last until `now` (a local wall-clock epoch) if given,
+        and 0 seconds otherwise, like their Timespan.seconds.
+        """
+        np = _numpy()
+        if np is not None:
+            start = np.frombuffer(self.start, dtype=np.int64)
+            end = np.frombuffer(self.end, dtype=np.int64)
+            end = np.where(end == ONGOING, start if now is None else now, end)
+            if since is not None:
+                start = np.maximum(start, since)
+            if until is not None:
+                end = np.minimum(end, until)
+            return array('q', np.maximum(end - start, 0).tobytes())
+        durations = array('q')
+        for start, end in zip(self.start, self.end):
+            if end == ONGOING:
+                end = start if now is None else now
+            if since is not None and start < since:
+                start = since
+            if until is not None and end > until:
+                end = until
+            durations.append(end - start if end > start else 0)
+        return durations
+
+    def totals_by_activity(self, durations: array = None) -> dict[str, int]:
+        """Seconds per activity name."""
+        return dict(zip(self.activities, self._bincount(self.activity, len(self.activities), durations)))
+
+    def totals_by_jira(self, durations: array = None) -> dict[str, int]:
+        """Seconds per Jira ticket, of the entries that have one."""
+        return dict(zip(self.jiras, self._bincount(self.jira, len(self.jiras), durations)))
+
+    def totals_by_day(self, durations: array = None) -> dict[str, int]:
+        """Seconds per day key."""
+        return dict(zip(self.days, self._bincount(self.day, len(self.days), durations)))
+
+    def totals_by_date(self, durations: array = None) -> dict[dt_date, int]:
+        """Seconds per day, keyed by its date."""
+        return dict(zip(map(dt_date.fromordinal, self.day_ordinals), self._bincount(self.day, len(self.days), durations)))
+
+    def totals_by_week(self, durations: array = None) -> dict[dt_date, int]:
+        """Seconds per week, keyed by the week's first day (see timeutils.week_start)."""
+        totals: dict[dt_date, int] = {}
+        for date, seconds in self.totals_by_date(durations).items():
+            if not seconds:
+                continue
+            week = week_start(date)
+            totals[week] = totals.get(week, 0) + seconds
+        return totals
+
+    def totals_by_tag(self, durations: array = None) -> dict[str, int]:
+        """Seconds per tag. An entry with several tags counts towards each of them."""
+        if durations is None:
+            durations = self.durations()
+        np = _numpy()
+        if np is not None:
+            bits = np.frombuffer(self.tag_bits, dtype=np.uint64).reshape(len(self), self.words)
+            durations = np.frombuffer(durations, dtype=np.int64)
+            totals = {}
+            for tag_index, tag in enumerate(self.tags):
+                word, bit = divmod(tag_index, 64)
+                tagged = (bits[:, word] >> np.uint64(bit)) & np.uint64(1)
+                totals[tag] = int(durations[tagged.astype(bool)].sum())
+            return totals
+        totals = [0] * len(self.tags)
+        words = self.words
+        for row, seconds in enumerate(durations):
+            for word in range(words):
+                bits = self.tag_bits[row * words + word]
+                while bits:
+                    low_bit = bits & -bits
+                    totals[word * 64 + low_bit.bit_length() - 1] += seconds
+                    bits ^= low_bit
+        return dict(zip(self.tags, totals))
+
+    def _bincount(self, ids: array, length: int, durations: Optional[array]) -> list[int]:
+        """Sums `durations` by id, skipping NO_ID."""
+        if durations is None:
+            durations = self.durations()
+        np = _numpy()
+        if np is not None:
+            ids = np.frombuffer(ids, dtype=np.uint32)
+            durations = np.frombuffer(durations, dtype=np.int64)
+            has_id = ids != NO_ID
+            totals = np.bincount(ids[has_id], weights=durations[has_id], minlength=length)
+            return [int(total) for total in totals]
+        totals = [0] * length
+        for id_, seconds in zip(ids, durations):
+            if id_ != NO_ID:
+                totals[id_] += seconds
+        return totals
+
+
+def load_columns(sheet_path: Path, key: ColumnsKey) -> Optional[Columns]:
+    """
+    Returns:
+        The cached columns of `sheet_path`, or None if they're missing, stale or corrupt.
+    """
+    columns = Columns.read(sidecar_path(sheet_path, '.columns'))
+    if columns is None or columns.key != key:
+        return None
+    return columns
+
+
+def write_columns(sheet_path: Path, columns: Columns) -> bool:
+    return columns.write(sidecar_path(sheet_path, '.columns'))
@@ -0,0 +1,120 @@
+"""
+Binary sidecar index of the sheet: ~/.cache/timefred/<sheet stem>.index
+
+Maps each day key to the byte offsets and lengths of its sections in the sheet, so a day can be read
+with a seek instead of parsing (or even reading) the whole sheet. Keyed by the sheet's SheetStat;
+a stale index is rebuilt in a single streaming pass over the sheet.
+
+Layout (little endian):
+    header: magic (4s) | version (B) | sheet mtime_ns (q) | sheet size (q) | day count (I)
+    day:    key length (B) | key (utf-8) | range count (H) | range count × (offset (Q) | length (I))
+"""
+import struct
+from pathlib import Path
+from typing import Optional, BinaryIO, Union
+
+from timefred.log import log
+from timefred.store.lazy import scan_day_sections
+from timefred.store.sidecar import SheetStat, sidecar_path
+
+MAGIC = b'TFIX'
+VERSION = 2
+UNSPLITTABLE = 0xFFFFFFFF
+"""Day count of a sheet that can't be split into days, see scan_day_sections"""
+
+HEADER = struct.Struct('<4sBqqI')
+KEY_LENGTH = struct.Struct('<B')
+RANGE_COUNT = struct.Struct('<H')
+RANGE = struct.Struct('<QI')
+
+
+class SheetIndex:
+    __slots__ = ('stat', 'sections')
+
+    def __init__(self, stat: SheetStat, sections: Optional[dict[str, list[tuple[int, int]]]]) -> None:
+        self.stat = stat
+        self.sections = sections
+        """(start, end) byte ranges by day key, or None if the sheet can't be split into days"""
+
+    def __repr__(self) -> str:
+        days = 'unsplittable' if self.sections is None else f'{len(self.sections)} days'
+        return f'{self.__class__.__qualname__}({self.stat}, {days})'
+
+    @classmethod
+    def build(cls, sheet: BinaryIO) -> "SheetIndex":
+        stat = SheetStat.of(sheet.fileno())
+        sheet.seek(0)
+        sections = scan_day_sections(sheet)
+        return cls(stat, sections)
+
+    @classmethod
+    def load(cls, sheet: Union[BinaryIO, Path], index_path: Path = None) -> "SheetIndex":
+        """
+        Reads the sidecar index of the `sheet` file, rebuilding it if it's missing or stale.
+        If `sheet` is a path, it's opened only to rebuild the index.
+        Args:
+            index_path: Defaults to ~/.cache/timefred/<sheet stem>.index
+        """
+        sheet_path = sheet if isinstance(sheet, Path) else Path(sheet.name)
+        if index_path is None:
+            index_path = sidecar_path(sheet_path, '.index')
+        stat = SheetStat.of(sheet if isinstance(sheet, Path) else sheet.fileno())
+        index = cls.read(index_path)
+        if index is not None and index.stat == stat:
+            return index
+        if isinstance(sheet, Path):
+            with sheet.open('rb') as file:
+                index = cls.build(file)
+        else:
+            index = cls.build(sheet)
+        index.write(index_path)
+        return index
+
+    @classmethod
+    def read(cls, index_path: Path) -> Optional["SheetIndex"]:
+        """Returns None if `index_path` doesn't exist or is corrupt."""
+        try:
+            data = index_path.read_bytes()
+            magic, version, mtime_ns, size, day_count = HEADER.unpack_from(data)
+            if magic != MAGIC or version != VERSION:
+                return None
+            stat = SheetStat(mtime_ns, size)
+            if day_count == UNSPLITTABLE:
+                return cls(stat, None)
+            sections = {}
+            offset = HEADER.size
+            for _ in range(day_count):
+                key_length, = KEY_LENGTH.unpack_from(data, offset)
+                offset += KEY_LENGTH.size
+                key = data[offset:offset + key_length].decode()
+                offset += key_length
+                range_count, = RANGE_COUNT.unpack_from(data, offset)
+                offset += RANGE_COUNT.size
+                ranges = []
+                for _ in range(range_count):
+                    start, length = RANGE.unpack_from(data, offset)
+                    offset += RANGE.size
+                    ranges.append((start, start + length))
+                sections[key] = ranges
+            return cls(stat, sections)
+        except FileNotFoundError:
+            return None
+        except (struct.error, UnicodeDecodeError) as e:
+            log.warning(f'Corrupt sheet index {index_path}, ignoring: {e}')
+            return None
+
+    def write(self, index_path: Path) -> bool:
+        day_count = UNSPLITTABLE if self.sections is None else len(self.sections)
+        chunks = [HEADER.pack(MAGIC, VERSION, self.stat.mtime_ns, self.stat.size, day_count)]
+        for key, ranges in (self.sections or {}).items():
+            encoded_key = key.encode()
+            chunks.append(KEY_LENGTH.pack(len(encoded_key)))
+            chunks.append(encoded_key)
+            chunks.append(RANGE_COUNT.pack(len(ranges)))
+            chunks.extend(RANGE.pack(start, end - start) for start, end in ranges)
+        try:
+            index_path.write_bytes(b''.join(chunks))
+            return True
+        except OSError as e:
+            log.warning(f'Failed writing sheet index {index_path}: {e}')
+            return False
@@ -0,0 +1,142 @@
+"""
+Append-only journal of sheet mutations.
+
+In journal mode (`config.sheet.journal = true`), `tf on` / `tf stop` / `tf tag` / `tf note`
+append a single JSON line to `<sheet>.journal` instead of rewriting the whole sheet.
+`Store.load` replays the journal on top of the sheet, and `Store.compact` folds it back into the sheet.
+"""
+import fcntl
+import json
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Optional, Union
+
+from timefred.log import log
+from timefred.space import AttrDictSpace, Field, Space
+from timefred.store.models import Work, Activity
+from timefred.time import XArrow
+from timefred.time.timeutils import parse_date
+
+MUTATION_OPS = ('start', 'stop', 'tag', 'note')
+_LOCKED: set[Path] = set()
+"""Journals this process holds a lock on, so Journal.locked is re-entrant (e.g Store.compact loads and dumps)"""
+
+
+def _parse_time(time: Union[str, XArrow]) -> XArrow:
+    """
+    Reads a dumped 'DD/MM/YY HH:mm:ss' the way sheet entries are read (XArrow.from_date_time),
+    so a replayed time is in the same timezone as the entries it's applied to.
+    """
+    if isinstance(time, XArrow):
+        return time
+    ddmmyy, _, hhmmss = time.partition(' ')
+    date = parse_date(ddmmyy)
+    if date is None or not hhmmss:
+        return XArrow.from_formatted(time)
+    return XArrow.from_date_time(date, hhmmss)
+
+
+class Mutation(AttrDictSpace):
+    """
+    start: Work.on(activity, time, tag, note)
+    stop:  Work.stop(time, tag, note)
+    tag:   work[day][activity][entry].add_tag(tag)
+    note:  work[day][activity][entry].add_note(note, time)
+    """
+    op: str = Field(validate=lambda op: op in MUTATION_OPS)
+    day: Optional[str] = Field(optional=True)
+    activity: Optional[str] = Field(optional=True)
+    entry: Optional[int] = Field(default=-1)
+    time: Optional[XArrow] = Field(optional=True, cast=_parse_time)
+    tag: Optional[str] = Field(optional=True)
+    note: Optional[str] = Field(optional=True)
+
+    def dumps(self) -> str:
+        """A single JSON line. XArrows are dumped as 'DD/MM/YY HH:mm:ss'."""
+        record = {key: value for key, value in self.items() if value is not None}
+        return json.dumps(record, default=str, ensure_ascii=False)
+
+    def apply(self, work: Work) -> Activity:
+        if self.op == 'start':
+            return work.on(self.activity, self.time, self.tag, self.note)
+        if self.op == 'stop':
+            return work.stop(self.time, self.tag, self.note)
+        activity: Activity = work[self.day][self.activity]
+        entry = activity[self.entry]
+        if self.op == 'tag':
+            entry.add_tag(self.tag)
+        else:
+            entry.add_note(self.note, self.time)
+        return activity
+
+
+class Journal(Space):
+    path: Path = Field(cast=Path)
+
+    @contextmanager
+    def locked(self, shared: bool = False):
+        """
+        Exclusively locks the journal, e.g. while it's being appended to, or the sheet is replaced and the journal cleared.
+        Args:
+            shared: For reading the sheet together with the journal, so the sheet isn't replaced in between.
+        """
+        if self.path in _LOCKED:
+            yield None
+            return
+        with self.path.open('a') as f:
+            fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            _LOCKED.add(self.path)
+            try:
+                yield f
+            finally:
+                _LOCKED.discard(self.path)
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def locked_if_exists(self, shared: bool = False):
+        """Like `locked`, but doesn't create the journal if there's none (e.g. outside of journal mode)"""
+        return self.locked(shared) if self.path.exists() else nullcontext()
+
+    def size(self) -> int:
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def append(self, *mutations: Mutation) -> bool:
+        lines = ''.join(mutation.dumps() + '\n' for mutation in mutations)
+        try:
+            with self.locked() as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            return True
+        except Exception as e:
+            log.error(f'Failed appending {len(mutations)} mutation(s) to {self.path}: {e}')
+            return False
+
+    def __iter__(self) -> Iterator[Mutation]:
+        if not self.path.exists():
+            return
+        with self.path.open() as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Most likely a write that was cut short; everything before it is intact.
+                    log.warning(f'{self.path}:{line_number} is not a valid record, ignoring: {line!r}')
+                    continue
+                yield Mutation(**record)
+
+    def replay(self, work: Work) -> Work:
+        for mutation in self:
+            mutation.apply(work)
+        return work
+
+    def clear(self) -> None:
+        if self.path.exists():
+            with self.path.open('w'):
+                pass
@@ -0,0 +1,194 @@
+"""
+Lazy loading of the sheet: instead of parsing the whole TOML file, the byte ranges of each day's sections
+are indexed by their headers (`["23/12/21"]`, `[["23/12/21"."Got to office"]]`, ...), and each day is
+parsed only when it is accessed through `Work.__getitem__`.
+"""
+import io
+import re
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+
+from timefred.store.models import Work
+from timefred.store.sidecar import SheetStat
+
+DAY_HEADER_RE = re.compile(rb'''^[ \t]*\[\[?[ \t]*(?P<quote>["'])(?P<day>.+?)(?P=quote)''', re.MULTILINE)
+"""Matches '["23/12/21"]', '[["23/12/21"."Got to office"]]', '["23/12/21".foo.notes]' etc"""
+MULTILINE_STRING_DELIMITER_RE = re.compile(rb'"{3}|\'{3}')
+
+
+def multiline_string_delimiter(line: bytes, delimiter: Optional[bytes] = None) -> Optional[bytes]:
+    """
+    Args:
+        delimiter: The delimiter of the multi-line string that `line` starts inside of, if any.
+    Returns:
+        The delimiter of the multi-line string that `line` ends inside of, if any.
+    >>> multiline_string_delimiter(b"notes = {'10:20:00' = '''With Vlad\\n")
+    b"'''"
+    >>> multiline_string_delimiter(b"and Eran'''}\\n", b"'''") is None
+    True
+    """
+    position = 0
+    while True:
+        if delimiter is None:
+            match = MULTILINE_STRING_DELIMITER_RE.search(line, position)
+            if match is None:
+                return None
+            delimiter = match.group()
+            position = match.end()
+        else:
+            end = line.find(delimiter, position)
+            if end == -1:
+                return delimiter
+            position = end + len(delimiter)
+            delimiter = None
+
+
+def scan_day_sections(lines: Iterable[bytes]) -> Optional[dict[str, list[tuple[int, int]]]]:
+    """
+    Streams over `lines` (which keep their line endings, e.g. a file opened in 'rb' mode).
+
+    Returns:
+        The (start, end) byte ranges of each day's sections, by day key and in order of appearance.
+        None if there's content before the first day header (e.g. top-level inline tables),
+        in which case the sheet has to be parsed as a whole.
+        Lines inside multi-line strings (e.g. a note with a line that looks like a day header) aren't headers.
+    """
+    sections: dict[str, list[tuple[int, int]]] = {}
+    current_ranges: Optional[list[tuple[int, int]]] = None
+    section_start = 0
+    offset = 0
+    string_delimiter = None
+    for line in lines:
+        match = DAY_HEADER_RE.match(line) if string_delimiter is None else None
+        string_delimiter = multiline_string_delimiter(line, string_delimiter)
+        if match:
+            if current_ranges is not None:
+                current_ranges.append((section_start, offset))
+            day = match.group('day').decode()
+            current_ranges = sections.setdefault(day, [])
+            section_start = offset
+        elif current_ranges is None:
+            stripped = line.strip()
+            if stripped and not stripped.startswith(b'#'):
+                return None
+        offset += len(line)
+    if current_ranges is not None:
+        current_ranges.append((section_start, offset))
+    return sections
+
+
+def index_day_sections(data: bytes) -> Optional[dict[str, list[tuple[int, int]]]]:
+    """
+    >>> index_day_sections(b'["01/12/21"]\\n"Got to office" = "10:00"\\n')
+    {'01/12/21': [(0, 39)]}
+    """
+    return scan_day_sections(io.BytesIO(data))
+
+
+class SheetSource:
+    """
+    An open handle to the sheet, so days can be read on demand even after the sheet was replaced or removed.
+    If the sheet's `stat` is already known (e.g from its index), it's opened on the first read instead,
+    so sheets whose days are never accessed (e.g the partitions of a PartitionedStore) are never opened.
+    """
+    __slots__ = ('path', '_file', 'stat')
+
+    def __init__(self, path: Path, stat: SheetStat = None) -> None:
+        self.path = path
+        self._file = None
+        if stat is None:
+            self._file = open(path, 'rb')
+            stat = SheetStat.of(self._file.fileno())
+        self.stat = stat
+
+    def __del__(self):
+        file = getattr(self, '_file', None)
+        if file is not None:
+            file.close()
+
+    @property
+    def file(self) -> BinaryIO:
+        if self._file is None:
+            file = open(self.path, 'rb')
+            if SheetStat.of(file.fileno()) != self.stat:
+                file.close()
+                raise RuntimeError(f'{self.path} was modified since it was indexed')
+            self._file = file
+        return self._file
+
+    def read(self, ranges: list[tuple[int, int]]) -> bytes:
+        file = self.file
+        if SheetStat.of(file.fileno()) != self.stat:
+            raise RuntimeError(f'{file.name} was modified in place since it was loaded')
+        chunks = []
+        for start, end in ranges:
+            file.seek(start)
+            chunks.append(file.read(end - start))
+        return b''.join(chunks)
+
+
+class UnparsedDay(Mapping):
+    """A day's raw TOML sections. Parsed on first access, e.g by `Day(**unparsed_day)`.
+    `source` is either the whole sheet's bytes, or a SheetSource, in which case only `ranges` are read."""
+    __slots__ = ('key', 'source', 'ranges', '_parsed')
+
+    def __init__(self, key: str, source: Union[bytes, SheetSource], ranges: list[tuple[int, int]]) -> None:
+        self.key = key
+        self.source = source
+        self.ranges = ranges
+        self._parsed = None
+
+    @property
+    def raw(self) -> bytes:
+        if isinstance(self.source, bytes):
+            return b''.join(self.source[start:end] for start, end in self.ranges)
+        return self.source.read(self.ranges)
+
+    @property
+    def whole(self) -> bytes:
+        """The whole sheet the day is in"""
+        if isinstance(self.source, bytes):
+            return self.source
+        return self.source.read([(0, self.source.stat.size)])
+
+    def parse(self) -> dict:
+        if self._parsed is None:
+            from timefred.store.codec import get_codec
+            codec = get_codec()
+            try:
+                self._parsed = codec.loads(self.raw.decode()).get(self.key, {})
+            except ValueError:
+                # The day's sections were split wrong (e.g. by a header-like line that the scanner took for one).
+                # TOML decode errors of all backends are ValueErrors.
+                self._parsed = codec.loads(self.whole.decode()).get(self.key, {})
+        return self._parsed
+
+    def __getitem__(self, name: str):
+        return self.parse()[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.parse())
+
+    def __len__(self) -> int:
+        return len(self.parse())
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__qualname__}({self.key!r}, {sum(end - start for start, end in self.ranges)} bytes)'
+
+
+def lazy_work(sections: dict[str, list[tuple[int, int]]], source: Union[bytes, SheetSource]) -> Work:
+    """A Work whose values are UnparsedDays."""
+    unparsed_days = {day: UnparsedDay(day, source, ranges) for day, ranges in sections.items()}
+    return Work(**unparsed_days)
+
+
+def load_lazily(data: bytes) -> Optional[Work]:
+    """
+    Returns:
+        A Work whose values are UnparsedDays, or None if the sheet can't be split into days.
+    """
+    sections = index_day_sections(data)
+    if sections is None:
+        return None
+    return lazy_work(sections, data)
@@ -1,6 +1,10 @@
 import os
+from bisect import bisect_left, bisect_right
+from datetime import date as dt_date, datetime, time as dt_time
 from functools import cached_property
-from typing import Optional, Iterable, Union, Any, Type, Mapping
+from typing import Optional, Iterable, Iterator, Union, Any, Type, Mapping, NamedTuple
+
+from arrow import Arrow
 
 from timefred import color as c
 from timefred.log import log
@@ -8,12 +12,68 @@ from timefred.color import Colored, ActivityString
 from timefred.integration.jira import JiraTicket
 from timefred.note import Note
 from timefred.space import AttrDictSpace, Field, TypedListSpace, DefaultAttrDictSpace
+from timefred.space.field import UNSET
 from timefred.tag import Tag
 from timefred.time import XArrow, Timespan
-from timefred.time.timeutils import secs2human
+from timefred.time.timeutils import secs2human, parse_date, parse_time, week_start
 from timefred.util import normalize_str
 
 
+class Ongoing(NamedTuple):
+    """Points at the ongoing entry: work[day][activity][entry]"""
+    day: str
+    activity: str
+    entry: int
+
+
+class DateIndex:
+    """Day keys ordered by date, so ranges of days are found by bisection instead of scanning the keys"""
+    __slots__ = ('size', 'ordinals', 'keys')
+    
+    def __init__(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        self.size = len(keys)
+        """Number of keys indexed, including unparsable ones"""
+        dated = sorted((date.toordinal(), key) for key in keys if (date := parse_date(key)) is not None)
+        self.ordinals: list[int] = [ordinal for ordinal, _ in dated]
+        self.keys: list[str] = [key for _, key in dated]
+    
+    def between(self, first: dt_date, last: dt_date) -> Iterator[tuple[dt_date, str]]:
+        """Dates and keys of the days from `first` to `last`, inclusive, in chronological order."""
+        start = bisect_left(self.ordinals, first.toordinal())
+        stop = bisect_right(self.ordinals, last.toordinal())
+        for index in range(start, stop):
+            yield dt_date.fromordinal(self.ordinals[index]), self.keys[index]
+
+
+class Rollups:
+    """Seconds per week and per month, keyed by their first day (see timeutils.week_start). Kept up to date by Activity."""
+    __slots__ = ('weeks', 'months')
+    
+    def __init__(self) -> None:
+        self.weeks: dict[dt_date, int] = {}
+        self.months: dict[dt_date, int] = {}
+    
+    def __repr__(self) -> str:
+        return f'{self.__class__.__qualname__}({len(self.weeks)} weeks, {len(self.months)} months)'
+    
+    @classmethod
+    def of(cls, work: "Work") -> "Rollups":
+        """Sums the raw entries of `work` in a single pass, without casting them (see timefred.store.columns)."""
+        from timefred.store.columns import Columns
+        columns = Columns.build(work)
+        rollups = cls()
+        for date, seconds in columns.totals_by_date().items():
+            rollups.add(date, seconds)
+        return rollups
+    
+    def add(self, date: dt_date, seconds: int) -> None:
+        week = week_start(date)
+        month = date.replace(day=1)
+        self.weeks[week] = self.weeks.get(week, 0) + seconds
+        self.months[month] = self.months.get(month, 0) + seconds
+
+
 class Entry(AttrDictSpace):
     start: XArrow = Field(cast=XArrow.from_absolute)
     end: Optional[XArrow] = Field(optional=True, cast=XArrow.from_absolute)
@@ -36,6 +96,11 @@ class Entry(AttrDictSpace):
         end = self.end
         timespan = Timespan(start=start, end=end)
         return timespan
+    
+    def __setattr__(self, name, value):
+        if name in ('start', 'end'):
+            self.__dict__.pop('timespan', None)
+        super().__setattr__(name, value)
 
     if not os.getenv('TIMEFRED_REPR', '').lower() in ('no', 'disable'):
         def __repr__(self):
@@ -54,6 +119,194 @@ class Entry(AttrDictSpace):
 
     def __lt__(self, other):
         return self.start < other.start
+    
+    def add_tag(self, tag: Union[str, Tag]) -> None:
+        """Appends `tag` to `self.tags`, keeping the raw (dumped) value in sync."""
+        tags = [str(_tag) for _tag in self.tags if _tag]
+        tags.append(str(tag))
+        self.tags = tags
+    
+    def add_note(self, note: Union[str, Note], time: Union[str, XArrow] = None) -> None:
+        """Appends `note` to `self.notes`, keeping the raw (dumped) value in sync.
+        If `note` is a str, it is noted at `time` (defaults to now)."""
+        if isinstance(note, Note):
+            time = note.time
+            content = note.content
+        else:
+            content = note
+            if not time:
+                time = XArrow.now()
+            time = XArrow.from_absolute(time)
+        notes = [{_note.time.HHmmss: _note.content} for _note in self.notes if _note]
+        notes.append({time.HHmmss: content})
+        self.notes = notes
+
+
+def to_epoch(time: Union[str, dt_time, XArrow], date: dt_date = None) -> int:
+    """
+    Args:
+        time: An absolute time ('09:45[:00]'), or an XArrow, in which case `date` is ignored.
+        date: Defaults to today, like XArrow.from_absolute.
+    """
+    if isinstance(time, Arrow):
+        # Wall clock time, regardless of tz, because that's what's dumped
+        return int(time.naive.timestamp())
+    if isinstance(time, str):
+        parsed_time = parse_time(time)
+        if parsed_time is None:
+            arrow = XArrow.from_absolute(time)
+            if date is not None:
+                arrow = arrow.replace(year=date.year, month=date.month, day=date.day)
+            return int(arrow.timestamp())
+        time = parsed_time
+    if date is None:
+        date = dt_date.today()
+    # Naive, i.e local time, like XArrow.now()
+    return int(datetime.combine(date, time.replace(microsecond=0, tzinfo=None)).timestamp())
+
+
+class CompactEntry:
+    """
+    Same API as Entry, at a fraction of the memory: start and end are stored as epoch seconds,
+    and tags and notes as tuples of raw values. XArrows, Tags and Notes are constructed on every access.
+    Unlike Entry, the date of start and end is the Day's (when accessed through work[day][name]), rather than today.
+    Used instead of Entry if `config.sheet.compact_entries` is on.
+    """
+    __slots__ = ('start_epoch', 'end_epoch', 'jira_raw', 'synced', 'raw_tags', 'raw_notes')
+    
+    def __init__(self,
+                 start_epoch: int,
+                 end_epoch: Optional[int] = None,
+                 jira_raw: Optional[str] = None,
+                 synced: Optional[bool] = None,
+                 raw_tags: tuple[str, ...] = (),
+                 raw_notes: tuple[tuple[str, str], ...] = ()) -> None:
+        self.start_epoch = start_epoch
+        self.end_epoch = end_epoch
+        self.jira_raw = jira_raw
+        self.synced = synced
+        self.raw_tags = raw_tags
+        self.raw_notes = raw_notes
+        """((HH:mm:ss, content), ...)"""
+    
+    @classmethod
+    def from_raw(cls, raw: Mapping, date: dt_date = None) -> "CompactEntry":
+        """`raw` is an entry as it's stored in the sheet, e.g {'start': '09:45:00', 'tags': ['research']}.
+        Its times are on `date` (defaults to today, like Entry)."""
+        end = raw.get('end')
+        raw_notes = []
+        notes = raw.get('notes') or ()
+        if isinstance(notes, Mapping):
+            # notes = { "10:20:00" = "..." }
+            notes = [notes]
+        for note in notes:
+            if isinstance(note, Note):
+                raw_notes.append((note.time.HHmmss, note.content))
+            else:
+                raw_notes.extend((str(time), content) for time, content in note.items())
+        return cls(start_epoch=to_epoch(raw['start'], date),
+                   end_epoch=to_epoch(end, date) if end else None,
+                   jira_raw=raw.get('jira') or None,
+                   synced=raw.get('synced'),
+                   raw_tags=tuple(map(str, raw.get('tags') or ())),
+                   raw_notes=tuple(raw_notes))
+    
+    def to_raw(self) -> dict:
+        """The inverse of from_raw. Times are datetime.time, so they're dumped as TOML local times (not strings)."""
+        raw = {'start': datetime.fromtimestamp(self.start_epoch).time()}
+        if self.end_epoch is not None:
+            raw['end'] = datetime.fromtimestamp(self.end_epoch).time()
+        if self.jira_raw:
+            raw['jira'] = self.jira_raw
+        if self.synced is not None:
+            raw['synced'] = self.synced
+        if self.raw_tags:
+            raw['tags'] = list(self.raw_tags)
+        if self.raw_notes:
+            raw['notes'] = [{time: content} for time, content in self.raw_notes]
+        return raw
+    
+    @property
+    def start(self) -> XArrow:
+        return XArrow.fromtimestamp(self.start_epoch)
+    
+    @start.setter
+    def start(self, time: Union[str, XArrow]) -> None:
+        self.start_epoch = to_epoch(time, dt_date.fromtimestamp(self.start_epoch))
+    
+    @property
+    def end(self) -> Optional[XArrow]:
+        """UNSET if not ended, like Entry.end"""
+        if self.end_epoch is None:
+            return UNSET
+        return XArrow.fromtimestamp(self.end_epoch)
+    
+    @end.setter
+    def end(self, time: Optional[Union[str, XArrow]]) -> None:
+        self.end_epoch = to_epoch(time, dt_date.fromtimestamp(self.start_epoch)) if time else None
+    
+    @property
+    def jira(self) -> JiraTicket:
+        return JiraTicket(self.jira_raw or '')
+    
+    @property
+    def tags(self) -> list[Tag]:
+        return list(map(Tag, self.raw_tags))
+    
+    @property
+    def notes(self) -> list[Note]:
+        return [Note({time: content}) for time, content in self.raw_notes]
+    
+    @property
+    def timespan(self) -> Timespan:
+        return Timespan(start=self.start, end=self.end)
+    
+    def add_tag(self, tag: Union[str, Tag]) -> None:
+        self.raw_tags += (str(tag),)
+    
+    def add_note(self, note: Union[str, Note], time: Union[str, XArrow] = None) -> None:
+        """If `note` is a str, it is noted at `time` (defaults to now)."""
+        if isinstance(note, Note):
+            time = note.time
+            content = note.content
+        else:
+            content = note
+            if not time:
+                time = XArrow.now()
+            time = XArrow.from_absolute(time)
+        self.raw_notes += ((time.HHmmss, content),)
+    
+    def __lt__(self, other):
+        if isinstance(other, CompactEntry):
+            return self.start_epoch < other.start_epoch
+        return self.start < other.start
+    
+    def __eq__(self, other):
+        if not isinstance(other, CompactEntry):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+    
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+    
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+    
+    if not os.getenv('TIMEFRED_REPR', '').lower() in ('no', 'disable'):
+        def __repr__(self):
+            representation = f'{self.__class__.__qualname__}(start={self.start!r}'
+            if self.end_epoch is not None:
+                representation += f', end={self.end!r}'
+            if self.jira_raw:
+                representation += f', jira={self.jira_raw!r}'
+            if self.synced:
+                representation += f', synced={self.synced}'
+            if self.raw_tags:
+                representation += f', tags={list(self.raw_tags)}'
+            if self.raw_notes:
+                representation += f', notes={list(self.raw_notes)}'
+            return representation + ')'
 
 
 class Activity(TypedListSpace[Entry], default_factory=Entry):
@@ -71,6 +324,49 @@ class Activity(TypedListSpace[Entry], default_factory=Entry):
                 raise
             iterable = (dict(start=iterable), )
             super().__init__(iterable, **kwargs)
+    
+    def __getitem__(self, index) -> Union[Entry, CompactEntry]:
+        """Like TypedListSpace.__getitem__, but constructs a CompactEntry if `config.sheet.compact_entries` is on."""
+        if isinstance(index, slice):
+            return super().__getitem__(index)
+        value = list.__getitem__(self, index)
+        if isinstance(value, (Entry, CompactEntry)):
+            return value
+        entry = self._new_entry(value)
+        list.__setitem__(self, index, entry)
+        return entry
+    
+    def _new_entry(self, raw: Mapping) -> Union[Entry, CompactEntry]:
+        return self._construct_many([raw])[0]
+    
+    def _constructed_types(self) -> tuple[type, ...]:
+        return Entry, CompactEntry
+    
+    def _construct_many(self, raw_entries: list[Mapping]) -> list[Union[Entry, CompactEntry]]:
+        """Used by TypedListSpace.hydrate to construct all of the activity's raw entries at once."""
+        from timefred.config import config
+        date = self.date()
+        if config.sheet.compact_entries:
+            return [CompactEntry.from_raw(raw, date) for raw in raw_entries]
+        if date is not None:
+            # Entry would cast them relative to today
+            dated_entries = []
+            for raw in raw_entries:
+                raw = dict(raw)
+                raw['start'] = XArrow.from_date_time(date, raw['start'])
+                if raw.get('end'):
+                    raw['end'] = XArrow.from_date_time(date, raw['end'])
+                dated_entries.append(raw)
+            raw_entries = dated_entries
+        return Entry.from_many(raw_entries)
+    
+    def date(self) -> Optional[dt_date]:
+        """The date of the Day this activity was accessed through (work[day][name]), if any."""
+        day = self.__dict__.get('__day__')
+        if day is None:
+            return None
+        key = day.__dict__.get('__key__')
+        return parse_date(key) if key else None
 
     if not os.getenv('TIMEFRED_REPR', '').lower() in ('no', 'disable'):
         def __repr__(self) -> str:
@@ -136,11 +432,17 @@ class Activity(TypedListSpace[Entry], default_factory=Entry):
         if last_entry.start > time:
             raise ValueError(f'Cannot stop {self.shortrepr()} before start time (tried to stop at {time!r})')
         last_entry.end = time
+        # The entry lasted 0 seconds while it had no end
+        self._account(last_entry.timespan.seconds)
         
         if tag:
-            last_entry.tags.add(tag)
+            last_entry.add_tag(tag)
         if note:
-            last_entry.notes.append(note)
+            last_entry.add_note(note, time)
+        
+        work = self.work()
+        if work is not None:
+            work.__ongoing__ = None if work.__ongoing__ == self.pointer() else UNSET
         return last_entry
     
     def start(self,
@@ -153,15 +455,91 @@ class Activity(TypedListSpace[Entry], default_factory=Entry):
         """
         if self.ongoing():
             raise ValueError(f'{self.shortrepr()} is already ongoing')
-        entry = Entry(start=time)
+        if not time:
+            time = XArrow.now()
+        entry = self._new_entry({'start': time})
         if tag:
-            entry.tags.add(tag)
+            entry.add_tag(tag)
         if note:
-            entry.notes.append(note)
+            entry.add_note(note, time)
         
-        self.append(entry)
+        super().append(entry)
+        self._account(entry.timespan.seconds)
+        
+        work = self.work()
+        if work is not None:
+            work.__ongoing__ = self.pointer()
+        return entry
+    
+    def work(self) -> Optional["Work"]:
+        """The Work this activity was accessed through (work[day][name]), if any."""
+        day = self.__dict__.get('__day__')
+        if day is None:
+            return None
+        return day.__dict__.get('__work__')
+    
+    def pointer(self) -> Optional[Ongoing]:
+        """Points at the last entry. None if the activity wasn't accessed through a Work."""
+        if self.work() is None:
+            return None
+        return Ongoing(self.__day__.__key__, str(self.name), len(self) - 1)
+    
+    # *** Derived totals
+    # Cached until the entries change. `start` and `stop` update them in O(1), along with the Day's and the Work's rollups.
+    # Every mutating list method invalidates them, and an entry's start or end that's set directly requires calling `invalidate()`.
+    
+    def invalidate(self) -> None:
+        """Drops the cached totals of this activity, of the Day it was accessed through, and of the Day's Work."""
+        self.__dict__.pop('timespans', None)
+        self.__dict__.pop('seconds', None)
+        self.__dict__.pop('human_duration', None)
+        day = self.__dict__.get('__day__')
+        if day is not None:
+            day.invalidate()
+    
+    def _account(self, seconds: int) -> None:
+        """Adds `seconds` to the cached totals, which don't have to be recomputed. Drops the rest."""
+        self.__dict__.pop('timespans', None)
+        self.__dict__.pop('human_duration', None)
+        if 'seconds' in self.__dict__:
+            self.__dict__['seconds'] += seconds
+        day = self.__dict__.get('__day__')
+        if day is not None:
+            day._account(seconds)
+    
+    def append(self, entry) -> None:
+        super().append(entry)
+        self.invalidate()
+    
+    def extend(self, entries) -> None:
+        super().extend(entries)
+        self.invalidate()
+    
+    def insert(self, index, entry) -> None:
+        super().insert(index, entry)
+        self.invalidate()
+    
+    def pop(self, index=-1):
+        entry = super().pop(index)
+        self.invalidate()
         return entry
     
+    def remove(self, entry) -> None:
+        super().remove(entry)
+        self.invalidate()
+    
+    def clear(self) -> None:
+        super().clear()
+        self.invalidate()
+    
+    def __setitem__(self, index, entry) -> None:
+        super().__setitem__(index, entry)
+        self.invalidate()
+    
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        self.invalidate()
+    
     @cached_property
     # @property
     def timespans(self) -> list[Timespan]:
@@ -177,7 +555,7 @@ class Activity(TypedListSpace[Entry], default_factory=Entry):
     # @property
     def seconds(self) -> int:
         timespans = self.timespans
-        return sum(timespans)
+        return Timespan.total(timespans)
 
     @cached_property
     # @property
@@ -250,9 +628,24 @@ class Activity(TypedListSpace[Entry], default_factory=Entry):
         return pretty
 
 
+def _expand_shorthands(day: dict) -> dict:
+    """"Got to office" = "09:40" is cast to an entry that starts at 09:40:00, see Day.changed"""
+    expanded = {}
+    for name, activity in day.items():
+        if not isinstance(activity, list):
+            activity = [{'start': parse_time(activity) or activity if isinstance(activity, str) else activity}]
+        expanded[name] = activity
+    return expanded
+
+
 class Day(DefaultAttrDictSpace[Any, Activity], default_factory=Activity):
     """Day { "activity_name": Activity }"""
+    DONT_SET_KEYS = DefaultAttrDictSpace.DONT_SET_KEYS | {'__work__', '__key__', '__unparsed__', '__dirty__'}
     __default_factory__: Type[Activity]
+    __unparsed__: Optional[Mapping] = None
+    """The UnparsedDay this day was parsed from, if it was lazily loaded (see timefred.store.lazy)"""
+    __dirty__: bool = False
+    """Set when an activity is added, started, stopped or otherwise invalidated. See `changed`"""
     
     def __getitem__(self, name):
         # log(f'[title]{self.__class__.__qualname__}.__getitem__({name!r})...')
@@ -276,6 +669,7 @@ class Day(DefaultAttrDictSpace[Any, Activity], default_factory=Activity):
             #     sep='\n  ')
             # log(f'  constructed = self.__default_factory__(name={name!r})')
             constructed = self.__default_factory__(name=name)
+            self.__dirty__ = True
             # log(f'  {constructed = !r} | {constructed.name = !r}')
             # assert constructed.name == name, f'{constructed.name = !r}, {name = !r}'
             # log(f'  setattr(self, {name!r}, {constructed!r})')
@@ -298,12 +692,53 @@ class Day(DefaultAttrDictSpace[Any, Activity], default_factory=Activity):
                 setattr(self, name, constructed)
         # assert constructed.name == name, f'{constructed.name=!r} != {name=!r} ({self.__class__.__qualname__})'
         # log(f'{self.__class__.__qualname__}.__getitem__({name!r}) => {constructed!r}\n\n')
+        if constructed.__dict__.get('__day__') is not self:
+            constructed.__day__ = self
         return constructed
 
+    def invalidate(self) -> None:
+        """Drops the cached totals, and the Work's rollups. Activities' own totals stay cached unless they changed, see Activity.invalidate."""
+        self.__dirty__ = True
+        self.__dict__.pop('seconds', None)
+        self.__dict__.pop('human_duration', None)
+        work = self.__dict__.get('__work__')
+        if work is not None:
+            work.__rollups__ = None
+    
+    def _account(self, seconds: int) -> None:
+        """See Activity._account"""
+        self.__dirty__ = True
+        self.__dict__.pop('human_duration', None)
+        if 'seconds' in self.__dict__:
+            self.__dict__['seconds'] += seconds
+        work = self.__dict__.get('__work__')
+        if work is not None and work.__rollups__ is not None:
+            # Like Columns.build, rollups skip days whose key isn't a date
+            date = parse_date(self.__key__)
+            if date is not None:
+                work.__rollups__.add(date, seconds)
+    
+    def changed(self) -> bool:
+        """
+        Whether the day differs from the sheet section it was parsed from, so `Store.dump` has to serialize it.
+        Always True if it wasn't lazily loaded. Entries changed directly (e.g `entry.add_tag(...)`) don't mark the day dirty,
+        so unless it is, its raw values are compared with what was parsed.
+        """
+        if self.__unparsed__ is None or self.__dirty__:
+            return True
+        from timefred.store.codec import to_plain
+        return _expand_shorthands(to_plain(self)) != _expand_shorthands(to_plain(self.__unparsed__.parse()))
+    
+    def __getstate__(self):
+        # The UnparsedDay may read from an open file
+        state = self.__dict__.copy()
+        state.pop('__unparsed__', None)
+        return state
+    
     @cached_property
     # @property
     def seconds(self) -> int:
-        return sum(map(lambda activity: activity.seconds, self.values()))
+        return sum(map(lambda activity: activity.seconds, self.itervalues()))
 
     @cached_property
     # @property
@@ -312,21 +747,85 @@ class Day(DefaultAttrDictSpace[Any, Activity], default_factory=Activity):
 
 class Work(DefaultAttrDictSpace[Any, Day], default_factory=Day):
     """Work { "31/10/21": Day }"""
+    DONT_SET_KEYS = DefaultAttrDictSpace.DONT_SET_KEYS | {'__ongoing__', '__dates__', '__rollups__'}
     __default_factory__: Type[Day]
+    __ongoing__: Optional[Ongoing] = UNSET
+    """Kept up to date by Activity.start and Activity.stop. None if nothing is ongoing, UNSET if unknown."""
+    __dates__: Optional[DateIndex] = None
+    __rollups__: Optional[Rollups] = None
+    """Built on first access, then kept up to date by Activity.start and Activity.stop"""
+    
+    def __getitem__(self, name) -> Day:
+        raw_day = dict.get(self, name)
+        day = super().__getitem__(name)
+        if day is not raw_day and getattr(raw_day, 'ranges', None) is not None:
+            # Just parsed from an UnparsedDay, whose bytes are dumped verbatim as long as the day is unchanged
+            day.__unparsed__ = raw_day
+        if day.__dict__.get('__work__') is not self:
+            day.__work__ = self
+            day.__key__ = name
+        return day
+    
+    def date_index(self) -> DateIndex:
+        """Rebuilt only when days were added (days are never removed)."""
+        if self.__dates__ is None or self.__dates__.size != len(self):
+            self.__dates__ = DateIndex(self.keys())
+        return self.__dates__
+    
+    def days_between(self, first: dt_date, last: dt_date) -> Iterator[tuple[dt_date, Day]]:
+        """Yields the days from `first` to `last`, inclusive, in chronological order. Lazily loaded days are parsed one at a time."""
+        for date, ddmmyy in self.date_index().between(first, last):
+            yield date, self[ddmmyy]
+    
+    def rollups(self) -> Rollups:
+        if self.__rollups__ is None:
+            self.__rollups__ = Rollups.of(self)
+        return self.__rollups__
+    
+    def week_seconds(self, date: dt_date = None) -> int:
+        """Seconds worked in the week of `date` (defaults to today). Constant-time once the rollups are built."""
+        return self.rollups().weeks.get(week_start(date or dt_date.today()), 0)
+    
+    def month_seconds(self, date: dt_date = None) -> int:
+        """Seconds worked in the month of `date` (defaults to today). Constant-time once the rollups are built."""
+        return self.rollups().months.get((date or dt_date.today()).replace(day=1), 0)
+    
+    def to_columns(self) -> "Columns":
+        """See timefred.store.columns"""
+        from timefred.store.columns import Columns
+        return Columns.build(self)
     
     def ongoing_activity(self) -> Activity:
         """
         Raises:
             ValueError: if there is no ongoing activity
         """
-        # TODO: cache somehow
+        ongoing = self.ongoing_pointer()
+        if ongoing is not None:
+            activity = self[ongoing.day][ongoing.activity]
+            if activity.ongoing():
+                return activity
+            # Out of sync, e.g. an entry's end was set directly
+            self.__ongoing__ = UNSET
+            ongoing = self.ongoing_pointer()
+        if ongoing is None:
+            raise ValueError(f'No ongoing activity')
+        return self[ongoing.day][ongoing.activity]
+    
+    def ongoing_pointer(self) -> Optional[Ongoing]:
+        """Scans the days in reverse only if the pointer is unknown."""
+        if self.__ongoing__ is UNSET:
+            self.__ongoing__ = self._find_ongoing()
+        return self.__ongoing__
+    
+    def _find_ongoing(self) -> Optional[Ongoing]:
         for ddmmyy in reversed(self.keys()):
             day = self[ddmmyy]  # invoke __getitem__ to get constructed Day
             for name in reversed(day.keys()):
                 activity = day[name]
                 if activity.ongoing():
-                    return activity
-        raise ValueError(f'No ongoing activity')
+                    return activity.pointer()
+        return None
     
     def stop(self,
              time: Union[str, XArrow] = None,
@@ -0,0 +1,55 @@
+"""
+Persisted pointer to the ongoing entry: ~/.cache/timefred/<sheet stem>.ongoing
+
+So `tf on`, `tf stop` and `tf status` don't have to scan the days in reverse to find the ongoing activity.
+Keyed by the sheet's SheetStat (a partitioned sheet's is PartitionedStore._sheet_stat); when stale, `Store.load` scans once and rewrites it.
+
+Layout: {"mtime_ns": int, "size": int, "ongoing": null | [day, activity, entry index]}
+"""
+import json
+from pathlib import Path
+from typing import Optional, Union
+
+from timefred.log import log
+from timefred.space.field import UNSET, UNSET_TYPE
+from timefred.store.models import Ongoing
+from timefred.store.sidecar import SheetStat, sidecar_path
+
+
+def read_ongoing(sheet_path: Path, stat: Optional[SheetStat] = None) -> Union[Optional[Ongoing], UNSET_TYPE]:
+    """
+    Args:
+        stat: The sheet's current stat, if it isn't `sheet_path`'s (e.g a partitioned sheet's). Defaults to `SheetStat.of(sheet_path)`.
+    Returns:
+        The persisted pointer (None if nothing is ongoing), or UNSET if it's missing, stale or corrupt.
+    """
+    ongoing_path = sidecar_path(sheet_path, '.ongoing')
+    try:
+        data = json.loads(ongoing_path.read_bytes())
+        if stat is None:
+            stat = SheetStat.of(sheet_path)
+        if SheetStat(data['mtime_ns'], data['size']) != stat:
+            return UNSET
+        if data['ongoing'] is None:
+            return None
+        day, activity, entry = data['ongoing']
+        return Ongoing(day, activity, int(entry))
+    except FileNotFoundError:
+        return UNSET
+    except (ValueError, TypeError, KeyError) as e:
+        log.warning(f'Corrupt ongoing pointer {ongoing_path}, ignoring: {e.__class__.__qualname__}: {e}')
+        return UNSET
+
+
+def write_ongoing(sheet_path: Path, ongoing: Optional[Ongoing], stat: Optional[SheetStat] = None) -> bool:
+    """`stat` is as in `read_ongoing`."""
+    ongoing_path = sidecar_path(sheet_path, '.ongoing')
+    if stat is None:
+        stat = SheetStat.of(sheet_path)
+    data = {'mtime_ns': stat.mtime_ns, 'size': stat.size, 'ongoing': ongoing}
+    try:
+        ongoing_path.write_text(json.dumps(data))
+        return True
+    except OSError as e:
+        log.warning(f'Failed writing ongoing pointer {ongoing_path}: {e}')
+        return False
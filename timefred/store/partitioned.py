@@ -0,0 +1,167 @@
+"""
+Partitioned sheet: a directory with one TOML file per month, used when the sheet's path is such a directory,
+an empty one, or one that doesn't exist yet (e.g TIMEFRED_SHEET=~/timefred):
+
+    ~/timefred/2021-11.toml
+    ~/timefred/2021-12.toml
+
+Each day is stored in the partition of its month, so `Work[DDMMYY]` reads only that partition (see SheetSource),
+and `tf log` only the partitions its period spans. `dump` rewrites only the partitions whose days changed,
+so past months are never rewritten.
+
+`tf store migrate ~/timefred-sheet.toml ~/timefred` splits a single-file sheet into partitions.
+"""
+import re
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Optional
+
+from timefred.space.field import UNSET
+from timefred.store.index import SheetIndex
+from timefred.store.lazy import SheetSource, UnparsedDay
+from timefred.store.models import Day, Work
+from timefred.store.ongoing import read_ongoing, write_ongoing
+from timefred.store.sidecar import SheetStat, sidecar_path
+from timefred.store.store import Store
+from timefred.time.timeutils import parse_date
+
+UNDATED = 'undated'
+"""Partition of days whose keys aren't dates"""
+PARTITION_RE = re.compile(rf'(\d{{4}}-\d{{2}}|{UNDATED})\.toml')
+"""'2021-12.toml' or 'undated.toml'. Other files in the directory (e.g a README) are left alone."""
+
+
+def is_partitioned_path(path) -> bool:
+    """A directory that is empty or has partitions, or a path that doesn't exist and has no suffix"""
+    path = Path(path)
+    if not path.exists():
+        return not path.suffix
+    if not path.is_dir():
+        return False
+    children = list(path.iterdir())
+    return not children or any(PARTITION_RE.fullmatch(child.name) for child in children)
+
+
+def partition_name(ddmmyy: str) -> str:
+    """
+    >>> partition_name('23/12/21')
+    '2021-12'
+    """
+    date = parse_date(ddmmyy)
+    if date is None:
+        return UNDATED
+    return f'{date.year:04}-{date.month:02}'
+
+
+class PartitionedStore(Store):
+    def partition_path(self, ddmmyy: str) -> Path:
+        return self.path / f'{partition_name(ddmmyy)}.toml'
+
+    def partitions(self) -> list[Path]:
+        """In chronological order, so the days are too"""
+        if not self.path.is_dir():
+            return []
+        return sorted(path for path in self.path.glob('*.toml') if PARTITION_RE.fullmatch(path.name))
+
+    def _sheet_stat(self) -> Optional[SheetStat]:
+        """The partitions' latest mtime and total size, so editing any partition in place changes it"""
+        stats = [stat for stat in map(SheetStat.of, self.partitions()) if stat is not None]
+        if not stats:
+            return None
+        return SheetStat(max(stat.mtime_ns for stat in stats), sum(stat.size for stat in stats))
+
+    def _resident_key(self) -> tuple[Optional[SheetStat], Optional[SheetStat]]:
+        """Like Store._resident_key, with _sheet_stat as the sheet's stat"""
+        return self._sheet_stat(), SheetStat.of(self.journal.path)
+
+    def _sidecar_name(self, partition: Path) -> Path:
+        """~/timefred/2021-12.toml -> timefred-2021-12, so partitions of different sheets don't share backups"""
+        return Path(f'{self.path.name}-{partition.stem}')
+
+    def _backup_path(self, name_suffix='', sheet_path: Path = None) -> Path:
+        if sheet_path is None or sheet_path == self.path:
+            return super()._backup_path(name_suffix)
+        return super()._backup_path(name_suffix, self._sidecar_name(sheet_path))
+
+    def load(self, lazy: bool = None) -> Work:
+        """
+        Args:
+            lazy: Only read and parse the days that are accessed. Defaults to `config.sheet.lazy`.
+              Either way, days are indexed lazily first, so `dump` can tell which partitions changed.
+        """
+        from timefred.config import config
+        if lazy is None:
+            lazy = config.sheet.lazy
+
+        if self._keeps_resident:
+            resident_key = self._resident_key()
+            if self._resident is not None and self._resident[0] == resident_key:
+                return self._resident[1]
+
+        # See Store.load
+        with self.journal.locked_if_exists(shared=True):
+            days = {}
+            for partition in self.partitions():
+                index_path = sidecar_path(partition, '.index')
+                index = SheetIndex.load(partition, index_path)
+                if index.sections is None:
+                    days.update(self.codec.loads(partition.read_text()))
+                    continue
+                # Opened only when one of its days is accessed
+                source = SheetSource(partition, index.stat)
+                days.update({key: UnparsedDay(key, source, ranges) for key, ranges in index.sections.items()})
+            work = Work(**days)
+            if not lazy:
+                work.hydrate()
+
+            if work.__ongoing__ is UNSET:
+                sheet_stat = self._sheet_stat()
+                if sheet_stat is not None:
+                    work.__ongoing__ = read_ongoing(self.path, sheet_stat)
+            work = self.journal.replay(work)
+        if self._keeps_resident:
+            self._remember_resident(resident_key, work)
+        return work
+
+    def dump(self, data: Work) -> bool:
+        """Rewrites only the partitions with changed days. Removes the partitions `data` has no days of."""
+        from os import getenv
+        if getenv('TIMEFRED_DRYRUN', "").lower() in ('1', 'true', 'yes'):
+            print('\n\tDRY RUN, NOT DUMPING\n', data)
+            return True
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        partitions: dict[Path, dict] = {}
+        for key, day in dict.items(data):
+            partitions.setdefault(self.partition_path(key), {})[key] = day
+        with self.journal.locked_if_exists():
+            for partition, days in partitions.items():
+                if partition.exists() and not any(map(_changed, dict.values(days))):
+                    continue
+                # Unparsed days keep reading from the replaced partition through their SheetSource's open handle.
+                text = self._dumps(days)
+                if partition.exists():
+                    self._rotate_backup(partition)
+                self._write_atomically(text, partition)
+            for partition in self.partitions():
+                if partition not in partitions:
+                    self._rotate_backup(partition)
+                    partition.unlink()
+            self.journal.clear()
+
+        resident_key = self._resident_key()
+        sheet_stat = resident_key[0]
+        ongoing = getattr(data, '__ongoing__', UNSET)
+        if ongoing is not UNSET and sheet_stat is not None:
+            write_ongoing(self.path, ongoing, sheet_stat)
+        if isinstance(data, Work):
+            self._remember_resident(resident_key, data)
+        return True
+
+
+def _changed(day: Optional[Mapping]) -> bool:
+    if isinstance(day, UnparsedDay):
+        return False
+    if isinstance(day, Day):
+        return day.changed()
+    return True
@@ -0,0 +1,32 @@
+"""
+Sidecar files are derived from the sheet and live in TIMEFRED_CACHE_DIR = ~/.cache/timefred.
+They are keyed by the sheet's SheetStat, and are stale as soon as the sheet changes.
+"""
+import hashlib
+import os
+from pathlib import Path
+from typing import NamedTuple, Optional, Union
+
+
+class SheetStat(NamedTuple):
+    mtime_ns: int
+    size: int
+
+    @classmethod
+    def of(cls, path_or_fd: Union[Path, int]) -> Optional["SheetStat"]:
+        try:
+            stat = os.stat(path_or_fd)
+        except FileNotFoundError:
+            return None
+        return cls(stat.st_mtime_ns, stat.st_size)
+
+
+def sidecar_path(sheet_path: Path, suffix: str) -> Path:
+    """
+    Named after the sheet's stem and a hash of its resolved path (~/.cache/timefred/timefred-sheet-<8 hex digits>.index),
+    so sheets with the same name, like ~/timefred-sheet.toml and /tmp/timefred-sheet.toml, don't share sidecars.
+    """
+    from timefred.config import config
+    sheet_path = Path(sheet_path).expanduser().resolve()
+    path_hash = hashlib.blake2b(str(sheet_path).encode(), digest_size=4).hexdigest()
+    return config.cache.path / f'{sheet_path.stem}-{path_hash}{suffix}'
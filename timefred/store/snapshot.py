@@ -0,0 +1,71 @@
+"""
+Pickled snapshot of the parsed Work: ~/.cache/timefred/<sheet stem>.snapshot
+
+Keyed by the sheet's SheetStat and content digest. When the sheet hasn't changed, `Store.load`
+unpickles the snapshot instead of parsing the TOML and casting every field.
+
+Layout: magic (4s) | version (B) | sheet mtime_ns (q) | sheet size (q) | sheet blake2b digest (32s) | pickled Work
+"""
+import hashlib
+import pickle
+import struct
+from pathlib import Path
+from typing import Optional
+
+from timefred.log import log
+from timefred.store.models import Work
+from timefred.store.sidecar import SheetStat, sidecar_path
+
+MAGIC = b'TFSS'
+VERSION = 2
+"""Bump when the pickled classes change in an incompatible way"""
+
+HEADER = struct.Struct('<4sBqq32s')
+
+
+def digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=32).digest()
+
+
+def load_snapshot(sheet_path: Path) -> Optional[Work]:
+    """
+    Returns:
+        The snapshotted Work, or None if the snapshot is missing, stale or corrupt.
+    """
+    snapshot_path = sidecar_path(sheet_path, '.snapshot')
+    try:
+        with snapshot_path.open('rb') as f:
+            header = f.read(HEADER.size)
+            magic, version, mtime_ns, size, sheet_digest = HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION:
+                return None
+            if SheetStat(mtime_ns, size) != SheetStat.of(sheet_path):
+                return None
+            if sheet_digest != digest(sheet_path.read_bytes()):
+                return None
+            work = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        log.warning(f'Corrupt snapshot {snapshot_path}, ignoring: {e.__class__.__qualname__}: {e}')
+        return None
+    if not isinstance(work, Work):
+        log.warning(f'Corrupt snapshot {snapshot_path}, ignoring: unpickled a {type(work)}')
+        return None
+    return work
+
+
+def write_snapshot(sheet_path: Path, data: bytes, work: Work) -> bool:
+    """`data` is what `work` was loaded from / dumped to, i.e the contents of `sheet_path`."""
+    snapshot_path = sidecar_path(sheet_path, '.snapshot')
+    stat = SheetStat.of(sheet_path)
+    header = HEADER.pack(MAGIC, VERSION, stat.mtime_ns, stat.size, digest(data))
+    try:
+        # Cast everything first, so it's pickled already cast
+        payload = pickle.dumps(work.hydrate(), protocol=pickle.HIGHEST_PROTOCOL)
+        snapshot_path.write_bytes(header + payload)
+        return True
+    except Exception as e:
+        log.warning(f'Failed writing snapshot {snapshot_path}: {e.__class__.__qualname__}: {e}')
+        snapshot_path.unlink(True)
+        return False
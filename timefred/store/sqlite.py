@@ -0,0 +1,290 @@
+"""
+SQLite-backed Store, used when the sheet's path ends with .db, .sqlite or .sqlite3 (e.g TIMEFRED_SHEET=~/timefred.db).
+
+Instead of rewriting the whole sheet, `commit` writes only the entries a mutation touched, one row each.
+`load` builds the same Work as the TOML sheet would, from one query per table, and reads the ongoing pointer
+with a query instead of scanning the days.
+
+Tables mirror the TOML sheet:
+    days        key ('DD/MM/YY'), ordinal (date.toordinal(), for ordering and ranges)
+    activities  day_id, position (in the day), name
+    entries     activity_id, position (in the activity), start_time, end_time ('HH:mm:ss'), jira, synced
+    tags        entry_id, position, tag
+    notes       entry_id, position, time ('HH:mm:ss'), content
+
+`tf store migrate <source> <destination>` converts between this and the TOML sheet.
+"""
+import sqlite3
+from collections.abc import Iterator, Mapping
+from contextlib import closing, contextmanager
+from datetime import time as dt_time
+from os import getenv
+from typing import Optional, Union
+
+from timefred.note import Note
+from timefred.store.journal import Mutation
+from timefred.store.models import Work, CompactEntry, Ongoing
+from timefred.store.store import Store
+from timefred.time import XArrow
+from timefred.time.timeutils import parse_date
+
+SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS days (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    ordinal INTEGER
+);
+CREATE INDEX IF NOT EXISTS days_by_date ON days (ordinal);
+
+CREATE TABLE IF NOT EXISTS activities (
+    id INTEGER PRIMARY KEY,
+    day_id INTEGER NOT NULL REFERENCES days (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    UNIQUE (day_id, name)
+);
+CREATE INDEX IF NOT EXISTS activities_by_name ON activities (name);
+
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    activity_id INTEGER NOT NULL REFERENCES activities (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time TEXT,
+    jira TEXT,
+    synced INTEGER,
+    UNIQUE (activity_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS tags (
+    entry_id INTEGER NOT NULL REFERENCES entries (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (entry_id, position)
+);
+CREATE INDEX IF NOT EXISTS tags_by_tag ON tags (tag);
+
+CREATE TABLE IF NOT EXISTS notes (
+    entry_id INTEGER NOT NULL REFERENCES entries (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    time TEXT NOT NULL,
+    content TEXT NOT NULL,
+    PRIMARY KEY (entry_id, position)
+);
+'''
+
+ONGOING_QUERY = '''
+SELECT days.key, activities.name, entries.position
+FROM entries
+JOIN activities ON activities.id = entries.activity_id
+JOIN days ON days.id = activities.day_id
+WHERE entries.end_time IS NULL
+  AND entries.position = (SELECT MAX(position) FROM entries AS last WHERE last.activity_id = activities.id)
+ORDER BY days.ordinal DESC, days.id DESC, activities.position DESC
+LIMIT 1
+'''
+"""Like Work._find_ongoing: the latest activity whose last entry has no end"""
+
+
+def is_sqlite_path(path) -> bool:
+    return str(path).lower().endswith(SUFFIXES)
+
+
+def time_text(value: Union[XArrow, dt_time, str]) -> str:
+    if isinstance(value, XArrow):
+        return value.HHmmss
+    if isinstance(value, dt_time):
+        return value.strftime('%H:%M:%S')
+    return str(value)
+
+
+def time_value(text: str) -> Union[dt_time, str]:
+    """What the TOML sheet would load: a datetime.time if `text` is a time, otherwise the str itself."""
+    try:
+        return dt_time.fromisoformat(text)
+    except ValueError:
+        return text
+
+
+def raw_entries(activity) -> Iterator[Mapping]:
+    """The raw entries of an Activity, a list of raw entries, or the shorthand `"Got to office" = "09:40"`"""
+    if not isinstance(activity, list):
+        yield {'start': activity}
+        return
+    for entry in list.__iter__(activity):
+        yield entry.to_raw() if isinstance(entry, CompactEntry) else entry
+
+
+def entry_row(raw: Mapping) -> tuple[tuple, list[str], list[tuple[str, str]]]:
+    """
+    Returns:
+        (start_time, end_time, jira, synced), tags, [(time, content), ...]
+    """
+    get = dict.get if isinstance(raw, dict) else type(raw).get
+    end = get(raw, 'end')
+    jira = get(raw, 'jira')
+    synced = get(raw, 'synced')
+    tags = get(raw, 'tags') or ()
+    if isinstance(tags, str):
+        tags = [tags]
+    notes = get(raw, 'notes') or ()
+    if isinstance(notes, Mapping):
+        # notes = { "10:20:00" = "..." }
+        notes = [notes]
+    note_rows = []
+    for note in notes:
+        if isinstance(note, Note):
+            note_rows.append((note.time.HHmmss, note.content))
+        else:
+            note_rows.extend((time_text(time), content) for time, content in note.items())
+    row = (time_text(get(raw, 'start')),
+           time_text(end) if end else None,
+           str(jira) if jira else None,
+           None if synced is None else int(bool(synced)))
+    return row, [str(tag) for tag in tags if tag], note_rows
+
+
+class SqliteStore(Store):
+    @contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        """A connection whose `with` block is a single transaction."""
+        with closing(sqlite3.connect(self.path)) as db:
+            db.execute('PRAGMA foreign_keys = ON')
+            db.executescript(SCHEMA)
+            with db:
+                yield db
+
+    def load(self, lazy: bool = None) -> Work:
+        """`lazy` is ignored; loading reads one query per table."""
+        if self._keeps_resident:
+            resident_key = self._resident_key()
+            if self._resident is not None and self._resident[0] == resident_key:
+                return self._resident[1]
+        with self.connect() as db:
+            work = Work(**self._select(db))
+            ongoing = db.execute(ONGOING_QUERY).fetchone()
+        work.__ongoing__ = Ongoing(*ongoing) if ongoing else None
+        if self._keeps_resident:
+            self._remember_resident(self._resident_key(), work)
+        return work
+
+    @staticmethod
+    def _select(db: sqlite3.Connection) -> dict:
+        """The raw sheet, as the TOML sheet would load it"""
+        data = {}
+        days = {}
+        for day_id, key in db.execute('SELECT id, key FROM days ORDER BY ordinal, id'):
+            days[day_id] = data[key] = {}
+        activities = {}
+        for activity_id, day_id, name in db.execute('SELECT id, day_id, name FROM activities ORDER BY day_id, position'):
+            activities[activity_id] = days[day_id][name] = []
+        entries = {}
+        for entry_id, activity_id, start, end, jira, synced in db.execute(
+                'SELECT id, activity_id, start_time, end_time, jira, synced FROM entries ORDER BY activity_id, position'):
+            raw = {'start': time_value(start)}
+            if end is not None:
+                raw['end'] = time_value(end)
+            if jira is not None:
+                raw['jira'] = jira
+            if synced is not None:
+                raw['synced'] = bool(synced)
+            entries[entry_id] = raw
+            activities[activity_id].append(raw)
+        for entry_id, tag in db.execute('SELECT entry_id, tag FROM tags ORDER BY entry_id, position'):
+            entries[entry_id].setdefault('tags', []).append(tag)
+        for entry_id, time, content in db.execute('SELECT entry_id, time, content FROM notes ORDER BY entry_id, position'):
+            entries[entry_id].setdefault('notes', []).append({time: content})
+        return data
+
+    def dump(self, data: Work) -> bool:
+        """Replaces everything. Prefer `commit`, which writes only what changed."""
+        if getenv('TIMEFRED_DRYRUN', "").lower() in ('1', 'true', 'yes'):
+            print('\n\tDRY RUN, NOT DUMPING\n', data)
+            return True
+        with self.connect() as db:
+            db.execute('DELETE FROM days')
+            for key, day in dict.items(data):
+                day_id = self._day_id(db, key)
+                day_items = dict.items(day) if isinstance(day, dict) else day.items()
+                for position, (name, activity) in enumerate(day_items):
+                    activity_id = self._activity_id(db, day_id, str(name), position)
+                    for entry_position, raw in enumerate(raw_entries(activity)):
+                        self._write_entry_row(db, activity_id, entry_position, raw)
+        if isinstance(data, Work):
+            self._remember_resident(self._resident_key(), data)
+        return True
+
+    def commit(self, work: Work, *mutations: Mutation) -> bool:
+        """Writes only the entries that `mutations` touched, which were already applied to `work`."""
+        if not mutations:
+            return self.dump(work)
+        if getenv('TIMEFRED_DRYRUN', "").lower() in ('1', 'true', 'yes'):
+            print('\n\tDRY RUN, NOT COMMITTING\n', *map(Mutation.dumps, mutations))
+            return True
+        try:
+            with self.connect() as db:
+                for mutation in mutations:
+                    for pointer in self._touched(db, work, mutation):
+                        self._write_entry(db, work, pointer)
+        except sqlite3.Error as e:
+            from timefred.log import log
+            log.error(f'Failed committing {len(mutations)} mutation(s) to {self.path}: {e}')
+            self.forget_resident()
+            return False
+        self._remember_resident(self._resident_key(), work)
+        return True
+
+    def compact(self) -> bool:
+        """Nothing to compact; commits are already in place."""
+        return True
+
+    @staticmethod
+    def _touched(db: sqlite3.Connection, work: Work, mutation: Mutation) -> list[Ongoing]:
+        if mutation.op in ('start', 'stop'):
+            # What was ongoing before `mutation` was applied, which start and stop end
+            touched = [Ongoing(*previously_ongoing)] if (previously_ongoing := db.execute(ONGOING_QUERY).fetchone()) else []
+            if mutation.op == 'start':
+                touched.append(work.ongoing_pointer())
+            return touched
+        return [Ongoing(mutation.day, str(mutation.activity), mutation.entry)]
+
+    def _write_entry(self, db: sqlite3.Connection, work: Work, pointer: Ongoing) -> None:
+        day_key, name, index = pointer
+        day = work[day_key]
+        activity = day[name]
+        position = index % len(activity)
+        day_id = self._day_id(db, day_key)
+        activity_id = self._activity_id(db, day_id, name, list(day.keys()).index(name))
+        raw = list.__getitem__(activity, position)
+        self._write_entry_row(db, activity_id, position, raw.to_raw() if isinstance(raw, CompactEntry) else raw)
+
+    @staticmethod
+    def _day_id(db: sqlite3.Connection, key: str) -> int:
+        date = parse_date(key)
+        db.execute('INSERT INTO days (key, ordinal) VALUES (?, ?) ON CONFLICT (key) DO NOTHING',
+                   (key, date.toordinal() if date else None))
+        return db.execute('SELECT id FROM days WHERE key = ?', (key,)).fetchone()[0]
+
+    @staticmethod
+    def _activity_id(db: sqlite3.Connection, day_id: int, name: str, position: int) -> int:
+        db.execute('INSERT INTO activities (day_id, position, name) VALUES (?, ?, ?) ON CONFLICT (day_id, name) DO NOTHING',
+                   (day_id, position, name))
+        return db.execute('SELECT id FROM activities WHERE day_id = ? AND name = ?', (day_id, name)).fetchone()[0]
+
+    @staticmethod
+    def _write_entry_row(db: sqlite3.Connection, activity_id: int, position: int, raw: Mapping) -> Optional[int]:
+        row, tags, notes = entry_row(raw)
+        db.execute('INSERT INTO entries (activity_id, position, start_time, end_time, jira, synced) VALUES (?, ?, ?, ?, ?, ?) '
+                   'ON CONFLICT (activity_id, position) DO UPDATE SET '
+                   'start_time = excluded.start_time, end_time = excluded.end_time, jira = excluded.jira, synced = excluded.synced',
+                   (activity_id, position, *row))
+        entry_id = db.execute('SELECT id FROM entries WHERE activity_id = ? AND position = ?', (activity_id, position)).fetchone()[0]
+        db.execute('DELETE FROM tags WHERE entry_id = ?', (entry_id,))
+        db.executemany('INSERT INTO tags (entry_id, position, tag) VALUES (?, ?, ?)',
+                       [(entry_id, tag_position, tag) for tag_position, tag in enumerate(tags)])
+        db.execute('DELETE FROM notes WHERE entry_id = ?', (entry_id,))
+        db.executemany('INSERT INTO notes (entry_id, position, time, content) VALUES (?, ?, ?, ?)',
+                       [(entry_id, note_position, time, content) for note_position, (time, content) in enumerate(notes)])
+        return entry_id
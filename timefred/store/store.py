@@ -1,31 +1,32 @@
+import errno
 import logging
 import os
 import shutil
+import stat
 import sys
+import tempfile
+import time
+from contextlib import suppress
+from functools import cached_property
 from os import path, getenv
 from pathlib import Path
-
-import toml
+from typing import Mapping, Optional
 
 from timefred.singleton import Singleton
 from timefred.space import Field, Space
-from timefred.store import Work
-from timefred.time import XArrow
+from timefred.space.field import UNSET
+from timefred.store import Work, Day
+from timefred.store.codec import Codec, TomlEncoder, get_codec
+from timefred.store.journal import Journal, Mutation
+from timefred.store.index import SheetIndex
+from timefred.store.lazy import lazy_work, SheetSource, UnparsedDay
+from timefred.store.ongoing import read_ongoing, write_ongoing
+from timefred.store.sidecar import SheetStat
 
 
 # class StoreCache:
 #     data: defaultdict[str, Day] = Field(default_factory=lambda **kwargs: defaultdict(Day, **kwargs))
 
-class TomlEncoder(toml.TomlEncoder):
-    def __init__(self, _dict=dict, preserve=False):
-        super().__init__(_dict, preserve)
-        self.dump_funcs.update({
-            # AttrDictSpace: dict,
-            # Colored: lambda colored: repr(str(colored)),
-            XArrow: lambda xarrow: xarrow.HHmmss,
-            })
-
-
 # str:      Day {
 #   str:        Activity[Entry, Entry, ...]
 # {'26/10/21': {'Got to office': [{'start': '08:20:00'}]}}
@@ -42,75 +43,273 @@ class TomlEncoder(toml.TomlEncoder):
 class Store(Space):
     # cache: StoreCache = Field(default_factory=StoreCache)
     path: Path = Field(cast=Path)
-    encoder: TomlEncoder = Field(default_factory=TomlEncoder)
+    codec: Codec = Field(default_factory=get_codec)
+    """Defaults to config.sheet.codec (see timefred.store.codec)"""
+    _keeps_resident: bool = False
+    _resident: Optional[tuple[tuple, Work]] = None
+    """(key, work), see keep_resident"""
     
     # def __init__(self, path):
     #     # self.encoder = TomlEncoder()
     #     self.path = Path(path)
     #     # super().__init__(path=Path(path))
     
-    def load(self) -> Work:
+    @cached_property
+    def journal(self) -> Journal:
+        """~/timefred-sheet.journal"""
+        return Journal(path=self.path.with_suffix('.journal'))
+    
+    @staticmethod
+    def of(path) -> "Store":
+        """
+        A SqliteStore if `path` ends with .db, .sqlite or .sqlite3 (see timefred.store.sqlite),
+        a PartitionedStore if it's a directory of partitions, an empty one, or doesn't exist and has no suffix
+        (see timefred.store.partitioned),
+        otherwise a TOML Store.
+        """
+        from timefred.store.sqlite import SqliteStore, is_sqlite_path
+        if is_sqlite_path(path):
+            return SqliteStore(path=path)
+        from timefred.store.partitioned import PartitionedStore, is_partitioned_path
+        if is_partitioned_path(path):
+            return PartitionedStore(path=path)
+        return Store(path=path)
+    
+    def keep_resident(self) -> None:
+        """Makes `load` return the same Work as long as the sheet and the journal haven't changed (see timefred.daemon).
+        Callers that change the Work without `dump`ing or `commit`ing it must `forget_resident()`."""
+        self._keeps_resident = True
+    
+    def forget_resident(self) -> None:
+        self._resident = None
+    
+    def _resident_key(self) -> tuple[Optional[SheetStat], Optional[SheetStat]]:
+        return SheetStat.of(self.path), SheetStat.of(self.journal.path)
+    
+    def _remember_resident(self, key: tuple, work: Work) -> None:
+        if self._keeps_resident:
+            self._resident = (key, work)
+    
+    def load(self, lazy: bool = None) -> Work:
+        """
+        Args:
+            lazy: Only parse the days that are accessed. Defaults to `config.sheet.lazy`.
+              Ignored if `config.sheet.snapshot` is on.
+        """
         # perf: 150ms?
         # if self.cache.data:
         #     return self.cache.data
+        from timefred.config import config
+        if lazy is None:
+            lazy = config.sheet.lazy
         
+        if self._keeps_resident:
+            resident_key = self._resident_key()
+            if self._resident is not None and self._resident[0] == resident_key:
+                return self._resident[1]
+        
+        # Shared, so a concurrent dump can't replace the sheet and clear the journal in between,
+        # which would replay the journal on top of a sheet that already reflects it
+        with self.journal.locked_if_exists(shared=True):
+            work = self._read(lazy)
+            work = self.journal.replay(work)
+        if self._keeps_resident:
+            self._remember_resident(resident_key, work)
+        return work
+    
+    def _read(self, lazy: bool) -> Work:
+        """The sheet, without the journal"""
+        from timefred.config import config
         if self.path.exists():
-            with self.path.open() as f:
-                data = toml.load(f)
+            work = None
+            if config.sheet.snapshot:
+                from timefred.store.snapshot import load_snapshot
+                work = load_snapshot(self.path)
+            elif lazy:
+                source = SheetSource(self.path)
+                sections = SheetIndex.load(source.file).sections
+                if sections is not None:
+                    work = lazy_work(sections, source)
+            if work is None:
+                raw_data = self.path.read_bytes()
+                data = self.codec.loads(raw_data.decode())
+                
+                if not data:
+                    data = {}
+                work = Work(**data)
+                if config.sheet.snapshot:
+                    from timefred.store.snapshot import write_snapshot
+                    write_snapshot(self.path, raw_data, work)
             
-            if not data:
-                data = {}
+            if work.__ongoing__ is UNSET:
+                work.__ongoing__ = read_ongoing(self.path)
+                # The sheet changed outside of Store.dump. Scan once, unless that would parse lazily loaded days,
+                # in which case Work.ongoing_activity() scans on demand and the next dump persists the pointer.
+                if work.__ongoing__ is UNSET and not any(isinstance(day, UnparsedDay) for day in dict.values(work)):
+                    write_ongoing(self.path, work.ongoing_pointer())
         
         else:
             data = {}
-            with self.path.open('w') as f:
-                toml.dump(data, f)
-        # self.cache.data = data
-        return Work(**data)
+            self.path.write_text(self.codec.dumps(data))
+            work = Work(**data)
+        return work
     
-    def _backup(self, name_suffix='') -> bool:
-        """Backs up to TIMEFRED_CACHE_DIR = ~/.cache/timefred"""
-        from timefred.config import config
-        destination = (config.cache.path / self.path.name)
-        destination_name = self.path.stem + name_suffix + '.backup'
-        destination = destination.with_name(destination_name)
+    def columns(self) -> "Columns":
+        """The columnar view of the loaded Work (see timefred.store.columns), cached until the sheet or journal change."""
+        from timefred.store.columns import Columns, load_columns, write_columns
+        key = self._resident_key()
+        columns = load_columns(self.path, key)
+        if columns is None:
+            columns = Columns.build(self.load(), key)
+            write_columns(self.path, columns)
+        return columns
+    
+    def _backup(self, name_suffix='', sheet_path: Path = None) -> bool:
+        """Copies the sheet (or `sheet_path`) to TIMEFRED_CACHE_DIR = ~/.cache/timefred"""
+        sheet_path = sheet_path or self.path
+        destination = self._backup_path(name_suffix, sheet_path)
         try:
-            shutil.copyfile(self.path, destination)
+            shutil.copyfile(sheet_path, destination)
             return True
         except Exception as e:
-            logging.error(f'Failed copying {self.path} to {destination}', exc_info=True)
+            logging.error(f'Failed copying {sheet_path} to {destination}', exc_info=True)
             return False
     
-    def _restore_from_backup(self, name_suffix='') -> bool:
+    def _backup_path(self, name_suffix='', sheet_path: Path = None) -> Path:
         from timefred.config import config
-        destination = (config.cache.path / self.path.name).with_name(self.path.stem + name_suffix + '.backup')
+        return config.cache.path / ((sheet_path or self.path).stem + name_suffix + '.backup')
+    
+    def _rotate_backup(self, sheet_path: Path = None) -> None:
+        """
+        Points the backup at the sheet that's about to be replaced, without copying it: a hard link keeps the previous
+        version around once the new one is renamed over it. If the cache dir is on another filesystem, copies instead,
+        at most once every `config.sheet.backup_interval` seconds.
+        """
+        sheet_path = sheet_path or self.path
+        destination = self._backup_path(sheet_path=sheet_path)
+        temp_link = destination.with_name(destination.name + '.tmp')
         try:
-            shutil.move(destination, self.path)
-            return True
-        except Exception as e:
-            logging.error(f'Failed moving {destination} to {self.path}', exc_info=True)
-            return False
+            temp_link.unlink(missing_ok=True)
+            # os.link doesn't follow symlinks, so a symlinked sheet would be backed up as the link itself
+            os.link(sheet_path.resolve(), temp_link)
+            os.replace(temp_link, destination)
+            return
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                logging.warning(f'Failed linking {sheet_path} to {destination}: {e}')
+                return
+        from timefred.config import config
+        try:
+            backup_age = time.time() - destination.stat().st_mtime
+        except FileNotFoundError:
+            backup_age = None
+        if backup_age is None or backup_age > config.sheet.backup_interval:
+            self._backup(sheet_path=sheet_path)
+    
+    def _write_atomically(self, text: str, sheet_path: Path = None) -> None:
+        """Writes to a temporary file next to the sheet (or `sheet_path`), fsyncs it, and renames it over the sheet,
+        so the sheet is always either the previous or the new version, even if tf crashes mid-write.
+        If the sheet is a symlink, its target is replaced, so the link stays a link."""
+        sheet_path = (sheet_path or self.path).resolve()
+        fd, temp_path = tempfile.mkstemp(prefix=f'.{sheet_path.name}.', suffix='.tmp', dir=sheet_path.parent)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(text)
+                f.flush()
+                with suppress(FileNotFoundError):
+                    os.fchmod(f.fileno(), stat.S_IMODE(os.stat(sheet_path).st_mode))
+                os.fsync(f.fileno())
+            os.replace(temp_path, sheet_path)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.unlink(temp_path)
+            raise
+        # Persist the rename itself
+        directory_fd = os.open(sheet_path.parent, os.O_RDONLY)
+        try:
+            os.fsync(directory_fd)
+        finally:
+            os.close(directory_fd)
     
     def dump(self, data: Work) -> bool:
         if getenv('TIMEFRED_DRYRUN', "").lower() in ('1', 'true', 'yes'):
             print('\n\tDRY RUN, NOT DUMPING\n', data)
             return True
         
-        if not self.path.exists():
-            with self.path.open('w') as f:
-                toml.dump({}, f, self.encoder)
+        # Unparsed days keep reading from the replaced sheet through their SheetSource's open handle.
+        text = self._dumps(data)
+        with self.journal.locked_if_exists():
+            if self.path.exists():
+                self._rotate_backup()
+            self._write_atomically(text)
+            # The sheet now reflects everything the journal did
+            self.journal.clear()
         
-        if not self._backup():
+        ongoing = getattr(data, '__ongoing__', UNSET)
+        if ongoing is not UNSET:
+            write_ongoing(self.path, ongoing)
+        if isinstance(data, Work):
+            self._remember_resident(self._resident_key(), data)
+        from timefred.config import config
+        if config.sheet.snapshot and not any(isinstance(day, UnparsedDay) for day in dict.values(data)):
+            from timefred.store.snapshot import write_snapshot
+            write_snapshot(self.path, text.encode(), data)
+        return True
+    
+    def _dumps(self, work: Mapping) -> str:
+        """Days that were lazily loaded and are unchanged (never accessed, or see Day.changed) are written back verbatim,
+        so only the changed days are serialized."""
+        if not any(isinstance(day, UnparsedDay) or getattr(day, '__unparsed__', None) is not None
+                   for day in dict.values(work)):
+            return self.codec.dumps(work)
+        sections = []
+        for key, day in dict.items(work):
+            if isinstance(day, UnparsedDay):
+                raw = day.raw.decode()
+            elif isinstance(day, Day) and not day.changed():
+                raw = day.__unparsed__.raw.decode()
+            else:
+                sections.append(self.codec.dumps({key: day}))
+                continue
+            sections.append(raw if raw.endswith('\n') else raw + '\n')
+        return ''.join(sections)
+    
+    def commit(self, work: Work, *mutations: Mutation) -> bool:
+        """Persists `mutations`, which were already applied to `work`.
+        In journal mode, only appends `mutations` to the journal. Otherwise, dumps `work` entirely."""
+        from timefred.config import config
+        if not config.sheet.journal or not mutations:
+            return self.dump(work)
+        
+        if getenv('TIMEFRED_DRYRUN', "").lower() in ('1', 'true', 'yes'):
+            print('\n\tDRY RUN, NOT JOURNALING\n', *map(Mutation.dumps, mutations))
+            return True
+        
+        if not self.journal.append(*mutations):
+            self.forget_resident()
             return False
-        try:
-            with self.path.open('w') as f:
-                toml.dump(data, f, self.encoder)
+        self._remember_resident(self._resident_key(), work)
+        if self.journal.size() > config.sheet.journal_max_size:
+            self._compact_in_background()
+        return True
+    
+    def compact(self) -> bool:
+        """Folds the journal into the sheet."""
+        if not self.journal.size():
             return True
-        except Exception as e:
-            logging.error(e, exc_info=True)
-            if self._restore_from_backup():
-                print(f'Restored sheet backup', file=sys.stderr)
-            raise
+        with self.journal.locked():
+            work = self.load()
+            return self.dump(work)
+    
+    def _compact_in_background(self) -> None:
+        import subprocess
+        env = {**os.environ, 'TIMEFRED_SHEET': str(self.path)}
+        subprocess.Popen([sys.executable, '-m', 'timefred', 'store', 'compact'],
+                         env=env,
+                         stdin=subprocess.DEVNULL,
+                         stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL,
+                         start_new_session=True)
 
 # breaks testutils.temp_sheet
 # if os.getenv('TIMEFRED_NO_PROXIES', '').lower() in ('1', 'true'):
@@ -126,7 +325,7 @@ class StoreProxy(Singleton):
             return self._store
         if self._store is None:
             from timefred.config import config
-            self._store = Store(path=path.expanduser(config.sheet.path))
+            self._store = Store.of(path.expanduser(config.sheet.path))
         return getattr(self._store, name)
 
 
@@ -1,14 +1,12 @@
 # from dataclasses import dataclass, field
 from datetime import timedelta
-from collections.abc import Iterator
+from collections.abc import Iterator, Iterable
 from functools import cached_property
-from typing import Optional
+from typing import Optional, Union
 import os
 
-from multimethod import multimethod
-
 # from pydantic import Field, BaseModel
-from timefred.space import Field, AttrDictSpace, Space, DictSpace
+from timefred.space import Field, DictSpace
 from timefred.time.timeutils import secs2human
 from timefred.time.xarrow import XArrow
 
@@ -32,21 +30,27 @@ class Timespan(DictSpace):
             representation = f'{self.__class__.__qualname__} ({start=!r}, {end=!r}) <{short_id}>'
             return representation
 
-    @multimethod
-    def __radd__(self, other) -> int:
-        other_timedelta = other.timedelta
-        other_total_seconds = other_timedelta.total_seconds()
-        other_total_seconds_int = int(other_total_seconds)
-        return self.__radd__(other_total_seconds_int)
+    def __setattr__(self, name, value):
+        if name in ('start', 'end'):
+            # Invalidate the cached properties that derive from them
+            self.__dict__.pop('timedelta', None)
+            self.__dict__.pop('seconds', None)
+        super().__setattr__(name, value)
+    
+    @classmethod
+    def total(cls, timespans: Iterable[Union["Timespan", int]]) -> int:
+        """Sums the seconds of `timespans` (and ints) in one loop. Prefer over sum(timespans)."""
+        total = 0
+        for timespan in timespans:
+            total += timespan if isinstance(timespan, int) else timespan.seconds
+        return total
+    
+    def __radd__(self, other: Union["Timespan", int]) -> int:
+        """So sum(timespans) works"""
+        if isinstance(other, int):
+            return self.seconds + other
+        return self.seconds + other.seconds
     
-    @multimethod
-    def __radd__(self, other: int) -> int:
-        self_seconds = self.seconds
-        return self_seconds + other
-        # try:
-        #     return self_seconds + int(other.timedelta().total_seconds())
-        # except AttributeError: # other is int
-        #     return self_seconds + other
     def __lt__(self, other):
         return self.start > other.start
     
@@ -62,16 +66,14 @@ class Timespan(DictSpace):
         yield self.start
         yield self.end
 
-    # @cached_property
-    @property
+    @cached_property
     def timedelta(self) -> timedelta:
         if self.end:
             return self.end - self.start
         else:
             return timedelta(seconds=0)
     
-    # @cached_property
-    @property
+    @cached_property
     def seconds(self) -> int:
         td = self.timedelta
         td_total_seconds = td.total_seconds()
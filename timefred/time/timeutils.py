@@ -1,6 +1,9 @@
+import re
+from datetime import date as dt_date, time as dt_time, timedelta
+from typing import Optional
+
 from arrow.locales import EnglishLocale
 
-from timefred.log import log
 from timefred.config import config
 
 if config.time.first_day_of_week == 'monday':
@@ -26,6 +29,91 @@ def isoweekday(day: str) -> int:  # perf: µs
     raise ValueError(f"Unknown day: {day!r}")
 
 
+def is_weekday(day: str) -> bool:  # perf: µs
+    """Whether `isoweekday(day)` would succeed, without raising.
+    >>> is_weekday('thurs'), is_weekday('t'), is_weekday('09:45')
+    (True, False, False)
+    """
+    day = day.lower()
+    if not day or (len(day) == 1 and day in ('t', 's')):
+        return False
+    return any(day_name.startswith(day) for _, day_name in NUM2DAY)
+
+
+def parse_date(ddmmyy: str) -> Optional[dt_date]:  # perf: µs
+    """
+    Parses a `config.time.formats.date` (a Day key) without constructing an XArrow.
+    >>> parse_date('23/12/21')
+    datetime.date(2021, 12, 23)
+    """
+    match = config.time.formats.date_format_re.fullmatch(ddmmyy)
+    if not match or match.group('year') is None:
+        return None
+    year = int(match.group('year'))
+    if year < 100:
+        year += 2000
+    return dt_date(year, int(match.group('month')), int(match.group('day')))
+
+
+def parse_time(hhmmss: str) -> Optional[dt_time]:  # perf: µs
+    """
+    Parses a `config.time.formats.time` or `short_time` without constructing an XArrow.
+    >>> parse_time('09:45')
+    datetime.time(9, 45)
+    """
+    match = config.time.formats.time_format_re.fullmatch(hhmmss)
+    if not match:
+        return None
+    second = match.group('second')
+    return dt_time(int(match.group('hour')), int(match.group('minute')), int(second) if second else 0)
+
+
+PERIOD_SEPARATOR_RE = re.compile(r'\s+-\s+')
+"""'01/12 - 31/12'"""
+
+
+def week_start(date: dt_date) -> dt_date:
+    """Depending on config.time.first_day_of_week, the first day of the week of `date`."""
+    if config.time.first_day_of_week == 'monday':
+        return date - timedelta(days=date.weekday())
+    return date - timedelta(days=date.isoweekday() % 7)
+
+
+def parse_period(period: str, today: dt_date = None) -> Optional[tuple[dt_date, dt_date]]:
+    """
+    Parses a range of days: 'this week', 'last week', 'this month', 'last month',
+    or '<day> - <day>' where each <day> is anything XArrow.from_human understands.
+    Returns:
+        The (first, last) dates, inclusive. None if `period` isn't a range.
+    >>> parse_period('last month', dt_date(2021, 12, 23))
+    (datetime.date(2021, 11, 1), datetime.date(2021, 11, 30))
+    """
+    if today is None:
+        today = dt_date.today()
+    normalized = ' '.join(period.lower().split())
+    if normalized == 'this week':
+        first = week_start(today)
+        return first, first + timedelta(days=6)
+    if normalized == 'last week':
+        first = week_start(today) - timedelta(days=7)
+        return first, first + timedelta(days=6)
+    if normalized == 'this month':
+        first = today.replace(day=1)
+        next_month_first = (first + timedelta(days=31)).replace(day=1)
+        return first, next_month_first - timedelta(days=1)
+    if normalized == 'last month':
+        last = today.replace(day=1) - timedelta(days=1)
+        return last.replace(day=1), last
+    endpoints = PERIOD_SEPARATOR_RE.split(period.strip())
+    if len(endpoints) != 2:
+        return None
+    from timefred.time.xarrow import XArrow
+    first, last = (XArrow.from_human(endpoint).date() for endpoint in endpoints)
+    if first > last:
+        raise ValueError(f"Period starts after it ends: {period!r}")
+    return first, last
+
+
 def arrows2rel_time(present: "XArrow", past: "XArrow") -> str:
     """
     >>> arrows2rel_time(now(), now().shift(days=-5, minutes=3))
@@ -1,7 +1,8 @@
 import re
 from collections.abc import Callable
 from contextlib import suppress
-from datetime import tzinfo as dt_tzinfo, time as dt_time
+from datetime import tzinfo as dt_tzinfo, time as dt_time, date as dt_date
+from functools import lru_cache
 # from time import struct_time
 from typing import Type, Optional, Any, Union, Literal, overload, final
 
@@ -11,7 +12,7 @@ from arrow.arrow import TZ_EXPR
 
 import timefred.color as c
 from timefred.config import config
-from timefred.time.timeutils import isoweekday
+from timefred.time.timeutils import isoweekday, is_weekday
 
 
 @final
@@ -22,6 +23,18 @@ class NoneType:
 FORMATS = config.time.formats
 TZINFO = config.time.tz
 
+FAST_FORMATS = (FORMATS.date == 'DD{0}MM{0}YY'.format(FORMATS.date_separator)
+                and FORMATS.short_date == 'DD{0}MM'.format(FORMATS.date_separator)
+                and FORMATS.time == 'HH{0}mm{0}ss'.format(FORMATS.time_separator)
+                and FORMATS.short_time == 'HH{0}mm'.format(FORMATS.time_separator)
+                and FORMATS.datetime == f'{FORMATS.date} {FORMATS.time}'
+                and FORMATS.shorter_datetime == f'{FORMATS.date} {FORMATS.short_time}'
+                and FORMATS.short_datetime == f'{FORMATS.short_date} {FORMATS.short_time}')
+"""XArrow._parse_formatted_fast assumes the default token layout. Custom formats go through Arrow."""
+
+PARSE_CACHE_SIZE = 4096
+"""Max entries of each of the XArrow parse caches. The same few hundred 'HH:mm:ss' strings repeat across a sheet."""
+
 TIME_UNITS_FIRST_DIGIT_TO_PLURAL = {
     's': 'seconds',
     'm': 'minutes',
@@ -113,6 +126,14 @@ class XArrow(Arrow):
                 return date
             raise NotImplementedError(f"{cls.__qualname__}.from_formatted({date = !r}) is Arrow")
         
+        return _from_formatted(cls, date)
+    
+    @classmethod
+    def _parse_formatted(cls, date: Union[str, dt_time]) -> "XArrow":
+        if isinstance(date, str) and FAST_FORMATS:
+            parsed = cls._parse_formatted_fast(date)
+            if parsed is not None:
+                return parsed
         return xarrow_factory.get(date, [FORMATS.datetime,  # DD/MM/YY HH:mm:ss
                                          FORMATS.shorter_datetime,  # DD/MM/YY HH:mm
                                          FORMATS.short_datetime,  # DD/MM HH:mm
@@ -123,6 +144,42 @@ class XArrow(Arrow):
                                          ],
                                   tzinfo=TZINFO)
     
+    @classmethod
+    def _parse_formatted_fast(cls, date: str) -> Optional["XArrow"]:  # perf: µs
+        """
+        Parses the formats of `from_formatted` in a single pass of FORMATS.datetime_format_re,
+        with the same defaults as Arrow (year 1, January 1st, midnight).
+        Returns None if `date` isn't exactly one of the formats, so Arrow decides (and raises).
+        >>> XArrow._parse_formatted_fast('23/12/21 09:45')
+        XArrow ⟨23/12/21 09:45:00⟩
+        """
+        match = FORMATS.datetime_format_re.fullmatch(date)
+        if not match:
+            return None
+        day, month, year, hour, minute, second = match.group('day', 'month', 'year', 'hour', 'minute', 'second')
+        if day is None and hour is None:
+            return None
+        # DD, YY and HH are exactly 2 digits, and date and time are separated by a single space
+        if (day is not None and len(day) != 2) or (year is not None and len(year) != 2) or (hour is not None and len(hour) != 2):
+            return None
+        if date.count(' ') != (day is not None and hour is not None):
+            return None
+        if year is not None:
+            # Like Arrow's YY
+            year = int(year)
+            year += 1900 if year > 68 else 2000
+        try:
+            return cls(year or 1,
+                       int(month) if month else 1,
+                       int(day) if day else 1,
+                       int(hour) if hour else 0,
+                       int(minute) if minute else 0,
+                       int(second) if second else 0,
+                       tzinfo=TZINFO)
+        except ValueError:
+            # e.g 31/02
+            return None
+    
     @classmethod
     def from_day(cls, day: Union[str, dt_time, "XArrow"]) -> "XArrow":  # perf: µs
         """
@@ -149,11 +206,29 @@ class XArrow(Arrow):
         """
         # if `time` specifies second, it would get updated
         # otherwise expected behavior is like constructing datetime.time(23, 59) (second == 0)
+        if isinstance(time, XArrow):
+            return time
+        if isinstance(time, dt_time) or (isinstance(time, str) and FORMATS.date_separator not in time):
+            return _from_absolute(cls, dt_date.today(), time)
+        # A date without a time keeps now's time of day, so it can't be cached
         now = cls.now().replace(second=0)
         
         updated = now.update(time)
         return updated
     
+    @classmethod
+    def from_date_time(cls, date: dt_date, time: Union[str, dt_time, "XArrow"]) -> "XArrow":
+        """
+        Like `from_absolute`, but on `date` rather than today (unless `time` specifies a date).
+        >>> XArrow.from_date_time(dt_date(2021, 12, 23), '09:45')
+        XArrow ⟨23/12/21 09:45:00⟩
+        """
+        if isinstance(time, XArrow):
+            return time
+        if isinstance(time, str) and FORMATS.date_separator in time:
+            return cls.from_absolute(time)
+        return _from_absolute(cls, date, time)
+    
     # noinspection PyMethodOverriding,PyMethodParameters
     @overload
     def dehumanize(input_string: str, locale: str = "local") -> "XArrow": ...
@@ -253,6 +328,20 @@ class XArrow(Arrow):
             human_time = human_time_or_nothing
             self: XArrow = self_or_human_time
         
+        kind = classify_human(human_time) if isinstance(human_time, str) else None
+        if kind == 'relative':
+            return self.dehumanize(human_time)
+        if kind == 'day':
+            return self.from_day(human_time)
+        if kind == 'absolute':
+            return self.from_absolute(human_time)
+        if kind == 'day time':
+            day, _, time = human_time.partition(' ')
+            return self.from_day(day).update(time)
+        return self._from_human_chain(human_time)
+    
+    def _from_human_chain(self, human_time: Union[str, dt_time]) -> "XArrow":
+        """Tries each parser in turn. For what `classify_human` can't tell."""
         # '3m' / 'now', 'today', 'yesterday', 'tomorrow'
         with suppress(ValueError):
             return self.dehumanize(human_time)
@@ -434,6 +523,55 @@ class XArrowFactory(ArrowFactory):
     get: Callable[..., XArrow]
 
 
+HUMAN_KEYWORDS = frozenset({'now', 'today', 'just now', 'right now', 'yesterday', 'tomorrow'})
+"""See XArrow.dehumanize"""
+
+
+def classify_human(human_time: str) -> Optional[Literal['relative', 'day', 'absolute', 'day time']]:  # perf: µs
+    """
+    Tells which parser `XArrow.from_human` should use by the shape of `human_time`, without trying them.
+    None if it's unclear, in which case from_human tries them in turn.
+    >>> [classify_human(human) for human in ('3m ago', 'yesterday', 'thurs', '09:45', '23/12/21', 'wed 09:45', 'foo')]
+    ['relative', 'relative', 'day', 'absolute', 'absolute', 'day time', None]
+    """
+    stripped = human_time.strip()
+    if stripped.lower() in HUMAN_KEYWORDS:
+        return 'relative'
+    if not stripped:
+        return None
+    first_char = stripped[0]
+    if first_char.isdigit():
+        # '09:45', '23/12/21 09:45' before '3m', since HUMAN_RELATIVE can't match a separator
+        if FORMATS.time_separator in stripped or FORMATS.date_separator in stripped:
+            if stripped == human_time and FORMATS.datetime_format_re.fullmatch(human_time):
+                return 'absolute'
+            return None
+        # Nothing but HUMAN_RELATIVE could parse it, so dehumanize's own match decides
+        return 'relative'
+    if ' ' not in stripped:
+        return 'day' if stripped.isalpha() and is_weekday(stripped) else None
+    # 'in 3m', 'a day ago', 'wed 09:45'
+    day, _, time = human_time.partition(' ')
+    if day.lower() in ('in', 'a', 'an'):
+        return 'relative'
+    if is_weekday(day) and FORMATS.time_format_re.fullmatch(time):
+        return 'day time'
+    return None
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _from_formatted(cls: Type[XArrow], date: Union[str, dt_time]) -> XArrow:
+    return cls._parse_formatted(date)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _from_absolute(cls: Type[XArrow], date: dt_date, time: Union[str, dt_time]) -> XArrow:
+    """XArrows are immutable, so they can be shared. Microseconds are 0, rather than now's."""
+    midnight = cls.now().replace(year=date.year, month=date.month, day=date.day,
+                                 hour=0, minute=0, second=0, microsecond=0)
+    return midnight.update(time)
+
+
 # Docs say factory = arrow.ArrowFactory(XArrow)
 # https://arrow.readthedocs.io/en/latest/#factories
 xarrow_factory = XArrowFactory()
\ No newline at end of file
@@ -12,10 +12,20 @@ Usage:
   tf (n|note) <note-text> [time = "now"]
     tf note Discuss this with the other team.
   tf (l|log) [period = "today"]
+    A day, or a range of days: `this week`, `last week`, `this month`, `last month`, `01/12 - 31/12`.
   tf (e|edit)
-  tf (a|agg|aggregate)
+  tf (a|agg|aggregate) <start> <stop>
+    Time spent per activity, tag and Jira ticket, e.g `tf agg 01/12/21 31/12/21`.
   tf (i|interrupt)
     Marks end time of current activity, pushes it to interrupt stack, and starts an "interrupt" activity.
+  tf store compact
+    Folds the sheet's journal (see `sheet.journal` config) back into the sheet.
+  tf store migrate [source = sheet] <destination>
+    Copies a sheet between TOML, SQLite (.db, .sqlite, .sqlite3) and a directory of monthly TOML partitions,
+    e.g `tf store migrate ~/timefred.db` or `tf store migrate ~/timefred-sheet.toml ~/timefred`.
+  tf daemon
+    Keeps the sheet loaded and serves on, stop, status, log, tag and note over a Unix socket.
+    Other tf invocations forward to it while it's running (TIMEFRED_DAEMON=0 to opt out).
   tf --no-color
   tf -h | --help
 
@@ -32,14 +42,9 @@ import sys
 from contextlib import suppress
 from typing import Callable
 
+# Actions, config and time are imported only by the subcommands that need them, see `timefred.action`
 from timefred import action
-# from timefred.action import log, note, edit, stop, on, status, tag
-from timefred.config import config
 from timefred.error import TIError, BadArguments
-# from timefred.time.timespan import Timespan
-from timefred.time import XArrow, isoweekday
-
-FORMATS = config.time.formats
 
 
 # def interrupt(name, time):
@@ -71,7 +76,8 @@ def parse_args(argv=[]) -> tuple[Callable, dict]:
         return action.log, {'detailed': True}
     
     # ** timefred thursday
-    if len(argv[1]) > 1:
+    if len(argv[1]) > 1 and not argv[1].startswith('-'):
+        from timefred.time import isoweekday
         if argv[1].lower() == 'yesterday':
             return action.log, {'time': argv[1], 'detailed': True}
         with suppress(ValueError):
@@ -113,6 +119,7 @@ def parse_args(argv=[]) -> tuple[Callable, dict]:
         if not tail:
             raise BadArguments("Need the name of whatever you are working on.")
         
+        from timefred.time import XArrow
         name = tail.pop(0)
         _tag = None
         _note = None
@@ -138,8 +145,9 @@ def parse_args(argv=[]) -> tuple[Callable, dict]:
     
     # *** stop
     elif head in ('-', 'stop'):
+        from timefred.time import XArrow
         args = {
-            'time': XArrow.from_human(' '.join(tail) if tail else 'now')
+            'end': XArrow.from_human(' '.join(tail) if tail else 'now')
             }
         return action.stop, args
     
@@ -158,13 +166,13 @@ def parse_args(argv=[]) -> tuple[Callable, dict]:
         if len(tail) == 2:
             _tag, time = tail
             args = {
-                'tag': _tag,
+                '_tag': _tag,
                 'time': time
                 }
         elif len(tail) == 1:
-            args = {'tag': tail[0]}
+            args = {'_tag': tail[0]}
         else:
-            args = {'tag': ' '.join(tail)}
+            args = {'_tag': ' '.join(tail)}
         return action.tag, args
     
     # *** note
@@ -210,11 +218,22 @@ def parse_args(argv=[]) -> tuple[Callable, dict]:
                 raise BadArguments("Need at least <start> <stop>")
         else:
             start, stop, *tail = tail
-        # start_arw = human2arrow(start)
-        # stop_arw = human2arrow(stop)
-        start_arw = XArrow.from_human(start)
-        stop_arw = XArrow.from_human(stop)
-        breakpoint()
+        return action.aggregate, {'start': start, 'stop': stop}
+    
+    # *** daemon
+    elif head == 'daemon':
+        from timefred.daemon import serve
+        return serve, {}
+    
+    # *** store
+    elif head == 'store':
+        if tail == ['compact']:
+            return action.compact, {}
+        if tail and tail[0] == 'migrate' and len(tail) in (2, 3):
+            from timefred.config import config
+            *source, destination = tail[1:]
+            return action.migrate, {'source': source[0] if source else str(config.sheet.path), 'destination': destination}
+        raise BadArguments(f"I don't understand 'store {' '.join(tail)}'")
     
     # *** _dev
     if head == '_dev':
@@ -225,7 +244,17 @@ def parse_args(argv=[]) -> tuple[Callable, dict]:
     raise BadArguments("I don't understand %r" % (head,))
 
 
-def main(argv=[]):
+def main(argv=[], forward=True):
+    """
+    Args:
+        forward: Try the daemon first. False when called from timefred.daemon.main, which already did.
+    """
+    from timefred import daemon
+    forwarded_argv = argv or sys.argv[1:]
+    if forward and forwarded_argv[:1] != ['daemon']:
+        exit_code = daemon.forward(forwarded_argv)
+        if exit_code is not None:
+            return exit_code
     try:
         fn, args = parse_args([__name__, *argv] if argv else None)
         fn(**args)